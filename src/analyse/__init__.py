@@ -3,13 +3,22 @@
 
 #- Imports -----------------------------------------------------------------------------------------
 
-from .analyse import analyse_create, analyse_update
+from .analyse import analyse_create, analyse_update, jobs
+from .gesture_cache import CachedGesture, GESTURE_CACHE_SIZE, clear_gesture_cache, read_gesture
+from .jobs import AnalyseJob, JobManager, MAX_QUEUED_JOBS
+from .model_file import read_models, read_sources, write_models
+from .library import GestureLibrary, GestureScorer
+from .recognizer import Recognizer
 
 
 #- Export ------------------------------------------------------------------------------------------
 
 __version__ = "0.1.0"
 __all__ = [
-    "analyse_create", "analyse_update",
+    "analyse_create", "analyse_update", "jobs",
+    "AnalyseJob", "JobManager", "MAX_QUEUED_JOBS",
+    "CachedGesture", "GESTURE_CACHE_SIZE", "clear_gesture_cache", "read_gesture",
+    "read_models", "read_sources", "write_models",
+    "GestureLibrary", "GestureScorer", "Recognizer",
 ]
 
@@ -3,71 +3,322 @@
 
 #- Imports -----------------------------------------------------------------------------------------
 
-from threading import Thread
+import hashlib
+import multiprocessing
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import replace
+from typing import Optional
 
 import numpy as np
 from numpy.typing import NDArray
 from sklearn.mixture import GaussianMixture
 from opennetics.file import GestureFile
-from opennetics.typing import float3d_t
 
+from utils.extra import normalize_time
 from utils.typing import (
+    N_COMPONENTS_AUTO, ModelMode, ModelParameters, SourceModels,
     model_parameters_t, sensor_values_t
 )
 
+from .jobs import AnalyseJob, JobManager
+from .gesture_cache import read_gesture
+from .model_file import write_models
+from .training import init_worker, fit_trace, refit_trace, merge_trace
+
+
+#- Lib ---------------------------------------------------------------------------------------------
+
+TRAINING_WORKERS: Optional[int] = None  # processes fitting models, None uses every core
+AUTO_COMPONENTS: range = range(1, 9)    # candidates swept when n_components is N_COMPONENTS_AUTO
+AUTO_CRITERION: str = "bic"             # "bic" or "aic", the lowest total over a source wins
+
+_executor: Optional[ProcessPoolExecutor] = None
+
 
 #- Private Methods ---------------------------------------------------------------------------------
 
-def _create_model(data: float3d_t, random_state: int, n_components: int ) -> list[GaussianMixture]:
-    # creates a numpy list of arrays from the data iterable of only non-empty arrays
-    train_traces: list[NDArray[np.float64]] = [np.array(t) for t in data if len(t) > 0]
+# Return the shared training pool, started on first use.
+#
+# Workers are spawned: forking a process that runs Qt and reader threads isn't safe. Spawned
+# workers import the program's main script again, so it must start only under a
+# `if __name__ == "__main__":` guard and keep its Qt imports there too; what they run is in
+# training.py.
+def _training_pool() -> ProcessPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ProcessPoolExecutor(
+            max_workers = TRAINING_WORKERS,
+            mp_context = multiprocessing.get_context("spawn"),
+            initializer = init_worker,
+        )
+
+    return _executor
+
+
+# Select the recorded traces to train on, leaving out empty ones: every repetition as recorded,
+# or a single array of every time-normalised repetition for ModelMode.COMBINED.
+def _slice_traces(
+        data: list[NDArray[np.float64]], mode: ModelMode
+    ) -> list[NDArray[np.float64]]:
+    traces = [t for t in data if len(t) > 0] # already arrays, used without copying
+
+    if mode == ModelMode.COMBINED and traces:
+        return [np.vstack([normalize_time(t) for t in traces])]
+
+    return traces
+
 
-    # create models
-    gmm_models: list[GaussianMixture] = []
-    for trace in train_traces:
-        gmm = GaussianMixture(n_components=n_components, random_state=random_state)
-        gmm.fit(trace)
-        gmm_models.append(gmm)
+# Return the samples a source's model is fitted on when it's ModelMode.COMBINED, else 0.
+def _samples(traces: list[NDArray[np.float64]], mode: ModelMode) -> int:
+    return sum(len(trace) for trace in traces) if mode == ModelMode.COMBINED else 0
 
-    return gmm_models
 
+# Return the samples a stored ModelMode.COMBINED source's model was fitted on. Files that don't
+# record it count as many as the new traces hold: old and new data weigh the same.
+def _stored_samples(source: SourceModels, traces: list[NDArray[np.float64]]) -> int:
+    return source.samples or sum(len(trace) for trace in traces)
 
-def _single_thread_create(name: str, readings: sensor_values_t, mp: model_parameters_t) -> None:
-    gesture_file: GestureFile = GestureFile(name)
 
-    if not (gesture_file.create()):
-        # failed to create gesture file
-        return
+# Return the median length of the recorded repetitions, the window a recognizer should score.
+def _window(data: list[NDArray[np.float64]]) -> int:
+    return int(np.median([len(t) for t in data])) if len(data) else 0
+
+
+# Queue a cold fit on the training pool, unless the job already queued the same one.
+#
+# fits holds the job's fits by (trace digest, random_state, n_components), finished or not: the
+# same data under the same parameters, e.g. one recording mapped to several sources, or a
+# repetition kept twice, is fitted once per job. Nothing is kept between jobs.
+def _submit_fit(
+        trace: NDArray[np.float64], random_state: int, n_components: int,
+        fits: dict[tuple[bytes, int, int], Future[GaussianMixture]]
+    ) -> Future[GaussianMixture]:
+    digest = hashlib.sha1(trace.tobytes()).digest() + bytes(str(trace.shape), "ascii")
+    key = (digest, random_state, n_components)
+
+    if key not in fits:
+        fits[key] = _training_pool().submit(fit_trace, trace, random_state, n_components)
+
+    return fits[key]
+
+
+# Queue one model fit per trace on the training pool, by n_components. With N_COMPONENTS_AUTO
+# every AUTO_COMPONENTS candidate the traces are long enough for is queued. fits is the job's,
+# see _submit_fit().
+def _create_model(
+        traces: list[NDArray[np.float64]], random_state: int, n_components: int,
+        fits: dict[tuple[bytes, int, int], Future[GaussianMixture]]
+    ) -> dict[int, list[Future[GaussianMixture]]]:
+    candidates = [n_components]
+    if n_components == N_COMPONENTS_AUTO:
+        shortest = min((len(trace) for trace in traces), default=0)
+        candidates = [n for n in AUTO_COMPONENTS if n <= shortest] or [AUTO_COMPONENTS[0]]
+
+    return {
+        n: [_submit_fit(trace, random_state, n, fits) for trace in traces] for n in candidates
+    }
+
+
+# Queue one warm-started model fit per trace on the training pool, by n_components.
+def _update_model(
+        traces: list[NDArray[np.float64]], random_state: int, n_components: int,
+        previous: list[GaussianMixture]
+    ) -> dict[int, list[Future[GaussianMixture]]]:
+    pool = _training_pool()
+    return {n_components: [
+        pool.submit(refit_trace, trace, random_state, n_components, previous)
+        for trace in traces
+    ]}
+
+
+# Queue merging the new trace of a stored ModelMode.COMBINED source into its one model, see
+# merge_trace(); without new data the stored model is kept.
+def _merge_model(
+        traces: list[NDArray[np.float64]], n_components: int, source: SourceModels
+    ) -> dict[int, list[Future[GaussianMixture]]]:
+    if traces:
+        future = _training_pool().submit(
+            merge_trace, traces[0], source.models[0], _stored_samples(source, traces)
+        )
+    else:
+        future = Future()
+        future.set_result(source.models[0])
+
+    return {n_components: [future]}
+
+
+# Wait for every source's fits in order, reporting each finished source to the job.
+def _gather(
+        job: AnalyseJob, readings: sensor_values_t,
+        pending: list[dict[int, list[Future[GaussianMixture]]]]
+    ) -> list[dict[int, list[GaussianMixture]]]:
+    try:
+        results: list[dict[int, list[GaussianMixture]]] = []
+        for i, r in enumerate(readings):
+            results.append({n: job.wait(futures) for n, futures in pending[i].items()})
+            job.progress(r.label, i + 1, len(readings))
+
+        return results
+
+    except BaseException:
+        # don't leave the other sources' fits occupying the pool
+        for futures in (f for source in pending for f in source.values()):
+            for future in futures: future.cancel()
+        raise
+
+
+# Pick the n_components whose models score lowest on AUTO_CRITERION; returns it with its models.
+# The winning candidate's fits are kept as they are, nothing is refitted.
+def _select(
+        job: AnalyseJob, label: str, traces: list[NDArray[np.float64]],
+        fits: dict[int, list[GaussianMixture]], elapsed: float
+    ) -> tuple[int, list[GaussianMixture]]:
+    if len(fits) == 1: return next(iter(fits.items()))
+
+    scores = {
+        n: float(sum(getattr(gmm, AUTO_CRITERION)(trace) for gmm, trace in zip(models, traces)))
+        for n, models in fits.items()
+    }
+    chosen = min(scores, key=scores.__getitem__)
+    job.sweeps[label] = scores
+
+    print(
+        f"Gesture '{job.name}': '{label}' n_components {chosen} by {AUTO_CRITERION.upper()}"
+        f" (swept in {elapsed:.2f} s) " + ", ".join(f"{n}: {v:.1f}" for n, v in scores.items())
+    )
+    return chosen, fits[chosen]
+
+
+# Settle every source on one set of models; parameters come back with N_COMPONENTS_AUTO resolved
+# to the swept value, which is what the file records.
+def _choose(
+        job: AnalyseJob, readings: sensor_values_t, traces: list[list[NDArray[np.float64]]],
+        results: list[dict[int, list[GaussianMixture]]], mp: model_parameters_t, started: float
+    ) -> tuple[list[list[GaussianMixture]], model_parameters_t]:
+    elapsed = time.perf_counter() - started
+    models: list[list[GaussianMixture]] = []
+    params: list[ModelParameters] = []
 
     for i, r in enumerate(readings):
-        model = _create_model(r.values, mp[i].random_state, mp[i].n_components)
-
-        gesture_file.append_reading(r.label, model)
-        gesture_file.set_parameters(
-            label = r.label,
-            n_components = mp[i].n_components,
-            random_state = mp[i].random_state,
-            threshold = mp[i].threshold
+        n_components, source_models = _select(job, r.label, traces[i], results[i], elapsed)
+        models.append(source_models)
+        params.append(replace(mp[i], n_components=n_components))
+
+    return models, tuple(params)
+
+
+# Job target: train every source from scratch and write a new gesture file.
+def _run_create(job: AnalyseJob, readings: sensor_values_t, mp: model_parameters_t) -> None:
+    with job.stage("slice"):
+        traces = [_slice_traces(r.values, mp[i].mode) for i, r in enumerate(readings)]
+
+    with job.stage("fit"):
+        started = time.perf_counter()
+        # fan every source's traces out across the pool before waiting on any of them
+        fits: dict[tuple[bytes, int, int], Future[GaussianMixture]] = {}
+        pending = [
+            _create_model(traces[i], mp[i].random_state, mp[i].n_components, fits)
+            for i in range(len(readings))
+        ]
+        results = _gather(job, readings, pending)
+        models, mp = _choose(job, readings, traces, results, mp, started)
+
+    job.check()
+    with job.stage("write"):
+        # GestureFile only lays down the versioned file, models go through write_models: it
+        # records the model mode and doesn't share one model list between sources
+        if not GestureFile(job.name).create():
+            raise RuntimeError("unable to create the gesture file")
+
+        sources = {
+            r.label: SourceModels(
+                models[i], mp[i], _window(r.values), _samples(traces[i], mp[i].mode)
+            )
+            for i, r in enumerate(readings)
+        }
+
+        if not write_models(job.name, sources):
+            raise RuntimeError("unable to write the gesture file")
+
+
+# Job target: warm-start new models from the stored ones and append them to the recorded sources;
+# the new repetitions of a ModelMode.COMBINED source are merged into its one model instead.
+def _run_update(job: AnalyseJob, readings: sensor_values_t, mp: model_parameters_t) -> None:
+    with job.stage("slice"):
+        # only the models of the sources recorded again are read
+        gesture = read_gesture(job.name)
+        stored = gesture.models(r.label for r in readings) if gesture else None
+
+        if stored is None:
+            raise RuntimeError("unable to read the gesture file")
+
+        # a source keeps the model mode it was created with; warm starts need its n_components,
+        # and merging into a combined source's model always does
+        mp = tuple(
+            replace(
+                mp[i],
+                mode = stored[r.label].parameters.mode,
+                n_components = stored[r.label].parameters.n_components
+                    if mp[i].n_components == N_COMPONENTS_AUTO
+                    or stored[r.label].parameters.mode == ModelMode.COMBINED
+                    else mp[i].n_components,
+            ) if r.label in stored else mp[i]
+            for i, r in enumerate(readings)
         )
+        traces = [_slice_traces(r.values, mp[i].mode) for i, r in enumerate(readings)]
+        combined = [
+            r.label in stored and mp[i].mode == ModelMode.COMBINED and bool(stored[r.label].models)
+            for i, r in enumerate(readings)
+        ]
 
-    gesture_file.write()
-    print(f"Gesture '{name}' analysis complete.")
+    with job.stage("fit"):
+        started = time.perf_counter()
+        # sources new to the file have nothing to start from and are trained from scratch
+        fits: dict[tuple[bytes, int, int], Future[GaussianMixture]] = {}
+        pending = [
+            _merge_model(traces[i], mp[i].n_components, stored[r.label]) if combined[i] else
+            _update_model(
+                traces[i], mp[i].random_state, mp[i].n_components, stored[r.label].models
+            ) if r.label in stored else
+            _create_model(traces[i], mp[i].random_state, mp[i].n_components, fits)
+            for i, r in enumerate(readings)
+        ]
+        results = _gather(job, readings, pending)
+        models, mp = _choose(job, readings, traces, results, mp, started)
 
+    job.check()
+    with job.stage("write"):
+        # only the sources that were recorded again are touched in the file
+        changed = {
+            r.label: SourceModels(
+                models[i], mp[i],
+                stored[r.label].window if r.label in stored and stored[r.label].window
+                    else _window(r.values),
+                _samples(traces[i], mp[i].mode)
+                    + (_stored_samples(stored[r.label], traces[i]) if combined[i] else 0)
+            )
+            for i, r in enumerate(readings)
+        }
 
-def _single_thread_update(name: str, readings: sensor_values_t, mp: model_parameters_t) -> None:
-    pass
+        if not write_models(job.name, changed):
+            raise RuntimeError("unable to write the gesture file")
 
 
 #- Public Methods ----------------------------------------------------------------------------------
 
-# Analyse data and create a new file with it.
-def analyse_create(name: str, readings: sensor_values_t, mp: model_parameters_t) -> None:
-    single_thread = Thread(target=_single_thread_create, args=(name, readings, mp,))
-    single_thread.start()
+jobs: JobManager = JobManager() # runs every analysis, in submission order
+
 
+# Queue analysing data into a new file. Returns False if the job was refused (see JobManager).
+#
+# Training runs in spawned processes (see _training_pool()): a script calling this must do so
+# under `if __name__ == "__main__":`, or every worker re-runs it and the job never finishes.
+def analyse_create(name: str, readings: sensor_values_t, mp: model_parameters_t) -> bool:
+    return jobs.submit(AnalyseJob(name, lambda job: _run_create(job, readings, mp)))
 
-# Analyse data and write it to an existing file.
-def analyse_update(name: str, readings: sensor_values_t, mp: model_parameters_t) -> None:
-    single_thread = Thread(target=_single_thread_update, args=(name, readings, mp,))
-    single_thread.start()
 
+# Queue analysing data into an existing file. Returns False if the job was refused; see
+# analyse_create() for what calling scripts need.
+def analyse_update(name: str, readings: sensor_values_t, mp: model_parameters_t) -> bool:
+    return jobs.submit(AnalyseJob(name, lambda job: _run_update(job, readings, mp)))
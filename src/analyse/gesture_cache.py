@@ -0,0 +1,129 @@
+
+# analyse/gesture_cache.py
+
+#- Imports -----------------------------------------------------------------------------------------
+
+import os
+import threading
+from collections import OrderedDict
+from typing import Iterable, Optional
+
+from opennetics.utils.debug import alert
+
+from utils.typing import SourceInfo, SourceModels
+
+from .model_file import read_models, read_sources
+
+
+#- Lib ---------------------------------------------------------------------------------------------
+
+GESTURE_CACHE_SIZE: int = 16    # gesture files kept loaded, least recently used dropped first
+
+# loaded gesture files by absolute path; an entry is only used while the file's stamp still matches
+_gesture_cache: OrderedDict[str, "CachedGesture"] = OrderedDict()
+_gesture_cache_lock: threading.Lock = threading.Lock()
+
+
+#- Private Methods ---------------------------------------------------------------------------------
+
+# Return what identifies a version of a file on disk, (mtime in ns, size), or None if it's missing.
+def _stamp(path: str) -> Optional[tuple[int, int]]:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+
+    return stat.st_mtime_ns, stat.st_size
+
+
+#- CachedGesture Class -----------------------------------------------------------------------------
+
+# One version of a gesture file: the parameters of every source, read up front, and the models of
+# each source, read the first time they're asked for.
+#
+# The returned SourceModels are shared by everyone reading the same file and must not be modified.
+class CachedGesture:
+
+    # Initialise an entry for path at stamp, with its already read sources.
+    def __init__(
+            self, path: str, stamp: tuple[int, int], sources: dict[str, SourceInfo]
+        ) -> None:
+        self._path: str = path
+        self._stamp: tuple[int, int] = stamp
+        self._sources: dict[str, SourceInfo] = sources
+        self._models: dict[str, SourceModels] = {}
+        self._lock: threading.Lock = threading.Lock()
+
+
+    #- Class Properties ----------------------------------------------------------------------------
+
+    # Return the absolute path of the file.
+    @property
+    def path(self) -> str: return self._path
+
+
+    # Return the (mtime in ns, size) of the version read.
+    @property
+    def stamp(self) -> tuple[int, int]: return self._stamp
+
+
+    # Return the parameters of every source, by label.
+    @property
+    def sources(self) -> dict[str, SourceInfo]: return self._sources
+
+
+    #- Public Methods ------------------------------------------------------------------------------
+
+    # Return the models of the given sources, every source by default, reading those not loaded
+    # yet; labels the file doesn't hold are left out. Returns None if the file couldn't be read or
+    # changed since this entry was made.
+    def models(self, labels: Optional[Iterable[str]] = None) -> Optional[dict[str, SourceModels]]:
+        labels = [label for label in (self._sources if labels is None else labels)
+                  if label in self._sources]
+
+        with self._lock:
+            missing = [label for label in labels if label not in self._models]
+            if missing:
+                if _stamp(self._path) != self._stamp:
+                    alert(f"{self._path} changed on disk since it was loaded")
+                    return None
+
+                read = read_models(self._path, missing)
+                if read is None: return None
+                self._models.update(read)
+
+            return {label: self._models[label] for label in labels}
+
+
+#- Public Methods ----------------------------------------------------------------------------------
+
+# Return the cached entry of a gesture file, reading its source parameters if it isn't cached or
+# changed on disk. Returns None if it couldn't be read.
+def read_gesture(path: str) -> Optional[CachedGesture]:
+    path = os.path.abspath(path)
+    stamp = _stamp(path)
+    if stamp is None:
+        alert(f"Gesture file not found: {path}")
+        return None
+
+    with _gesture_cache_lock:
+        entry = _gesture_cache.get(path)
+        if entry is not None and entry.stamp == stamp:
+            _gesture_cache.move_to_end(path)
+            return entry
+
+    sources = read_sources(path)
+    if sources is None: return None
+
+    entry = CachedGesture(path, stamp, sources)
+    with _gesture_cache_lock:
+        _gesture_cache[path] = entry
+        _gesture_cache.move_to_end(path)
+        while len(_gesture_cache) > GESTURE_CACHE_SIZE: _gesture_cache.popitem(last=False)
+
+    return entry
+
+
+# Drop every cached gesture file.
+def clear_gesture_cache() -> None:
+    with _gesture_cache_lock: _gesture_cache.clear()
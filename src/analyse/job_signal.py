@@ -0,0 +1,18 @@
+
+# analyse/job_signal.py
+
+#- Imports -----------------------------------------------------------------------------------------
+
+from utils.signal import Signal
+
+
+#- JobSignals Class --------------------------------------------------------------------------------
+
+# Signals emitted on the analysis thread, every one carrying the file; bridged into the GUI.
+class JobSignals:
+    queued = Signal(str)                  # accepted, waiting behind other jobs
+    running = Signal(str)                 # training started
+    progress = Signal(str, str, int, int) # source finished: label, sources done, sources total
+    done = Signal(str, object)            # file written, JobTimings
+    failed = Signal(str, str)             # stopped on an error, reason
+    cancelled = Signal(str)               # stopped on request, nothing written
@@ -0,0 +1,202 @@
+
+# analyse/jobs.py
+
+#- Imports -----------------------------------------------------------------------------------------
+
+import queue
+import threading
+import time
+from concurrent.futures import FIRST_EXCEPTION, Future, wait
+from contextlib import contextmanager
+from typing import Callable, Iterator, Optional
+
+from opennetics.utils.debug import alert
+
+from utils.typing import JobTimings
+
+from .job_signal import JobSignals
+
+
+#- Lib ---------------------------------------------------------------------------------------------
+
+MAX_QUEUED_JOBS: int = 4        # jobs waiting behind the running one
+CANCEL_POLL: float = 0.1        # seconds between cancellation checks while waiting on the pool
+
+
+# Raised inside a job once it has been cancelled.
+class JobCancelled(Exception):
+    pass
+
+
+#- AnalyseJob Class --------------------------------------------------------------------------------
+
+# One training run for a gesture file: the work to do, its progress reporting and its timings.
+#
+# target runs on the manager thread and receives the job; it reports through progress(), times its
+# stages with stage(), records n_components sweeps in sweeps and raises to fail. Waiting through
+# wait() keeps it cancellable.
+class AnalyseJob:
+
+    # Initialise a job training the file name with target.
+    def __init__(self, name: str, target: Callable[["AnalyseJob"], None]) -> None:
+        self._name: str = name
+        self._target = target
+        self._signals: Optional[JobSignals] = None
+        self._cancel: threading.Event = threading.Event()
+        self.timings: JobTimings = JobTimings()
+        self.sweeps: dict[str, dict[int, float]] = {} # n_components scores, by swept source
+
+
+    #- Class Properties ----------------------------------------------------------------------------
+
+    # Return the gesture file the job trains.
+    @property
+    def name(self) -> str: return self._name
+
+
+    # Return whether cancel() was called.
+    @property
+    def cancelled(self) -> bool: return self._cancel.is_set()
+
+
+    #- Public Methods ------------------------------------------------------------------------------
+
+    # Run the job on the calling thread.
+    def run(self) -> None: self._target(self)
+
+
+    # Ask the job to stop at its next check; nothing is written once cancelled.
+    def cancel(self) -> None: self._cancel.set()
+
+
+    # Raise JobCancelled if the job was cancelled.
+    def check(self) -> None:
+        if self._cancel.is_set(): raise JobCancelled()
+
+
+    # Report that a source finished training.
+    def progress(self, label: str, done: int, total: int) -> None:
+        if self._signals: self._signals.progress.emit(self._name, label, done, total)
+
+
+    # Time the enclosed block into the named field of timings.
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            setattr(self.timings, name, getattr(self.timings, name) + time.perf_counter() - started)
+
+
+    # Wait for futures and return their results in order; cancels them all on error or cancel().
+    def wait(self, futures: list[Future]) -> list:
+        try:
+            pending = set(futures)
+            while pending:
+                self.check()
+                finished, pending = wait(pending, timeout=CANCEL_POLL, return_when=FIRST_EXCEPTION)
+                for future in finished: future.result() # raises the first failure
+
+            return [future.result() for future in futures]
+
+        except BaseException:
+            for future in futures: future.cancel()
+            raise
+
+
+#- JobManager Class --------------------------------------------------------------------------------
+
+# Runs analysis jobs one after the other on a background thread, reporting through signals.
+#
+# At most max_queued jobs wait behind the running one, and a file can't be queued twice; submit()
+# refuses the job otherwise.
+class JobManager:
+
+    # Initialise an idle manager; the thread starts with the first job.
+    def __init__(self, max_queued: int = MAX_QUEUED_JOBS) -> None:
+        self.signals = JobSignals()
+
+        self._queue: queue.Queue = queue.Queue(max_queued)
+        self._jobs: dict[str, AnalyseJob] = {} # queued or running, by file
+        self._lock: threading.Lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+
+    #- Class Properties ----------------------------------------------------------------------------
+
+    # Return the files of every queued or running job.
+    @property
+    def active(self) -> tuple[str, ...]:
+        with self._lock: return tuple(self._jobs.keys())
+
+
+    #- Private Methods -----------------------------------------------------------------------------
+
+    # Manager thread: run queued jobs until None is queued.
+    def _run_loop(self) -> None:
+        while (job := self._queue.get()) is not None:
+            try:
+                job.check()
+                self.signals.running.emit(job.name)
+                job.run()
+
+            except JobCancelled:
+                signal, args = self.signals.cancelled, (job.name,)
+
+            except Exception as e:
+                alert(f"Gesture '{job.name}': {e}")
+                signal, args = self.signals.failed, (job.name, str(e))
+
+            else:
+                print(f"Gesture '{job.name}' analysis complete: {job.timings}")
+                signal, args = self.signals.done, (job.name, job.timings)
+
+            # drop the job first so receivers already see it gone from active
+            with self._lock: self._jobs.pop(job.name, None)
+            signal.emit(*args)
+
+
+    #- Public Methods ------------------------------------------------------------------------------
+
+    # Queue a job. Returns False if its file is already queued or running, or the queue is full.
+    def submit(self, job: AnalyseJob) -> bool:
+        with self._lock:
+            if job.name in self._jobs: return False
+
+            try:
+                self._queue.put_nowait(job)
+            except queue.Full:
+                return False
+
+            job._signals = self.signals
+            self._jobs[job.name] = job
+
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run_loop, daemon=True)
+                self._thread.start()
+
+        self.signals.queued.emit(job.name)
+        return True
+
+
+    # Cancel the queued or running job for a file. Returns False if there is none.
+    def cancel(self, name: str) -> bool:
+        with self._lock: job = self._jobs.get(name)
+        if job is None: return False
+
+        job.cancel()
+        return True
+
+
+    # Stop the manager thread once the queue is through; with cancel, every job is cancelled first.
+    def stop(self, cancel: bool = True) -> None:
+        with self._lock:
+            if cancel:
+                for job in self._jobs.values(): job.cancel()
+            thread, self._thread = self._thread, None
+
+        if thread is None: return
+
+        self._queue.put(None)
+        thread.join()
@@ -0,0 +1,308 @@
+
+# analyse/library.py
+
+#- Imports -----------------------------------------------------------------------------------------
+
+import glob
+import os
+from typing import Iterable, Optional
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from numpy.typing import NDArray
+from opennetics.utils.debug import alert
+
+from utils.typing import ModelMode, SourceModels
+
+from .gesture_cache import read_gesture
+
+
+#- Lib ---------------------------------------------------------------------------------------------
+
+GESTURE_EXTENSIONS: tuple[str, ...] = (".srm", ".ges")  # files picked up by load_folder()
+RECOGNIZE_BLOCK: int = 2 ** 22  # most values evaluated at once, bounds scoring memory
+DEFAULT_WINDOW: int = 200       # window, in samples, for files that don't record one
+
+_LOG_2PI: float = float(np.log(2 * np.pi))
+
+
+#- GestureScorer Class -----------------------------------------------------------------------------
+
+# Scores windows of many sources against all of their models in one numpy pass.
+#
+# The (full covariance) GaussianMixture parameters of every source are stacked into
+# (sources, models, components, ...) arrays, padding smaller sources with models that never win.
+# score() then computes what GaussianMixture.score_samples() would for each model, averaged over
+# the window like GaussianMixture.score(), for many windows at once.
+#
+# Per-repeat models were fitted on the absolute time of their recording, so both they and each
+# window are centred on their mean time; combined models were fitted on time normalised to 0..1,
+# and windows of those sources are normalised the same way.
+class GestureScorer:
+
+    # Stack the models of every source, in order.
+    def __init__(self, sources: list[SourceModels]) -> None:
+        n_sources = len(sources)
+        n_models = max((len(source.models) for source in sources), default=0) or 1
+        n_components = max((gmm.n_components for s in sources for gmm in s.models), default=1)
+
+        self._means = np.zeros((n_sources, n_models, n_components, 2))
+        self._precisions = np.tile(np.eye(2), (n_sources, n_models, n_components, 1, 1))
+        self._log_weights = np.full((n_sources, n_models, n_components), -np.inf)
+        self._log_weights[:, :, 0] = 0.0 # padding: one harmless component, masked out below
+        self._log_det = np.zeros((n_sources, n_models, n_components))
+        self._valid = np.zeros((n_sources, n_models), dtype=bool)
+
+        for s, source in enumerate(sources):
+            for m, gmm in enumerate(source.models):
+                k = gmm.n_components
+                means = np.array(gmm.means_, dtype=np.float64)
+                if source.parameters.mode == ModelMode.PER_REPEAT:
+                    means[:, 0] -= gmm.weights_ @ means[:, 0]
+
+                self._means[s, m, :k] = means
+                self._precisions[s, m, :k] = gmm.precisions_cholesky_
+                self._log_weights[s, m] = -np.inf
+                self._log_weights[s, m, :k] = np.log(gmm.weights_)
+                self._log_det[s, m, :k] = np.log(
+                    np.diagonal(gmm.precisions_cholesky_, axis1=1, axis2=2)
+                ).sum(axis=1)
+                self._valid[s, m] = True
+
+        # mean @ precision term of every component, subtracted from every projected sample
+        self._projected_means = np.einsum("smkd,smkde->smke", self._means, self._precisions)
+        self._log_norm = self._log_det + self._log_weights - _LOG_2PI
+        self._normalize = np.array([s.parameters.mode == ModelMode.COMBINED for s in sources])
+        self.thresholds = np.array([s.parameters.threshold for s in sources], dtype=np.float64)
+
+
+    # Number of stacked sources.
+    def __len__(self) -> int: return len(self.thresholds)
+
+
+    #- Private Methods -----------------------------------------------------------------------------
+
+    # Put window time in the frame the models were fitted in: centred, or normalised to 0..1.
+    def _align_time(self, windows: NDArray[np.float64]) -> NDArray[np.float64]:
+        windows = windows.copy()
+        stamps = windows[..., 0]
+
+        start, end = stamps[..., :1], stamps[..., -1:]
+        span = np.where(end > start, end - start, 1.0)
+        normalized = (stamps - start) / span
+        centred = stamps - stamps.mean(axis=-1, keepdims=True)
+
+        windows[..., 0] = np.where(self._normalize[None, :, None], normalized, centred)
+        return windows
+
+
+    # Mean log-likelihood of (windows, sources, samples, 2) under every model of the given sources.
+    def _log_likelihood(self, windows: NDArray[np.float64], rows: slice) -> NDArray[np.float64]:
+        stamps = windows[:, :, None, None, :, 0]
+        values = windows[:, :, None, None, :, 1]
+        cholesky = self._precisions[rows, ..., None]
+        projected_means = self._projected_means[rows, ..., None]
+
+        # the 2x2 projection written out is much faster than a general einsum
+        y0 = stamps * cholesky[..., 0, 0, :] + values * cholesky[..., 1, 0, :]
+        y0 -= projected_means[..., 0, :]
+        y1 = stamps * cholesky[..., 0, 1, :] + values * cholesky[..., 1, 1, :]
+        y1 -= projected_means[..., 1, :]
+
+        log_prob = self._log_norm[rows, ..., None] - 0.5 * (np.square(y0) + np.square(y1))
+
+        # log-sum-exp over components, then the mean over the window's samples
+        peak = log_prob.max(axis=3, keepdims=True)
+        per_sample = np.log(np.exp(log_prob - peak).sum(axis=3)) + peak[:, :, :, 0]
+        return per_sample.mean(axis=-1)
+
+
+    #- Public Methods ------------------------------------------------------------------------------
+
+    # Return the best model's mean log-likelihood, (windows, sources), for (windows, sources,
+    # samples, 2) windows of [time, value] pairs.
+    def score(self, windows: NDArray[np.float64]) -> NDArray[np.float64]:
+        windows = self._align_time(windows)
+        n_windows, n_sources, samples, _ = windows.shape
+
+        # evaluate in blocks of sources and windows so the (windows, sources, models, components,
+        # samples) intermediates stay bounded
+        per_source = max(self._log_weights[0].size * samples, 1)
+        sources = min(max(RECOGNIZE_BLOCK // per_source, 1), max(n_sources, 1))
+        block = max(RECOGNIZE_BLOCK // (per_source * sources), 1)
+
+        scores = np.empty((n_windows, n_sources))
+        for first in range(0, n_sources, sources):
+            rows = slice(first, first + sources)
+            for start in range(0, n_windows, block):
+                likelihood = self._log_likelihood(windows[start:start + block, rows], rows)
+                likelihood[:, ~self._valid[rows]] = -np.inf
+                scores[start:start + block, rows] = likelihood.max(axis=2)
+
+        return scores
+
+
+    # Return which windows match: every source scores above its threshold.
+    def matches(self, scores: NDArray[np.float64]) -> NDArray[np.bool_]:
+        return (scores > self.thresholds).all(axis=1)
+
+
+#- GestureLibrary Class ----------------------------------------------------------------------------
+
+# Every source of many gesture files, stacked to be scored together over one sample stream.
+#
+# Each gesture maps its sources onto stream columns and is scored over windows of its own recorded
+# length; gestures sharing a window length share one GestureScorer, so a library is evaluated in
+# one vectorized pass per distinct window length rather than per gesture, source or model.
+class GestureLibrary:
+
+    # Initialise an empty library.
+    def __init__(self) -> None:
+        self._names: list[str] = []
+        self._labels: list[list[str]] = []
+        self._windows: list[int] = []
+        self._rows: list[tuple[int, int, SourceModels]] = [] # gesture, stream column, models
+
+        # built on first use: stream columns, per-gesture row offsets, (window, rows, scorer)s
+        self._columns: Optional[NDArray[np.intp]] = None
+        self._offsets: NDArray[np.intp] = np.empty(0, dtype=np.intp)
+        self._thresholds: NDArray[np.float64] = np.empty(0)
+        self._groups: list[tuple[int, NDArray[np.intp], NDArray[np.intp], GestureScorer]] = []
+
+
+    # Number of gestures.
+    def __len__(self) -> int: return len(self._names)
+
+
+    #- Class Properties ----------------------------------------------------------------------------
+
+    # Return the name of every gesture, in order.
+    @property
+    def names(self) -> tuple[str, ...]: return tuple(self._names)
+
+
+    # Return the window of every gesture, in samples.
+    @property
+    def windows(self) -> NDArray[np.intp]: return np.array(self._windows, dtype=np.intp)
+
+
+    # Return the longest window, the stream history needed to score every gesture.
+    @property
+    def window(self) -> int: return max(self._windows, default=0)
+
+
+    # Return the stream columns used by any gesture, in the order score() expects them.
+    @property
+    def columns(self) -> NDArray[np.intp]:
+        self._build()
+        return self._columns
+
+
+    #- Private Methods -----------------------------------------------------------------------------
+
+    # Stack the rows of every gesture, grouped by window length; nothing to do once built.
+    def _build(self) -> None:
+        if self._columns is not None: return
+
+        self._columns, stream_columns = np.unique(
+            np.array([column for _, column, _ in self._rows], dtype=np.intp), return_inverse=True
+        )
+        gestures = np.array([gesture for gesture, _, _ in self._rows], dtype=np.intp)
+        self._offsets = np.searchsorted(gestures, np.arange(len(self._names)))
+        self._thresholds = np.array([s.parameters.threshold for _, _, s in self._rows])
+
+        windows = np.array(self._windows, dtype=np.intp)[gestures]
+        self._groups = []
+        for window in np.unique(windows):
+            rows = np.flatnonzero(windows == window)
+            scorer = GestureScorer([self._rows[row][2] for row in rows])
+            self._groups.append((int(window), rows, stream_columns[rows], scorer))
+
+
+    #- Public Methods ------------------------------------------------------------------------------
+
+    # Add a gesture whose sources are mapped to stream columns by columns; sources not in columns
+    # are left out. Returns False if a mapped source isn't in the gesture.
+    def add(self, name: str, sources: dict[str, SourceModels], columns: dict[str, int]) -> bool:
+        missing = [label for label in columns if label not in sources]
+        if missing or not columns:
+            alert(f"Gesture '{name}' has no sources {missing or 'mapped'}")
+            return False
+
+        gesture = len(self._names)
+        self._names.append(name)
+        self._labels.append(list(columns.keys()))
+        self._windows.append(
+            max(sources[label].window for label in columns) or DEFAULT_WINDOW
+        )
+        self._rows.extend((gesture, column, sources[label]) for label, column in columns.items())
+
+        self._columns = None
+        return True
+
+
+    # Read and add gesture files, every source of which must be mapped by columns. Returns the
+    # number of gestures added; unreadable or unmapped files are skipped.
+    def load(self, paths: Iterable[str], columns: dict[str, int]) -> int:
+        added = 0
+        for path in paths:
+            gesture = read_gesture(path)
+            if gesture is None: continue
+
+            # checked on the parameters alone, before any model is read
+            unmapped = [label for label in gesture.sources if label not in columns]
+            if unmapped:
+                alert(f"Skipping {path}: sources {unmapped} aren't on the stream")
+                continue
+
+            sources = gesture.models()
+            if sources is None: continue
+            added += self.add(path, sources, {label: columns[label] for label in sources})
+
+        return added
+
+
+    # Add every gesture file of a folder, see load().
+    def load_folder(self, folder: str, columns: dict[str, int]) -> int:
+        paths = sorted(
+            path for extension in GESTURE_EXTENSIONS
+            for path in glob.glob(os.path.join(folder, f"*{extension}"))
+        )
+        return self.load(paths, columns)
+
+
+    # Score the windows of every gesture ending at ends, indices into (samples,) times and their
+    # (samples, columns) values. Returns (windows, sources of every gesture) mean log-likelihoods.
+    def score(
+            self, times: NDArray[np.float64], values: NDArray[np.float64], ends: NDArray[np.intp]
+        ) -> NDArray[np.float64]:
+        self._build()
+        scores = np.empty((len(ends), len(self._rows)))
+
+        for window, rows, columns, scorer in self._groups:
+            starts = ends - window
+            time_windows = sliding_window_view(times, window)[starts]
+            value_windows = sliding_window_view(values, window, axis=0)[starts][:, columns]
+
+            # (windows, sources, samples, 2) of [time, value] pairs
+            windows = np.stack(
+                np.broadcast_arrays(time_windows[:, None, :], value_windows), axis=-1
+            )
+            scores[:, rows] = scorer.score(windows)
+
+        return scores
+
+
+    # Return how far each gesture's weakest source clears its threshold, (windows, gestures), for
+    # scores from score(); a gesture matches where this is positive.
+    def margins(self, scores: NDArray[np.float64]) -> NDArray[np.float64]:
+        self._build()
+        return np.minimum.reduceat(scores - self._thresholds, self._offsets, axis=1)
+
+
+    # Return {source: score} of one gesture from one window's row of score().
+    def source_scores(self, gesture: int, scores: NDArray[np.float64]) -> dict[str, float]:
+        self._build()
+        start = self._offsets[gesture]
+        labels = self._labels[gesture]
+        return dict(zip(labels, scores[start:start + len(labels)].tolist()))
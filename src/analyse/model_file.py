@@ -0,0 +1,167 @@
+
+# analyse/model_file.py
+
+#- Imports -----------------------------------------------------------------------------------------
+
+from typing import Iterable, Optional
+
+import h5py
+import numpy as np
+from sklearn.mixture import GaussianMixture
+from opennetics.utils.debug import alert
+
+from utils.typing import ModelMode, ModelParameters, SourceInfo, SourceModels
+
+
+#- Lib ---------------------------------------------------------------------------------------------
+
+MODEL_PREFIX: str = "model_"    # group name of every stored model, followed by its index
+
+
+#- Private Methods ---------------------------------------------------------------------------------
+
+# Rebuild a fitted (full covariance) GaussianMixture from its stored group.
+def _read_model(group: h5py.Group) -> GaussianMixture:
+    gmm = GaussianMixture(n_components=int(group["n_components"][()]))
+
+    gmm.weights_ = group["weights"][()]
+    gmm.means_ = group["means"][()]
+    gmm.covariances_ = group["covariances"][()]
+    gmm.precisions_cholesky_ = group["precisions_cholesky"][()]
+    gmm.precisions_ = gmm.precisions_cholesky_ @ np.transpose(gmm.precisions_cholesky_, (0, 2, 1))
+    gmm.converged_ = True
+
+    return gmm
+
+
+# Return the model groups of a source, in index order.
+def _model_keys(group: h5py.Group) -> list[str]:
+    return sorted(
+        (key for key in group if key.startswith(MODEL_PREFIX)),
+        key=lambda key: int(key[len(MODEL_PREFIX):])
+    )
+
+
+# Read the parameters and window stored for a source.
+def _read_info(group: h5py.Group) -> tuple[ModelParameters, int]:
+    parameters = ModelParameters(
+        threshold = float(group["threshold"][()]),
+        random_state = int(group["random_state"][()]),
+        n_components = int(group["n_components"][()]),
+        # files written before model modes only hold per-repeat models
+        mode = ModelMode(int(group["mode"][()])) if "mode" in group else ModelMode.PER_REPEAT,
+    )
+    return parameters, int(group["window"][()]) if "window" in group else 0
+
+
+# Return the index that follows every model already stored in a group.
+def _next_model_index(group: h5py.Group) -> int:
+    indices = [int(key[len(MODEL_PREFIX):]) for key in group if key.startswith(MODEL_PREFIX)]
+    return max(indices, default=-1) + 1
+
+
+# Remove every model of a group.
+def _clear_models(group: h5py.Group) -> None:
+    for key in _model_keys(group): del group[key]
+
+
+# Create or overwrite a scalar dataset.
+def _set_value(group: h5py.Group, label: str, value: float) -> None:
+    if label in group: group[label][...] = value
+    else: group.create_dataset(label, data=value)
+
+
+#- Public Methods ----------------------------------------------------------------------------------
+
+# Read the parameters of every source of a gesture file, without loading any model. Returns None
+# on failure.
+def read_sources(path: str) -> Optional[dict[str, SourceInfo]]:
+    try:
+        sources: dict[str, SourceInfo] = {}
+
+        with h5py.File(path, "r") as file:
+            for label, group in file.items():
+                if not isinstance(group, h5py.Group): continue
+
+                parameters, window = _read_info(group)
+                models = sum(1 for key in group if key.startswith(MODEL_PREFIX))
+                sources[label] = SourceInfo(parameters, window, models)
+
+    except Exception as e:
+        alert(f"Unable to read sources from {path}: {e}")
+        return None
+
+    return sources
+
+
+# Read sources of a gesture file with their models and parameters; every source unless labels are
+# given, labels missing from the file are left out. Returns None on failure.
+#
+# GestureFile.read() can't be used for this: its reader hands back unfitted models that all
+# share one list, so they can be neither scored nor refitted.
+def read_models(
+        path: str, labels: Optional[Iterable[str]] = None
+    ) -> Optional[dict[str, SourceModels]]:
+    try:
+        sources: dict[str, SourceModels] = {}
+
+        with h5py.File(path, "r") as file:
+            for label in file.keys() if labels is None else labels:
+                group = file.get(label)
+                if not isinstance(group, h5py.Group): continue
+
+                parameters, window = _read_info(group)
+                models = [_read_model(group[key]) for key in _model_keys(group)]
+                samples = int(group["samples"][()]) if "samples" in group else 0
+                sources[label] = SourceModels(models, parameters, window, samples)
+
+    except Exception as e:
+        alert(f"Unable to read models from {path}: {e}")
+        return None
+
+    return sources
+
+
+# Append models to the given sources of an existing gesture file and update their parameters.
+# A ModelMode.COMBINED source holds exactly one model, which is replaced, and its sample count.
+#
+# Groups of sources that aren't passed are left untouched; the batch size grows to the largest
+# model count. Returns False if the file couldn't be written.
+def write_models(path: str, sources: dict[str, SourceModels]) -> bool:
+    try:
+        with h5py.File(path, "a") as file:
+            batchsize = int(file["batchsize"][()]) if "batchsize" in file else 0
+
+            for label, source in sources.items():
+                combined = source.parameters.mode == ModelMode.COMBINED
+                if combined and len(source.models) != 1:
+                    raise ValueError(f"'{label}' is combined but has {len(source.models)} models")
+
+                group = file.require_group(label)
+                if combined: _clear_models(group)
+                start = _next_model_index(group)
+
+                _set_value(group, "n_components", source.parameters.n_components)
+                _set_value(group, "random_state", source.parameters.random_state)
+                _set_value(group, "threshold", source.parameters.threshold)
+                _set_value(group, "mode", source.parameters.mode.value)
+                if source.window: _set_value(group, "window", source.window)
+                if source.samples: _set_value(group, "samples", source.samples)
+
+                for i, gmm in enumerate(source.models):
+                    model = group.create_group(f"{MODEL_PREFIX}{start + i}")
+                    model.create_dataset("weights", data=gmm.weights_)
+                    model.create_dataset("means", data=gmm.means_)
+                    model.create_dataset("covariances", data=gmm.covariances_)
+                    model.create_dataset("precisions_cholesky", data=gmm.precisions_cholesky_)
+                    model.create_dataset("n_components", data=gmm.n_components)
+
+                batchsize = max(batchsize, len(_model_keys(group)))
+
+            _set_value(file, "batchsize", batchsize)
+
+    except Exception as e:
+        alert(f"Unable to write models to {path}: {e}")
+        return False
+
+    return True
@@ -0,0 +1,175 @@
+
+# analyse/recognizer.py
+
+#- Imports -----------------------------------------------------------------------------------------
+
+import queue
+import threading
+import time
+from typing import Optional
+
+import numpy as np
+from numpy.typing import NDArray
+from opennetics.utils.debug import alert
+
+from .library import GestureLibrary
+from .recognizer_signal import RecognizerSignals
+
+
+#- Lib ---------------------------------------------------------------------------------------------
+
+RECOGNIZE_STRIDE: int = 8       # samples between the ends of consecutive scored windows
+
+
+#- Recognizer Class --------------------------------------------------------------------------------
+
+# Live recognition of a library of gestures over the incoming sample stream, on its own thread.
+#
+# feed() hands over each batch of samples without blocking; the thread keeps the longest window of
+# every mapped stream column and scores every window ending on a RECOGNIZE_STRIDE boundary as soon
+# as its batch arrives. A gesture's match is signalled once, then that gesture waits a full window
+# before matching again.
+class Recognizer:
+
+    # Initialise a recognizer for every gesture of library.
+    def __init__(self, library: GestureLibrary) -> None:
+        self.signals = RecognizerSignals()
+
+        self._library: GestureLibrary = library
+        self._columns: NDArray[np.intp] = library.columns
+        self._window: int = library.window
+
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._thread: Optional[threading.Thread] = None
+        self._latency: float = 0.0
+        self._matches: int = 0
+
+
+    #- Class Properties ----------------------------------------------------------------------------
+
+    # Return the gestures being recognised.
+    @property
+    def library(self) -> GestureLibrary: return self._library
+
+
+    # Return the window length in samples.
+    @property
+    def window(self) -> int: return self._window
+
+
+    # Return the seconds between the latest batch being fed and its windows being scored.
+    @property
+    def latency(self) -> float: return self._latency
+
+
+    # Return the number of matches signalled so far.
+    @property
+    def matches(self) -> int: return self._matches
+
+
+    # Return whether the scoring thread is running.
+    @property
+    def running(self) -> bool: return self._thread is not None and self._thread.is_alive()
+
+
+    #- Private Methods -----------------------------------------------------------------------------
+
+    # Return the mapped columns of a (samples, channels) batch. Batches differ in width (a partial
+    # first line, a ragged line, a device adding a column): columns a batch lacks score as NaN,
+    # never matching.
+    def _select(self, frames: NDArray[np.float64]) -> NDArray[np.float64]:
+        if frames.shape[1] <= self._columns.max():
+            frames = np.pad(
+                frames, ((0, 0), (0, self._columns.max() + 1 - frames.shape[1])),
+                constant_values=np.nan
+            )
+
+        return frames[:, self._columns]
+
+
+    # Scoring thread: extend the history with every batch and score the windows it completes.
+    def _run_loop(self) -> None:
+        times = np.empty(0)
+        values = np.empty((0, len(self._columns)))
+        seen = 0        # samples received so far, the absolute index following the history
+
+        # per gesture, no match is signalled for windows ending before this sample
+        quiet_until = np.zeros(len(self._library), dtype=np.intp)
+
+        try:
+            while (batch := self._queue.get()) is not None:
+                fed, timestamps, frames = batch
+                timestamps, frames = [timestamps], [self._select(frames)]
+
+                # everything else already waiting is handled in the same pass
+                while True:
+                    try: extra = self._queue.get_nowait()
+                    except queue.Empty: break
+
+                    if extra is None: return
+                    timestamps.append(extra[1])
+                    frames.append(self._select(extra[2]))
+
+                timestamps = np.concatenate(timestamps)
+                times = np.concatenate((times, timestamps))
+                values = np.vstack((values, *frames))
+                seen += len(timestamps)
+                first = seen - len(times) # absolute index of the oldest sample held
+
+                # windows [end - window, end) ending on a stride boundary inside this batch
+                start = max(seen - len(timestamps) + 1, self._window)
+                ends = np.arange(
+                    -(-start // RECOGNIZE_STRIDE) * RECOGNIZE_STRIDE, seen + 1, RECOGNIZE_STRIDE
+                )
+                if len(ends): self._score(times, values, ends, first, quiet_until)
+
+                # keep just enough history for the next batch's windows
+                keep = self._window + RECOGNIZE_STRIDE
+                times, values = times[-keep:], values[-keep:]
+                self._latency = time.perf_counter() - fed
+
+        except Exception as e:
+            alert(f"Recognition stopped: {e}")
+            self.signals.failed.emit(str(e))
+
+
+    # Score the windows ending at absolute sample indices ends, the history starting at first, and
+    # signal the first match of each gesture that isn't quiet; updates quiet_until in place.
+    def _score(
+            self, times: NDArray[np.float64], values: NDArray[np.float64],
+            ends: NDArray[np.intp], first: int, quiet_until: NDArray[np.intp]
+        ) -> None:
+        scores = self._library.score(times, values, ends - first)
+        matched = (self._library.margins(scores) > 0) & (ends[:, None] >= quiet_until)
+
+        for gesture in np.flatnonzero(matched.any(axis=0)):
+            best = int(np.argmax(matched[:, gesture]))
+            self._matches += 1
+            self.signals.matched.emit(
+                self._library.names[gesture], self._library.source_scores(gesture, scores[best])
+            )
+            quiet_until[gesture] = ends[best] + self._library.windows[gesture]
+
+
+    #- Public Methods ------------------------------------------------------------------------------
+
+    # Start the scoring thread; an empty library has nothing to recognise.
+    def start(self) -> None:
+        if self.running or not len(self._library): return
+
+        self._thread = threading.Thread(target=self._run_loop, daemon=True)
+        self._thread.start()
+
+
+    # Queue (samples,) timestamps and their (samples, columns) frames; never blocks.
+    def feed(self, timestamps: NDArray[np.float64], frames: NDArray[np.float64]) -> None:
+        if self.running: self._queue.put((time.perf_counter(), timestamps, frames))
+
+
+    # Stop the scoring thread; batches still queued are dropped.
+    def stop(self) -> None:
+        if self._thread is None: return
+
+        self._queue.put(None)
+        self._thread.join()
+        self._thread = None
@@ -0,0 +1,14 @@
+
+# analyse/recognizer_signal.py
+
+#- Imports -----------------------------------------------------------------------------------------
+
+from utils.signal import Signal
+
+
+#- RecognizerSignals Class -------------------------------------------------------------------------
+
+# Signals emitted on the recognition thread; bridged into the GUI.
+class RecognizerSignals:
+    matched = Signal(str, object)   # gesture file, {source: mean log-likelihood} of the window
+    failed = Signal(str)            # scoring thread stopped on an error, reason
@@ -0,0 +1,110 @@
+# analyse/training.py
+#
+# What the training pool's processes run. The pool spawns its workers, and each one imports this
+# module to unpickle the calls it is sent, so it keeps to numpy and scikit-learn: nothing here may
+# import Qt or the window.
+
+#- Imports -----------------------------------------------------------------------------------------
+
+import numpy as np
+from numpy.typing import NDArray
+from sklearn.mixture import GaussianMixture
+from threadpoolctl import threadpool_limits
+
+
+#- Lib ---------------------------------------------------------------------------------------------
+
+MERGE_MAX_ITER: int = 100       # EM iterations merge_trace() runs at most
+MERGE_TOL: float = 1e-3         # change in mean log-likelihood at which merge_trace() stops
+REG_COVAR: float = 1e-6         # added to covariance diagonals, as GaussianMixture does
+
+
+#- Private Methods ---------------------------------------------------------------------------------
+
+# Return a fitted full covariance GaussianMixture with the given parameters.
+def _mixture(
+        weights: NDArray[np.float64], means: NDArray[np.float64], covariances: NDArray[np.float64]
+    ) -> GaussianMixture:
+    gmm = GaussianMixture(n_components=len(weights))
+
+    gmm.weights_ = weights
+    gmm.means_ = means
+    gmm.covariances_ = covariances
+    gmm.precisions_cholesky_ = np.transpose(
+        np.linalg.inv(np.linalg.cholesky(covariances)), (0, 2, 1)
+    )
+    gmm.precisions_ = gmm.precisions_cholesky_ @ np.transpose(gmm.precisions_cholesky_, (0, 2, 1))
+    gmm.converged_ = True
+
+    return gmm
+
+
+#- Public Methods ----------------------------------------------------------------------------------
+
+# Worker start-up: one BLAS thread per process, the pool already spreads work across cores.
+def init_worker() -> None:
+    threadpool_limits(1)
+
+
+# Fit a single GaussianMixture on one trace.
+def fit_trace(trace: NDArray[np.float64], random_state: int, n_components: int) -> GaussianMixture:
+    gmm = GaussianMixture(n_components=n_components, random_state=random_state)
+    gmm.fit(trace)
+    return gmm
+
+
+# Fit one trace starting from the stored model that explains it best.
+#
+# The new fit starts from that model's weights, means and precisions, so it only has to adjust to
+# the new repetition instead of searching from a fresh initialisation. Falls back to a cold fit
+# when nothing compatible is stored.
+def refit_trace(
+        trace: NDArray[np.float64], random_state: int, n_components: int,
+        previous: list[GaussianMixture]
+    ) -> GaussianMixture:
+    previous = [gmm for gmm in previous if gmm.n_components == n_components]
+    if not previous: return fit_trace(trace, random_state, n_components)
+
+    nearest = max(previous, key=lambda gmm: gmm.score(trace))
+    gmm = GaussianMixture(
+        n_components = n_components,
+        random_state = random_state,
+        weights_init = nearest.weights_,
+        means_init = nearest.means_,
+        precisions_init = nearest.precisions_,
+    )
+    gmm.fit(trace)
+    return gmm
+
+
+# Fit one model over a new trace and the count samples previous was fitted on, without having
+# those samples.
+#
+# A full covariance model and its sample count are the sufficient statistics of its data: component
+# k holds count * weight k of the samples, with its mean and covariance. EM starts from previous and
+# runs over the new trace only, adding those fixed statistics in every M-step, so the old samples
+# keep the responsibilities previous gave them.
+def merge_trace(
+        trace: NDArray[np.float64], previous: GaussianMixture, count: int
+    ) -> GaussianMixture:
+    old_n = count * previous.weights_
+    old_sum = old_n[:, None] * previous.means_
+    old_outer = old_n[:, None, None] * (
+        previous.covariances_ + np.einsum("ki,kj->kij", previous.means_, previous.means_)
+    )
+    regularise = REG_COVAR * np.eye(trace.shape[1])
+
+    gmm, last = previous, -np.inf
+    for _ in range(MERGE_MAX_ITER):
+        resp = gmm.predict_proba(trace)
+        n = old_n + resp.sum(axis=0) + 10 * np.finfo(np.float64).eps
+        means = (old_sum + resp.T @ trace) / n[:, None]
+        outer = old_outer + np.einsum("sk,si,sj->kij", resp, trace, trace)
+        covariances = outer / n[:, None, None] - np.einsum("ki,kj->kij", means, means) + regularise
+        gmm = _mixture(n / n.sum(), means, covariances)
+
+        score = gmm.score(trace)
+        if abs(score - last) < MERGE_TOL: break
+        last = score
+
+    return gmm
@@ -0,0 +1,4 @@
+
+# bench/__init__.py
+
+# Standalone benchmarks, run from src/ as modules, e.g. `python -m bench.talk_read_loop`.
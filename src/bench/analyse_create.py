@@ -0,0 +1,81 @@
+# bench/analyse_create.py
+
+#- Imports -----------------------------------------------------------------------------------------
+
+import os
+import tempfile
+import time
+
+import h5py
+import numpy as np
+from threadpoolctl import threadpool_limits
+
+from analyse import analyse, training, AnalyseJob
+from utils.typing import ModelParameters, SensorValues, sensor_values_t
+
+
+#- Lib ---------------------------------------------------------------------------------------------
+
+SOURCES: int = 16
+REPEATS: int = 20
+SAMPLES: int = 400      # samples per recorded trace
+
+
+# Synthetic recordings: every source gets REPEATS noisy copies of its own waveform.
+def synthetic_readings(seed: int = 0) -> sensor_values_t:
+    rng = np.random.default_rng(seed)
+    counter = np.arange(SAMPLES, dtype=float)
+    readings: sensor_values_t = []
+
+    for source in range(SOURCES):
+        values = SensorValues(f"Source {source}")
+        wave = 100 * np.sin(counter / (20 + source))
+        for _ in range(REPEATS):
+            values.AddValues(counter, wave + rng.normal(0, 5, SAMPLES))
+        readings.append(values)
+
+    return readings
+
+
+# Fit every trace one after the other, as analyse did before the pool.
+def sequential(readings: sensor_values_t, mp: ModelParameters) -> None:
+    with threadpool_limits(1):
+        for r in readings:
+            for trace in r.values:
+                training.fit_trace(np.array(trace), mp.random_state, mp.n_components)
+
+
+# Train and write a file through analyse's pool; returns the number of models written.
+def pooled(readings: sensor_values_t, mp: ModelParameters, path: str) -> int:
+    mps = (mp,) * len(readings)
+    job = AnalyseJob(path, lambda job: analyse._run_create(job, readings, mps))
+    job.run() # inline rather than on the job manager thread
+    print(f"    {job.timings}")
+
+    # count groups straight from the file: GestureFile.read() shares one model list across sources
+    with h5py.File(path, "r") as file:
+        return sum(
+            len([key for key in group if key.startswith("model_")])
+            for group in file.values() if isinstance(group, h5py.Group)
+        )
+
+
+if __name__ == "__main__":
+    readings = synthetic_readings()
+    mp = ModelParameters()
+    print(f"{SOURCES} sources x {REPEATS} repeats x {SAMPLES} samples,"
+          f" n_components={mp.n_components}, {os.cpu_count()} cores")
+
+    started = time.perf_counter()
+    sequential(readings, mp)
+    serial_time = time.perf_counter() - started
+    print(f"  sequential:            {serial_time:8.2f} s")
+
+    with tempfile.TemporaryDirectory() as folder:
+        # first run includes starting the worker processes
+        for label, name in [("pool (cold start)", "cold.ges"), ("pool (warm)", "warm.ges")]:
+            started = time.perf_counter()
+            models = pooled(readings, mp, os.path.join(folder, name))
+            pool_time = time.perf_counter() - started
+            print(f"  {label + ':':<22} {pool_time:8.2f} s  ({serial_time / pool_time:.1f}x),"
+                  f" {models} models written")
@@ -0,0 +1,42 @@
+# bench/auto_components.py
+
+#- Imports -----------------------------------------------------------------------------------------
+
+import os
+import tempfile
+
+from analyse import analyse, AnalyseJob
+from analyse.model_file import read_models
+from utils.typing import N_COMPONENTS_AUTO, ModelMode, ModelParameters
+
+from .analyse_create import synthetic_readings, SOURCES, REPEATS, SAMPLES
+
+
+# Train a file with n_components swept; returns the finished job.
+def run(path: str, mode: ModelMode) -> AnalyseJob:
+    readings = synthetic_readings()
+    mp = (ModelParameters(n_components=N_COMPONENTS_AUTO, mode=mode),) * len(readings)
+
+    job = AnalyseJob(path, lambda job: analyse._run_create(job, readings, mp))
+    job.run() # inline rather than on the job manager thread
+    return job
+
+
+if __name__ == "__main__":
+    candidates = list(analyse.AUTO_COMPONENTS)
+    print(f"{SOURCES} sources x {REPEATS} repeats x {SAMPLES} samples,"
+          f" n_components swept over {candidates} by {analyse.AUTO_CRITERION.upper()}")
+
+    analyse._training_pool().submit(int).result() # start the workers outside the timings
+
+    with tempfile.TemporaryDirectory() as folder:
+        for mode in ModelMode:
+            path = os.path.join(folder, f"{mode.name}.ges")
+            job = run(path, mode)
+
+            chosen = {source.parameters.n_components for source in read_models(path).values()}
+            print(f"  {mode.name:<11} fit {job.timings.fit:6.2f} s,"
+                  f" n_components chosen {sorted(chosen)}")
+
+            for label, scores in list(job.sweeps.items())[:2]:
+                print(f"    {label}: " + ", ".join(f"{n}: {v:.0f}" for n, v in scores.items()))
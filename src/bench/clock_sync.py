@@ -0,0 +1,64 @@
+# bench/clock_sync.py
+
+#- Imports -----------------------------------------------------------------------------------------
+
+import time
+
+import numpy as np
+
+from talk.clock import ClockSync
+
+
+#- Lib ---------------------------------------------------------------------------------------------
+
+RATE: int = 1000            # samples per second sent by the device
+SECONDS: float = 600.0
+BATCH: int = 8              # samples per read
+DRIFT: float = 200e-6       # device clock runs 200 ppm fast
+LINK: float = 0.001         # seconds every sample spends on the wire
+JITTER: float = 0.003       # mean extra read delay, exponential
+STALL_EVERY: int = 5000     # reads between 50 ms stalls of the reader
+
+
+# Return (true send times, device timestamps in ms, host read times) of a simulated stream.
+def stream(rng: np.random.Generator) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    sent = np.arange(int(RATE * SECONDS)) / RATE
+    device = np.floor((sent * (1 + DRIFT) + 12.345) * 1e3) # millis() since the device booted
+
+    # a read returns every sample that arrived by then: delays only ever add up
+    arrived = sent + LINK + rng.exponential(JITTER, len(sent))
+    reads = np.maximum.accumulate(arrived.reshape(-1, BATCH).max(axis=1))
+    reads[STALL_EVERY // 2::STALL_EVERY] += 0.05
+    reads = np.maximum.accumulate(reads)
+    return sent, device, np.repeat(reads, BATCH)
+
+
+# Return (median, p99 absolute, worst) timestamp error in ms once the constant link delay is
+# taken out, and the error's change from the first to the last minute.
+def errors(stamps: np.ndarray, sent: np.ndarray) -> tuple[float, float, float, float]:
+    error = stamps - sent
+    error -= np.median(error)
+    minute = RATE * 60
+    drift = np.median(error[-minute:]) - np.median(error[:minute])
+    return (np.median(np.abs(error)) * 1e3, np.percentile(np.abs(error), 99) * 1e3,
+            np.abs(error).max() * 1e3, drift * 1e3)
+
+
+if __name__ == "__main__":
+    sent, device, reads = stream(np.random.default_rng(0))
+
+    sync = ClockSync()
+    mapped = np.empty_like(reads)
+    started = time.perf_counter()
+    for start in range(0, len(sent), BATCH):
+        rows = slice(start, start + BATCH)
+        mapped[rows] = sync.map(device[rows] * 1e-3, reads[rows])
+    cost = (time.perf_counter() - started) / (len(sent) / BATCH) * 1e6
+
+    print(f"{SECONDS:.0f} s at {RATE} Hz, device {DRIFT * 1e6:.0f} ppm fast with ms timestamps,"
+          f" reads of {BATCH} with {JITTER * 1e3:.0f} ms mean jitter")
+    print(f"  {'':<12} {'median':>8} {'p99':>8} {'worst':>8} {'drift':>8}  (ms)")
+    for name, stamps in (("read time", reads), ("device time", device * 1e-3), ("synced", mapped)):
+        median, p99, worst, drift = errors(stamps, sent)
+        print(f"  {name:<12} {median:8.3f} {p99:8.3f} {worst:8.3f} {drift:8.3f}")
+    print(f"  estimated drift {(sync.skew - 1) * -1e6:.1f} ppm, {cost:.1f} µs per batch")
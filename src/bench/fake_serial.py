@@ -0,0 +1,62 @@
+
+# bench/fake_serial.py
+
+#- Imports -----------------------------------------------------------------------------------------
+
+import random
+
+import numpy as np
+
+from talk.framing import encode_frame
+
+
+#- Lib ---------------------------------------------------------------------------------------------
+
+# Build a synthetic OpenNetics style stream: comma separated readings ending with '\r\n'.
+def synthetic_stream(lines: int, channels: int = 8, seed: int = 42) -> bytes:
+    rng = random.Random(seed)
+    rows = (
+        ",".join(f"{rng.uniform(-512, 512):.3f}" for _ in range(channels)) + "\r\n"
+        for _ in range(lines)
+    )
+    return "".join(rows).encode("ascii")
+
+
+# The same kind of stream as binary frames (see talk/framing.py) of float32 samples.
+def synthetic_frames(lines: int, channels: int = 8, seed: int = 42) -> bytes:
+    rows = np.random.default_rng(seed).uniform(-512, 512, (lines, channels))
+    return b"".join(encode_frame(row) for row in rows)
+
+
+#- FakeSerial Class --------------------------------------------------------------------------------
+
+# Minimal stand-in for serial.Serial replaying a byte string, closing itself when drained.
+class FakeSerial:
+
+    # Initialise with the full stream and the most bytes the "driver" buffers between reads.
+    def __init__(self, data: bytes, driver_buffer: int = 4096) -> None:
+        self._data = memoryview(data)
+        self._position = 0
+        self._driver_buffer = driver_buffer
+        self.is_open = True
+
+
+    # Bytes currently readable without blocking.
+    @property
+    def in_waiting(self) -> int:
+        return min(self._driver_buffer, len(self._data) - self._position)
+
+
+    # Return up to size bytes; closes the port once the stream is exhausted.
+    def read(self, size: int = 1) -> bytes:
+        chunk = bytes(self._data[self._position:self._position + size])
+        self._position += len(chunk)
+
+        if self._position >= len(self._data): self.is_open = False
+        return chunk
+
+
+    def write(self, data: bytes) -> int: return len(data)
+
+
+    def close(self) -> None: self.is_open = False
@@ -0,0 +1,69 @@
+# bench/gesture_cache.py
+
+#- Imports -----------------------------------------------------------------------------------------
+
+import contextlib
+import io
+import os
+import tempfile
+import time
+
+from opennetics.file import GestureFile
+
+from analyse import analyse, AnalyseJob, clear_gesture_cache, read_gesture, read_models
+from utils.typing import ModelParameters
+
+from .analyse_create import synthetic_readings, SOURCES, REPEATS
+
+
+#- Lib ---------------------------------------------------------------------------------------------
+
+OPENS: int = 20         # times the Update tab loads the same file
+
+
+# Return the mean seconds of calling function OPENS times.
+def timed(function) -> float:
+    started = time.perf_counter()
+    for _ in range(OPENS): function()
+    return (time.perf_counter() - started) / OPENS
+
+
+# Print how long loading a per-repeat file takes for each way of reading it.
+def run(path: str) -> None:
+    label = next(iter(read_gesture(path).sources))
+
+    def cold() -> None:
+        clear_gesture_cache()
+        read_gesture(path)
+
+    def lazy() -> None:
+        clear_gesture_cache()
+        read_gesture(path).models([label])
+
+    def upstream() -> None:
+        with contextlib.redirect_stdout(io.StringIO()): GestureFile(path).read() # prints its version
+
+    results = {
+        "GestureFile.read()": timed(upstream),
+        "read_models()": timed(lambda: read_models(path)),
+        "parameters, cold": timed(cold),
+        "parameters, cached": timed(lambda: read_gesture(path)),
+        "+ one source's models": timed(lazy),
+    }
+
+    base = results["GestureFile.read()"]
+    for name, seconds in results.items():
+        print(f"  {name:<22} {seconds * 1e3:8.2f} ms  ({base / seconds:.0f}x)")
+
+
+if __name__ == "__main__":
+    print(f"{SOURCES} sources x {REPEATS} per-repeat models")
+
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, "gesture.ges")
+        readings = synthetic_readings()
+        mp = (ModelParameters(),) * len(readings)
+
+        job = AnalyseJob(path, lambda job: analyse._run_create(job, readings, mp))
+        job.run() # inline rather than on the job manager thread
+        run(path)
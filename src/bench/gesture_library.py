@@ -0,0 +1,102 @@
+# bench/gesture_library.py
+
+#- Imports -----------------------------------------------------------------------------------------
+
+import copy
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from analyse import training, GestureLibrary, read_models, write_models
+from utils.extra import normalize_time
+from utils.typing import ModelMode, ModelParameters, SourceModels
+
+from .analyse_create import synthetic_readings, SOURCES, REPEATS, SAMPLES
+
+
+#- Lib ---------------------------------------------------------------------------------------------
+
+GESTURES: int = 100
+WINDOWS: int = 64       # windows ending on consecutive strides of the stream
+LOOPED: int = 2         # windows scored model by model for comparison
+STRIDE: int = 8
+
+
+# Write GESTURES files of SOURCES sources each, every gesture a shifted copy of fitted models.
+def write_library(folder: str, mode: ModelMode, models: int) -> list[str]:
+    mp = ModelParameters(mode=mode)
+    fitted = []
+    for r in synthetic_readings():
+        traces = [np.array(trace) for trace in r.values]
+        if mode == ModelMode.COMBINED: traces = [np.vstack([normalize_time(t) for t in traces])]
+        fitted.append([
+            training.fit_trace(trace, mp.random_state, mp.n_components) for trace in traces[:models]
+        ])
+
+    rng = np.random.default_rng(0)
+    paths = []
+    for g in range(GESTURES):
+        sources = {}
+        for s, gmms in enumerate(fitted):
+            shifted = []
+            for gmm in gmms:
+                gmm = copy.deepcopy(gmm)
+                gmm.means_[:, 1] += rng.normal(0, 20)
+                shifted.append(gmm)
+            sources[f"Source {s}"] = SourceModels(shifted, mp, SAMPLES)
+
+        paths.append(os.path.join(folder, f"gesture_{g:03}.ges"))
+        write_models(paths[-1], sources)
+
+    return paths
+
+
+# Load the library, then score WINDOWS windows in one pass and LOOPED windows model by model.
+def run(mode: ModelMode, models: int) -> None:
+    with tempfile.TemporaryDirectory() as folder:
+        paths = write_library(folder, mode, models)
+        columns = {f"Source {s}": s for s in range(SOURCES)}
+
+        started = time.perf_counter()
+        library = GestureLibrary()
+        library.load_folder(folder, columns)
+        library.columns # stacks the parameters
+        load = time.perf_counter() - started
+
+        started = time.perf_counter()
+        gestures = [read_models(path) for path in paths]
+        read = time.perf_counter() - started
+
+    rng = np.random.default_rng(1)
+    samples = SAMPLES + WINDOWS * STRIDE
+    times = np.arange(samples, dtype=float)
+    values = rng.normal(0, 50, (samples, SOURCES))
+    ends = np.arange(SAMPLES, samples, STRIDE)
+
+    started = time.perf_counter()
+    library.margins(library.score(times, values, ends))
+    vectorized = (time.perf_counter() - started) / len(ends)
+
+    started = time.perf_counter()
+    for end in ends[:LOOPED]:
+        for sources in gestures:
+            for s, source in enumerate(sources.values()):
+                window = np.column_stack((times[end - SAMPLES:end], values[end - SAMPLES:end, s]))
+                if mode == ModelMode.COMBINED: window = normalize_time(window)
+                else: window[:, 0] -= window[:, 0].mean()
+                max(gmm.score(window) for gmm in source.models)
+    looped = (time.perf_counter() - started) / LOOPED
+
+    print(f"  {mode.name:<11} {models:2} model(s)/source"
+          f"  load {load:5.2f} s (read_models alone {read:5.2f} s)"
+          f"  score {looped * 1e3:8.1f} ms/window looped"
+          f"  {vectorized * 1e3:7.1f} ms/window vectorized ({looped / vectorized:.0f}x,"
+          f" {1 / vectorized:.0f} windows/s)")
+
+
+if __name__ == "__main__":
+    print(f"{GESTURES} gestures x {SOURCES} sources x {SAMPLES} sample windows")
+    run(ModelMode.COMBINED, 1)
+    run(ModelMode.PER_REPEAT, REPEATS)
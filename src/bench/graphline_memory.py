@@ -0,0 +1,59 @@
+
+# bench/graphline_memory.py
+
+#- Imports -----------------------------------------------------------------------------------------
+
+import tracemalloc
+
+import numpy as np
+
+from utils.ring_buffer import RingBuffer, HISTORY_LENGTH
+
+
+#- Lib ---------------------------------------------------------------------------------------------
+
+CHANNELS: int = 16      # GraphLines, plus one shared time axis
+RATE: int = 1000        # samples per second per channel
+HOURS: float = 4.0
+BLOCK: int = RATE       # samples appended per step (one second of data)
+LIST_SAMPLE: int = 1_000_000
+
+
+# Peak traced memory of a list[float] history, measured on LIST_SAMPLE values per channel.
+def list_bytes_per_sample() -> float:
+    values = np.random.default_rng(0).uniform(-512, 512, LIST_SAMPLE).tolist()
+
+    tracemalloc.start()
+    history: list[float] = []
+    for value in values: history.append(value * 1.0) # fresh float objects, as parsed from text
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return current / LIST_SAMPLE
+
+
+# Stream HOURS of data into ring buffers; return (current, peak) traced bytes.
+def ring_buffer_bytes(samples: int) -> tuple[int, int]:
+    block = np.random.default_rng(0).uniform(-512, 512, BLOCK)
+
+    tracemalloc.start()
+    buffers = [RingBuffer() for _ in range(CHANNELS + 1)]
+    for _ in range(samples // BLOCK):
+        for buffer in buffers: buffer.extend(block)
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return current, peak
+
+
+if __name__ == "__main__":
+    samples = int(HOURS * 3600 * RATE)
+    print(f"{CHANNELS} channels + time axis @ {RATE} Hz for {HOURS} h = {samples:,} samples each")
+
+    per_sample = list_bytes_per_sample()
+    list_total = per_sample * samples * (CHANNELS + 1)
+    print(f"  list[float]: {per_sample:5.1f} B/sample -> {list_total / 2**30:8.2f} GiB (extrapolated)")
+
+    current, peak = ring_buffer_bytes(samples)
+    print(f"  RingBuffer (max_history={HISTORY_LENGTH:,}):"
+          f" {current / 2**20:8.1f} MiB held, {peak / 2**20:8.1f} MiB peak")
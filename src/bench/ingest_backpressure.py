@@ -0,0 +1,59 @@
+# bench/ingest_backpressure.py
+
+#- Imports -----------------------------------------------------------------------------------------
+
+import time
+from typing import Optional
+
+from talk import Talk, Ingest, Sink
+from utils.typing import Backpressure, StreamBatch
+
+from .fake_serial import FakeSerial, synthetic_stream
+
+
+#- Lib ---------------------------------------------------------------------------------------------
+
+LINES: int = 50_000
+CHANNELS: int = 8
+SLOW: float = 0.005     # seconds a slow sink spends on every batch
+
+
+# Replay the stream through Talk and Ingest, with a counting sink and, if policy is given, a sink
+# taking SLOW per batch. Returns (reader lines/s, fast sink, slow sink).
+def run(data: bytes, policy: Optional[Backpressure]) -> tuple[float, Sink, Optional[Sink]]:
+    talk = Talk()
+    ingest = Ingest()
+    ingest.attach(talk)
+
+    fast = Sink("fast", lambda batch: None, policy=Backpressure.BLOCK)
+    ingest.add(fast)
+
+    slow = None
+    if policy is not None:
+        def _slow(batch: StreamBatch) -> None: time.sleep(SLOW)
+        slow = Sink("slow", _slow, policy=policy)
+        ingest.add(slow)
+
+    talk._serial_connection = FakeSerial(data)
+    talk._running = True
+
+    started = time.perf_counter()
+    talk._read_loop()
+    rate = LINES / (time.perf_counter() - started)
+
+    ingest.stop()
+    return rate, fast, slow
+
+
+if __name__ == "__main__":
+    stream = synthetic_stream(LINES, CHANNELS)
+    print(f"{LINES} lines, {CHANNELS} channels; slow sink {SLOW * 1e3:.0f} ms per batch")
+
+    base, fast, _ = run(stream, None)
+    print(f"  {'no slow sink':<12} reader {base:10,.0f} lines/s  fast {fast.delivered:6}")
+
+    for policy in Backpressure:
+        rate, fast, slow = run(stream, policy)
+        print(f"  {policy.name:<12} reader {rate:10,.0f} lines/s  fast {fast.delivered:6}"
+              f"  slow {slow.delivered:6} delivered {slow.dropped:6} dropped"
+              f"  reader blocked {slow.blocked:6.2f} s")
@@ -0,0 +1,72 @@
+
+# bench/lod_plot.py
+
+#- Imports -----------------------------------------------------------------------------------------
+
+import os
+import time
+
+import numpy as np
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import pyqtgraph as pg
+from PySide6.QtWidgets import QApplication
+
+from utils.decimate import MinMaxPyramid, axis_view, lod_level, LOD_POINTS_PER_PIXEL
+from utils.ring_buffer import RingBuffer
+
+
+#- Lib ---------------------------------------------------------------------------------------------
+
+POINTS: int = 1_000_000     # samples per channel
+CHANNELS: int = 4
+FRAMES: int = 10
+WIDTH: int = 1200           # plot width in pixels
+BLOCK: int = 1000           # samples appended between pyramid updates while filling
+
+
+# Render FRAMES frames of every curve; return mean ms per frame.
+def render(widget: pg.PlotWidget, curves: list[pg.PlotDataItem], data) -> float:
+    started = time.perf_counter()
+
+    for _ in range(FRAMES):
+        for curve, (x, y) in zip(curves, data()):
+            curve.setData(x=x, y=y, skipFiniteCheck=True)
+        widget.grab() # force a synchronous paint
+
+    return (time.perf_counter() - started) / FRAMES * 1e3
+
+
+if __name__ == "__main__":
+    app = QApplication([])
+    widget = pg.PlotWidget()
+    widget.resize(WIDTH, 250)
+    curves = [widget.plot(pen=pg.mkPen(width=2)) for _ in range(CHANNELS)]
+
+    rng = np.random.default_rng(0)
+    axis = RingBuffer(POINTS)
+    axis.extend(np.arange(POINTS) / 1000)
+
+    readings = [RingBuffer(POINTS) for _ in range(CHANNELS)]
+    pyramids = [MinMaxPyramid(reading) for reading in readings]
+
+    # fill as a live capture would: append a block, extend the pyramid incrementally
+    started = time.perf_counter()
+    for offset in range(0, POINTS, BLOCK):
+        for reading, pyramid in zip(readings, pyramids):
+            reading.extend(rng.standard_normal(BLOCK).cumsum() + offset / 100)
+            pyramid.update()
+    fill = (time.perf_counter() - started) / (POINTS * CHANNELS) * 1e9
+
+    level = lod_level(POINTS, WIDTH * LOD_POINTS_PER_PIXEL)
+    print(f"{CHANNELS} channels x {POINTS:,} points, {WIDTH} px wide, pyramid level {level}")
+    print(f"  pyramid upkeep while filling: {fill:6.1f} ns/sample (append + update)")
+
+    raw = render(widget, curves, lambda: [(axis.view(), r.view()) for r in readings])
+    print(f"  raw plot:      {raw:8.1f} ms/frame")
+
+    lod = render(widget, curves, lambda: [
+        (axis_view(axis, 0, None, level), p.view(0, None, level)) for p in pyramids
+    ])
+    print(f"  decimated:     {lod:8.1f} ms/frame  ({len(axis_view(axis, 0, None, level))} points)")
@@ -0,0 +1,76 @@
+# bench/model_mode.py
+
+#- Imports -----------------------------------------------------------------------------------------
+
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from analyse import analyse, AnalyseJob
+from analyse.model_file import read_models
+from utils.extra import normalize_time
+from utils.typing import ModelMode, ModelParameters
+
+from .analyse_create import synthetic_readings, SOURCES, REPEATS, SAMPLES
+
+
+#- Lib ---------------------------------------------------------------------------------------------
+
+SCORES: int = 50        # windows scored per source when timing recognition
+
+
+# Train and write a file in the given mode; returns (fit seconds, file bytes, seconds per window).
+def run(mode: ModelMode, path: str) -> tuple[float, int, float]:
+    readings = synthetic_readings()
+    mp = (ModelParameters(mode=mode),) * len(readings)
+
+    job = AnalyseJob(path, lambda job: analyse._run_create(job, readings, mp))
+    job.run() # inline rather than on the job manager thread
+
+    # score fresh repetitions the way a recognizer would: every model of every source
+    sources = read_models(path)
+    windows = [np.array(trace) for trace in synthetic_readings(seed=1)[0].values[:SCORES]]
+    if mode == ModelMode.COMBINED: windows = [normalize_time(window) for window in windows]
+
+    started = time.perf_counter()
+    for window in windows:
+        for source in sources.values():
+            max(gmm.score(window) for gmm in source.models)
+    per_window = (time.perf_counter() - started) / len(windows)
+
+    return job.timings.fit, os.path.getsize(path), per_window
+
+
+# Update a file written by run() with fresh repetitions; returns (fit seconds, models per source).
+def update(mode: ModelMode, path: str) -> tuple[float, set[int]]:
+    readings = synthetic_readings(seed=2)
+    mp = (ModelParameters(mode=mode),) * len(readings)
+
+    job = AnalyseJob(path, lambda job: analyse._run_update(job, readings, mp))
+    job.run()
+
+    counts = {len(source.models) for source in read_models(path).values()}
+    expected = 1 if mode == ModelMode.COMBINED else 2 * REPEATS
+    assert counts == {expected}, f"{mode.name}: expected {expected} models per source, got {counts}"
+    return job.timings.fit, counts
+
+
+if __name__ == "__main__":
+    print(f"{SOURCES} sources x {REPEATS} repeats x {SAMPLES} samples")
+
+    with tempfile.TemporaryDirectory() as folder:
+        analyse._training_pool().submit(int).result() # start the workers outside the timings
+
+        results = {mode: run(mode, os.path.join(folder, f"{mode.name}.ges")) for mode in ModelMode}
+        updates = {mode: update(mode, os.path.join(folder, f"{mode.name}.ges")) for mode in ModelMode}
+
+    base_fit, base_size, base_score = results[ModelMode.PER_REPEAT]
+    for mode, (fit, size, score) in results.items():
+        print(f"  {mode.name:<11} fit {fit:6.2f} s  file {size / 1024:8.1f} KiB"
+              f"  score {score * 1e3:7.2f} ms/window"
+              f"  ({base_fit / fit:.1f}x fit, {base_size / size:.1f}x size,"
+              f" {base_score / score:.1f}x score)")
+    for mode, (fit, counts) in updates.items():
+        print(f"  {mode.name:<11} update fit {fit:6.2f} s, {min(counts)} models per source")
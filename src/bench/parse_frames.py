@@ -0,0 +1,81 @@
+
+# bench/parse_frames.py
+
+#- Imports -----------------------------------------------------------------------------------------
+
+import sys
+import time
+
+import numpy as np
+
+from utils.extra import parse_frames, parse_string_list
+
+from .fake_serial import synthetic_stream
+
+
+#- Lib ---------------------------------------------------------------------------------------------
+
+BATCH: int = 256        # lines per batch, as delivered by Talk
+REPEATS: int = 5
+
+
+# Expected frames of lines a device may send, for check().
+CASES: list[tuple[list[str], list[list[float]]]] = [
+    (["1,2,3", "4,5,6"], [[1, 2, 3], [4, 5, 6]]),
+    (["1,2,3,", "4,5,6,"], [[1, 2, 3], [4, 5, 6]]),      # print loop leaving a trailing comma
+    (["1,2,3,\r", " 4,5,6,, "], [[1, 2, 3], [4, 5, 6]]),
+    (["1,2,3,", "4,foo,6"], [[1, 2, 3], [4, np.nan, 6]]),
+    (["1,,3", "4,5"], [[1, np.nan, 3], [4, 5, np.nan]]),
+    (["1,2", "", ",,"], [[1, 2], [np.nan, np.nan]]),   # blank lines make no row, bare commas do
+]
+
+
+# Check parse_frames() against CASES before timing it.
+def check() -> None:
+    for lines, expected in CASES:
+        frames = parse_frames(lines)
+        assert np.array_equal(frames, np.array(expected), equal_nan=True), (lines, frames)
+
+
+# Read capture lines from text files; rows saved from the raw view carry a "HH:MM:SS.mmm  " prefix.
+def load_lines(paths: list[str]) -> list[str]:
+    lines: list[str] = []
+
+    for path in paths:
+        with open(path) as file:
+            lines += [row.rstrip("\r\n").split("  ")[-1] for row in file if row.strip()]
+
+    return lines
+
+
+# Best of REPEATS runs of parse over every batch of lines; returns lines/s.
+def throughput(lines: list[str], parse) -> float:
+    batches = [lines[i:i + BATCH] for i in range(0, len(lines), BATCH)]
+    best = float("inf")
+
+    for _ in range(REPEATS):
+        started = time.perf_counter()
+        for batch in batches: parse(batch)
+        best = min(best, time.perf_counter() - started)
+
+    return len(lines) / best
+
+
+if __name__ == "__main__":
+    # usage: python -m bench.parse_frames [capture.txt ...]
+    check()
+
+    if len(sys.argv) > 1:
+        lines = load_lines(sys.argv[1:])
+        source = ", ".join(sys.argv[1:])
+    else:
+        lines = synthetic_stream(100_000, 16).decode().splitlines()
+        source = "synthetic, 16 channels"
+
+    print(f"{len(lines):,} lines ({source}), batches of {BATCH}")
+
+    per_line = throughput(lines, lambda batch: [parse_string_list(line) for line in batch])
+    print(f"  parse_string_list per line: {per_line:>12,.0f} lines/s")
+
+    batched = throughput(lines, parse_frames)
+    print(f"  parse_frames per batch:     {batched:>12,.0f} lines/s  ({batched / per_line:.1f}x)")
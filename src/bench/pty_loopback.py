@@ -0,0 +1,171 @@
+# bench/pty_loopback.py
+
+#- Imports -----------------------------------------------------------------------------------------
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import threading
+import time
+import tty
+from datetime import datetime, timezone
+from typing import Optional
+
+import numpy as np
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtWidgets import QApplication
+
+from talk import Talk, BAUDRATES
+from window import GestureTracker
+
+
+#- Lib ---------------------------------------------------------------------------------------------
+
+DURATION: float = 3.0       # seconds the device streams at each baudrate
+SETTLE: float = 1.0         # seconds allowed for the tail of the stream to reach the plot
+CHANNELS: int = 8           # columns per line, the first of which is the line's sequence number
+WRITE_INTERVAL: float = 0.002 # seconds between device writes
+OUTPUT: str = "pty_loopback.jsonl" # one report per line, every run appended
+
+
+# Return the checked out commit, for telling results of different versions apart.
+def version() -> str:
+    try:
+        return subprocess.run(
+            ["git", "describe", "--always", "--dirty"], capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+# Simulated OpenNetics device: write numbered lines to the pty master at the bytes/s a serial
+# link at baudrate carries (10 bits per byte), until stop is set. Returns each line's send time
+# through sent, indexed by sequence number.
+def device(master: int, baudrate: int, stop: threading.Event, sent: list[float]) -> None:
+    rng = np.random.default_rng(0)
+    bytes_per_second = baudrate / 10
+    started, written, pending = time.perf_counter(), 0, b""
+
+    while not stop.is_set():
+        due = int((time.perf_counter() - started) * bytes_per_second) - written
+
+        # whole lines only, so every sent line has one send time
+        lines = []
+        while len(pending) <= due:
+            due -= len(pending)
+            if pending: lines.append(pending)
+            values = ",".join(f"{value:.3f}" for value in rng.uniform(-512, 512, CHANNELS - 1))
+            pending = f"{len(sent) + len(lines)},{values}\r\n".encode("ascii")
+
+        if lines:
+            data = b"".join(lines)
+            os.write(master, data)
+            now = time.perf_counter()
+            sent.extend([now] * len(lines))
+            written += len(data)
+
+        time.sleep(WRITE_INTERVAL)
+
+
+# Stream DURATION seconds at baudrate from a pty device through Talk into a GestureTracker and
+# return the rate's results.
+def run(app: QApplication, baudrate: int) -> dict:
+    master, slave = os.openpty()
+    tty.setraw(slave)
+
+    talk = Talk()
+    talk._port = os.ttyname(slave) # not enumerated as a serial port: set directly
+    talk._baudrate = baudrate
+    tracker = GestureTracker(talk)
+
+    # every sample that reaches the plot, with when it did
+    arrivals: list[tuple[float, np.ndarray]] = []
+    add_frames = tracker._add_frames
+    def _add_frames(timestamps: np.ndarray, frames: np.ndarray) -> None:
+        arrivals.append((time.perf_counter(), frames[:, 0].astype(np.int64)))
+        add_frames(timestamps, frames)
+    tracker._add_frames = _add_frames
+
+    talk.start()
+    stop, sent = threading.Event(), []
+    writer = threading.Thread(target=device, args=(master, baudrate, stop, sent), daemon=True)
+    writer.start()
+
+    started = time.perf_counter()
+    while time.perf_counter() - started < DURATION: app.processEvents()
+    stop.set()
+    writer.join()
+
+    settled = time.perf_counter()
+    while time.perf_counter() - settled < SETTLE: app.processEvents()
+
+    talk.stop()
+    tracker.close()
+    os.close(master)
+    os.close(slave)
+
+    # samples are numbered by the device: anything sent and never plotted was dropped on the way
+    sent = np.asarray(sent)
+    latencies, received = [np.empty(0)], [np.empty(0, dtype=np.int64)]
+    for now, seqs in arrivals:
+        seqs = seqs[(seqs >= 0) & (seqs < len(sent))]
+        latencies.append((now - sent[seqs]) * 1e3)
+        received.append(seqs)
+    latencies = np.concatenate(latencies)
+    lines = len(np.unique(np.concatenate(received)))
+
+    # Return a latency percentile in ms, None when nothing arrived.
+    def _ms(percentile: float) -> Optional[float]:
+        return round(float(np.percentile(latencies, percentile)), 2) if len(latencies) else None
+
+    return {
+        "baudrate": baudrate,
+        "lines_sent": len(sent),
+        "lines_received": lines,
+        "lines_per_second": round(lines / DURATION, 1),
+        "link_lines_per_second": round(len(sent) / DURATION, 1),
+        "dropped": len(sent) - lines,
+        "dropped_by_plot_sink": tracker._plot_sink.dropped,
+        "latency_ms": {
+            "p50": _ms(50), "p95": _ms(95), "p99": _ms(99), "max": _ms(100),
+        },
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Talk to GestureTracker throughput over a pty.")
+    parser.add_argument(
+        "--output", default=OUTPUT, help="JSON lines file the run's report is appended to"
+    )
+    parser.add_argument("--rates", nargs="*", default=BAUDRATES, help="baudrates, all if unset")
+    args = parser.parse_args()
+
+    app = QApplication([])
+    results = []
+    for rate in args.rates:
+        result = run(app, int(rate))
+        results.append(result)
+        latency = result["latency_ms"]
+        print(f"  {rate:>6} baud  {result['lines_per_second']:8.1f} lines/s"
+              f" of {result['link_lines_per_second']:8.1f}  latency p50 {latency['p50']} ms,"
+              f" p99 {latency['p99']} ms  dropped {result['dropped']}")
+
+    report = {
+        "benchmark": "pty_loopback",
+        "version": version(),
+        "date": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "duration": DURATION,
+        "channels": CHANNELS,
+        "results": results,
+    }
+    # appended, so the reports of earlier versions stay alongside for comparison
+    with open(args.output, "a") as file: file.write(json.dumps(report) + "\n")
+    print(f"results appended to {args.output}")
@@ -0,0 +1,106 @@
+# bench/recognizer.py
+
+#- Imports -----------------------------------------------------------------------------------------
+
+import os
+import tempfile
+import time
+from dataclasses import replace
+
+import numpy as np
+
+from analyse import analyse, AnalyseJob, GestureLibrary, GestureScorer, Recognizer, read_models
+from utils.extra import normalize_time
+from utils.style import FRAME_RATE
+from utils.typing import ModelMode, ModelParameters
+
+from .analyse_create import synthetic_readings, SOURCES, SAMPLES
+
+
+#- Lib ---------------------------------------------------------------------------------------------
+
+WINDOWS: int = 256      # windows scored at once when timing the scorer
+GESTURES: int = 5       # gestures hidden in the live stream
+BATCH: int = 16         # samples per fed batch, one per repainted frame
+REST: float = 300.0     # sensor level between gestures, outside the gesture's range
+
+
+# Train a combined-mode file and return its sources, thresholds set just under fresh repeats.
+def train(path: str) -> dict:
+    readings = synthetic_readings()
+    mp = (ModelParameters(mode=ModelMode.COMBINED),) * len(readings)
+
+    job = AnalyseJob(path, lambda job: analyse._run_create(job, readings, mp))
+    job.run() # inline rather than on the job manager thread
+
+    sources = read_models(path)
+    fresh = synthetic_readings(seed=1)
+    windows = np.stack([
+        np.stack([np.array(r.values[i]) for r in fresh], axis=0) for i in range(len(fresh[0].values))
+    ])
+    lowest = GestureScorer(list(sources.values())).score(windows).min(axis=0)
+
+    for (label, source), score in zip(sources.items(), lowest):
+        sources[label] = replace(source, parameters=replace(source.parameters, threshold=score - 1))
+    return sources
+
+
+# Time the vectorized scorer against score() on every model, one window at a time.
+def scoring(sources: dict) -> None:
+    rng = np.random.default_rng(2)
+    windows = rng.normal(0, 50, (WINDOWS, SOURCES, SAMPLES, 2))
+    windows[..., 0] = np.arange(SAMPLES)
+
+    scorer = GestureScorer(list(sources.values()))
+    started = time.perf_counter()
+    scorer.score(windows)
+    vectorized = (time.perf_counter() - started) / WINDOWS
+
+    started = time.perf_counter()
+    for window in windows[:WINDOWS // 16]:
+        for s, source in enumerate(sources.values()):
+            max(gmm.score(normalize_time(window[s])) for gmm in source.models)
+    looped = (time.perf_counter() - started) / (WINDOWS // 16)
+
+    print(f"  score   {looped * 1e3:7.2f} ms/window looped"
+          f"  {vectorized * 1e3:7.3f} ms/window vectorized  ({looped / vectorized:.0f}x)")
+
+
+# Feed a resting stream with hidden gestures at the repaint rate; report matches and latency.
+def live(sources: dict) -> None:
+    rng = np.random.default_rng(3)
+    gap = SAMPLES * 2
+    stream = rng.normal(REST, 5, (GESTURES * (SAMPLES + gap), SOURCES))
+    for g in range(GESTURES):
+        start = g * (SAMPLES + gap) + gap
+        for source in range(SOURCES):
+            wave = 100 * np.sin(np.arange(SAMPLES) / (20 + source))
+            stream[start:start + SAMPLES, source] = wave + rng.normal(0, 5, SAMPLES)
+
+    library = GestureLibrary()
+    library.add("bench", sources, {label: i for i, label in enumerate(sources)})
+
+    recognizer = Recognizer(library)
+    recognizer.start()
+
+    latencies = []
+    for start in range(0, len(stream), BATCH):
+        frames = stream[start:start + BATCH]
+        recognizer.feed(np.arange(start, start + len(frames), dtype=float), frames)
+        time.sleep(1 / FRAME_RATE)
+        latencies.append(recognizer.latency)
+
+    recognizer.stop()
+    print(f"  live    {recognizer.matches}/{GESTURES} gestures matched"
+          f"  latency median {np.median(latencies) * 1e3:.2f} ms"
+          f"  max {max(latencies) * 1e3:.2f} ms  (frame {1e3 / FRAME_RATE:.1f} ms)")
+
+
+if __name__ == "__main__":
+    print(f"{SOURCES} sources x {SAMPLES} sample windows")
+
+    with tempfile.TemporaryDirectory() as folder:
+        sources = train(os.path.join(folder, "bench.ges"))
+
+    scoring(sources)
+    live(sources)
@@ -0,0 +1,95 @@
+# bench/record_snapshot.py
+
+#- Imports -----------------------------------------------------------------------------------------
+
+import hashlib
+import os
+import tempfile
+import time
+
+import numpy as np
+from PySide6.QtWidgets import QApplication
+
+from analyse import analyse_create, jobs, read_models
+from talk import Talk
+from utils.typing import ModelParameters, RecordAction
+from window import GestureTracker
+
+from .analyse_create import SOURCES, REPEATS, SAMPLES
+
+
+#- Lib ---------------------------------------------------------------------------------------------
+
+BATCH: int = 64         # samples per streamed batch
+CLEAR_EVERY: int = 50   # batches between clears while training
+TIMEOUT: float = 600.0  # seconds to wait for training
+
+
+# Return a digest of every recorded array.
+def digest(readings) -> str:
+    sha = hashlib.sha1()
+    for r in readings:
+        for values in r.values: sha.update(values.tobytes())
+    return sha.hexdigest()
+
+
+# Stream one batch of SOURCES columns, each a sine of its own period plus noise.
+def stream(tracker: GestureTracker, rng: np.random.Generator, step: int) -> None:
+    counter = np.arange(step * BATCH, (step + 1) * BATCH)[:, None]
+    periods = 20 + np.arange(SOURCES)[None, :]
+    frames = 100 * np.sin(counter / periods) + rng.normal(0, 5, (BATCH, SOURCES))
+    tracker._add_frames(np.full(BATCH, tracker._ingest.now()), frames)
+
+
+if __name__ == "__main__":
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    app = QApplication([])
+    tracker = GestureTracker(Talk())
+    rng = np.random.default_rng(0)
+    step = 0
+
+    #========================================
+    # record REPEATS repetitions, clearing once in the middle of an open one
+    #========================================
+    tracker._record_sources = tuple(range(SOURCES))
+    for repeat in range(REPEATS):
+        tracker._record_data(RecordAction.START)
+        for _ in range(SAMPLES // BATCH):
+            stream(tracker, rng, step)
+            step += 1
+            if repeat == REPEATS // 2 and step % (SAMPLES // BATCH) == 2:
+                tracker._button_clear_data()
+        tracker._record_data(RecordAction.STOP)
+
+    labels = tuple(f"Source {i}" for i in range(SOURCES))
+    readings = tracker._recorded_values(labels)
+    before = digest(readings)
+    frozen = all(not values.flags.writeable for r in readings for values in r.values)
+
+    #========================================
+    # train while streaming and clearing at full rate
+    #========================================
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, "stress.ges")
+        analyse_create(path, readings, (ModelParameters(),) * SOURCES)
+
+        started, batches, clears = time.perf_counter(), 0, 0
+        while jobs.active and time.perf_counter() - started < TIMEOUT:
+            stream(tracker, rng, step)
+            step += 1
+            batches += 1
+            if batches % CLEAR_EVERY == 0:
+                tracker._button_clear_data()
+                clears += 1
+            app.processEvents()
+        elapsed = time.perf_counter() - started
+
+        models = sum(len(source.models) for source in (read_models(path) or {}).values())
+
+    tracker.close()
+
+    print(f"{SOURCES} sources x {REPEATS} repeats x {SAMPLES} samples")
+    print(f"  training {elapsed:.1f} s while streaming {batches * BATCH / elapsed:,.0f} samples/s"
+          f" with {clears} clears")
+    print(f"  snapshot unchanged: {digest(readings) == before}, read-only: {frozen},"
+          f" models written: {models}/{SOURCES * REPEATS}")
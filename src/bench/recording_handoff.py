@@ -0,0 +1,76 @@
+# bench/recording_handoff.py
+
+#- Imports -----------------------------------------------------------------------------------------
+
+import time
+import tracemalloc
+
+import numpy as np
+
+from analyse import analyse
+from utils.ring_buffer import RingBuffer
+from utils.typing import ModelMode, SensorValues
+
+from .analyse_create import SOURCES, REPEATS
+
+
+#- Lib ---------------------------------------------------------------------------------------------
+
+SAMPLES: int = 2000     # samples per recorded repetition
+GAP: int = 500          # samples between repetitions
+
+
+# Handoff before arrays: list slices zipped into nested [[x, y], ...] lists, converted back to
+# NumPy for training.
+def nested_lists(counter: RingBuffer, lines: list[RingBuffer], stamps: list[tuple[int, int]]):
+    traces = []
+    for line in lines:
+        values = []
+        for start, end in stamps:
+            times, readings = counter[start:end].tolist(), line[start:end].tolist()
+            values.append([[x, y] for x, y in zip(times, readings)])
+        traces.append([np.array(t) for t in values if len(t) > 0])
+    return traces
+
+
+# Current handoff: buffer views packed into one array per repetition, trained on as they are.
+def arrays(counter: RingBuffer, lines: list[RingBuffer], stamps: list[tuple[int, int]]):
+    traces = []
+    for line in lines:
+        values = SensorValues("")
+        for start, end in stamps: values.AddValues(counter[start:end], line[start:end])
+        traces.append(analyse._slice_traces(values.values, ModelMode.PER_REPEAT))
+    return traces
+
+
+# Return (seconds, peak traced bytes) of one handoff, timed without tracing.
+def measure(handoff, *args) -> tuple[float, int]:
+    started = time.perf_counter()
+    handoff(*args)
+    seconds = time.perf_counter() - started
+
+    tracemalloc.start()
+    handoff(*args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return seconds, peak
+
+
+if __name__ == "__main__":
+    rng = np.random.default_rng(0)
+    total = REPEATS * (SAMPLES + GAP)
+
+    counter = RingBuffer()
+    counter.extend(np.arange(total) / 1000)
+    lines = []
+    for _ in range(SOURCES):
+        lines.append(RingBuffer())
+        lines[-1].extend(rng.uniform(-512, 512, total))
+    stamps = [(r * (SAMPLES + GAP) + GAP, (r + 1) * (SAMPLES + GAP)) for r in range(REPEATS)]
+
+    print(f"{SOURCES} sources x {REPEATS} repeats x {SAMPLES} samples")
+    base_time, base_peak = measure(nested_lists, counter, lines, stamps)
+    for name, handoff in (("nested lists", nested_lists), ("arrays", arrays)):
+        seconds, peak = measure(handoff, counter, lines, stamps)
+        print(f"  {name:<13} {seconds * 1e3:8.1f} ms  peak {peak / 2**20:7.1f} MiB"
+              f"  ({base_time / seconds:.1f}x time, {base_peak / peak:.1f}x memory)")
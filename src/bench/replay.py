@@ -0,0 +1,82 @@
+# bench/replay.py
+
+#- Imports -----------------------------------------------------------------------------------------
+
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from talk import Talk, Ingest, Sink, FRAME_MODES, REPLAY_PREFIX
+from utils.recorder import Recorder
+from utils.typing import Backpressure, StreamBatch
+
+
+#- Lib ---------------------------------------------------------------------------------------------
+
+RATE: int = 1000        # recorded samples per second
+BLOCK: int = 8          # samples the device sent at once
+SECONDS: float = 3.0    # length of the recording paced in real time
+LOAD_SECONDS: float = 120.0 # length of the recording replayed as fast as possible
+CHANNELS: int = 8
+
+
+# Write a recording of sines arriving in BLOCK sample bursts at RATE.
+def record(path: str, seconds: float) -> None:
+    samples = int(RATE * seconds)
+    times = np.repeat(np.arange(0, samples, BLOCK) / RATE, BLOCK)[:samples]
+    values = 100 * np.sin(np.arange(samples)[:, None] / (20 + np.arange(CHANNELS)))
+
+    recorder = Recorder(path)
+    recorder.start()
+    for start in range(0, samples, BLOCK):
+        recorder.write(times[start:start + BLOCK], values[start:start + BLOCK])
+    recorder.stop()
+
+
+# Replay path through Talk and Ingest at speed; returns (seconds, samples, pacing errors in s):
+# how late each batch arrived against its recorded time scaled by the speed.
+def replay(path: str, mode: str, speed: float) -> tuple[float, int, np.ndarray]:
+    arrivals: list[tuple[float, int]] = []
+    def _arrived(batch: StreamBatch) -> None: arrivals.append((batch.timestamps[0], len(batch.frames)))
+
+    talk = Talk()
+    talk._mode = mode # set directly: the setter would restart the connection
+    talk.replay_speed = speed
+    ingest = Ingest()
+    ingest.attach(talk)
+    ingest.add(Sink("pacing", _arrived, policy=Backpressure.BLOCK))
+
+    started = time.perf_counter()
+    talk.port = REPLAY_PREFIX + path
+    while talk.running: time.sleep(0.01)
+    seconds = time.perf_counter() - started
+    ingest.stop()
+
+    stamps = np.array([stamp for stamp, _ in arrivals])
+    firsts = np.cumsum([0] + [count for _, count in arrivals[:-1]])
+    recorded = firsts // BLOCK * BLOCK / RATE # recorded time of each batch's first sample
+    errors = (stamps - stamps[0]) - recorded / (speed or np.inf)
+    return seconds, int(sum(count for _, count in arrivals)), errors
+
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, "replay.h5")
+        load_path = os.path.join(folder, "load.h5")
+        record(path, SECONDS)
+        record(load_path, LOAD_SECONDS)
+        print(f"{SECONDS:.0f} s recording at {RATE} Hz, {CHANNELS} channels,"
+              f" {BLOCK} sample bursts")
+
+        for mode in FRAME_MODES:
+            for speed in (1.0, 4.0):
+                seconds, samples, errors = replay(path, mode, speed)
+                print(f"  {mode:<6} {speed:g}x   {seconds:6.2f} s  {samples} samples  pacing error"
+                      f" median {np.median(errors) * 1e3:5.2f} ms,"
+                      f" p99 {np.percentile(errors, 99) * 1e3:5.2f} ms")
+
+            seconds, samples, _ = replay(load_path, mode, 0.0)
+            print(f"  {mode:<6} max  {seconds:6.2f} s  {samples} samples"
+                  f"  {samples / seconds:10,.0f} samples/s")
@@ -0,0 +1,53 @@
+
+# bench/talk_read_loop.py
+
+#- Imports -----------------------------------------------------------------------------------------
+
+import time
+
+from talk import Talk, FRAME_MODES
+
+from .fake_serial import FakeSerial, synthetic_stream, synthetic_frames
+
+
+#- Lib ---------------------------------------------------------------------------------------------
+
+LINES: int = 50_000
+CHANNELS: int = 8
+
+
+# Replay the stream through Talk._read_loop and return (lines/s, cpu µs per line).
+def run(data: bytes, chunk_size: int, mode: str = FRAME_MODES[0]) -> tuple[float, float]:
+    talk = Talk()
+    talk.chunk_size = chunk_size
+    talk._mode = mode # set directly: the setter would try to reopen a real port
+
+    received: list[int] = [0]
+    def _count(batch, stamps) -> None: received[0] += len(batch)
+    talk.signals.lines_received.connect(_count)
+    talk.signals.frames_received.connect(_count)
+
+    talk._serial_connection = FakeSerial(data)
+    talk._running = True
+
+    wall, cpu = time.perf_counter(), time.process_time()
+    talk._read_loop()
+    wall, cpu = time.perf_counter() - wall, time.process_time() - cpu
+
+    assert received[0] == LINES, f"expected {LINES} lines, got {received[0]}"
+    return LINES / wall, cpu / LINES * 1e6
+
+
+if __name__ == "__main__":
+    stream = synthetic_stream(LINES, CHANNELS)
+    frames = synthetic_frames(LINES, CHANNELS)
+    print(f"{LINES} lines, {CHANNELS} channels: {len(stream) / LINES:.1f} B/line as text,"
+          f" {len(frames) / LINES:.1f} B/frame as binary")
+
+    for label, data, chunk, mode in [
+            ("byte-by-byte", stream, 1, FRAME_MODES[0]),
+            ("chunked (in_waiting)", stream, 0, FRAME_MODES[0]),
+            ("binary frames", frames, 0, FRAME_MODES[1]),
+        ]:
+        rate, cpu_per_line = run(data, chunk, mode)
+        print(f"{label:>22}: {rate:>12,.0f} lines/s  {cpu_per_line:8.2f} µs cpu/line")
@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+# GestureTracker, without a display
+#
+#   headless.py capture --port /dev/ttyUSB0 [--baud 115200] [--mode Text] [--duration 60] out.h5
+#   headless.py capture --port replay:earlier.h5 [--speed 0] out.h5
+#   headless.py capture --port /dev/ttyUSB0 --device-time 0 [--device-time-scale 0.001] out.h5
+#   headless.py train manifest.json [--workers 32]
+#
+# capture streams a serial port to a recording, the same file the window's Capture button writes;
+# a replay port streams a capture instead (see talk/replay.py), which ends the capture when done.
+# Samples are timed when read, or by a device time column, corrected for drift (see talk/clock.py).
+# train fits gesture files from such recordings, as listed in a JSON manifest:
+#
+#   {"gestures": [{
+#       "capture": "wave.h5",                   recording to train from
+#       "output": "wave.ges",                   gesture file to create, or update with "update"
+#       "segments": [[1200, 1650], ...],        [start, end) sample indices of each repetition
+#       "sources": {"accel x": 0, ...},         gesture source label: recording column
+#       "parameters": {"threshold": -10, "random_state": 42, "n_components": "auto",
+#                      "mode": "combined"},     optional, defaults as in the window
+#       "update": false                         optional
+#   }]}
+#
+# Both print one JSON object per line on stdout: a line per trained gesture with its stage
+# timings, then a summary line. Nothing here imports Qt.
+
+#- Imports -----------------------------------------------------------------------------------------
+
+import argparse
+import contextlib
+import json
+import queue
+import sys
+import threading
+import time
+from dataclasses import asdict
+from typing import Any, Optional
+
+from opennetics.utils.debug import alert
+
+
+#- Lib ---------------------------------------------------------------------------------------------
+
+DEFAULT_BAUDRATE: str = "115200"
+CAPTURE_POLL: float = 0.1 # seconds between checks that the port is still open while capturing
+
+
+# Print one machine-readable result line; always to the real stdout, see train().
+def _report(**fields: Any) -> None:
+    print(json.dumps(fields), file=sys.__stdout__, flush=True)
+
+
+#- Capture -----------------------------------------------------------------------------------------
+
+# Stream a serial port into a recording until the duration is up or the process is interrupted.
+def capture(args: argparse.Namespace) -> int:
+    from talk import Talk, Ingest, Sink, FRAME_MODES
+    from utils.recorder import Recorder
+    from utils.typing import Backpressure
+
+    if args.mode not in FRAME_MODES:
+        alert(f"Invalid frame mode: {args.mode}, expected one of {FRAME_MODES}")
+        return 2
+
+    recorder = Recorder(args.output)
+    if not recorder.start(): return 1
+
+    # the recorder is the only sink; lossless, so a disk falling behind holds the reader
+    talk = Talk()
+    ingest = Ingest()
+    if args.device_time is not None: ingest.device_time = (args.device_time, args.device_time_scale)
+    ingest.attach(talk)
+    ingest.add(Sink(
+        "recorder", lambda batch: recorder.write(batch.timestamps, batch.frames),
+        policy=Backpressure.BLOCK
+    ))
+
+    talk.mode = args.mode
+    talk.baudrate = args.baud
+    talk.replay_speed = args.speed
+    talk.port = args.port # opens the port and starts reading
+
+    if not talk.running:
+        ingest.stop()
+        recorder.stop()
+        return 1
+
+    # until the duration is up, or the port closes: a finished replay or an unplugged device
+    started = time.perf_counter()
+    deadline = started + args.duration if args.duration is not None else float("inf")
+    try:
+        while talk.running and time.perf_counter() < deadline:
+            threading.Event().wait(min(CAPTURE_POLL, deadline - time.perf_counter()))
+    except KeyboardInterrupt:
+        pass
+
+    talk.stop()
+    ingest.stop()
+    recorder.stop()
+    seconds = time.perf_counter() - started
+
+    _report(
+        command="capture", output=args.output, samples=recorder.samples,
+        seconds=round(seconds, 3), rate=round(recorder.samples / seconds, 1) if seconds else 0.0,
+    )
+    return 0
+
+
+#- Train -------------------------------------------------------------------------------------------
+
+# Return the model parameters of a manifest entry, window defaults for anything left out.
+def _parameters(entry: dict[str, Any]):
+    from utils.typing import ModelMode, ModelParameters, N_COMPONENTS_AUTO
+
+    given = dict(entry.get("parameters", {}))
+    if str(given.get("n_components", "")).lower() == "auto":
+        given["n_components"] = N_COMPONENTS_AUTO
+    if "mode" in given:
+        given["mode"] = ModelMode[str(given["mode"]).upper().replace(" ", "_")]
+
+    return ModelParameters(**given)
+
+
+# Slice the repetitions of a manifest entry out of its recording. Returns None on failure.
+def _readings(entry: dict[str, Any]) -> Optional[list]:
+    from utils.recorder import read_capture
+    from utils.typing import SensorValues
+
+    read = read_capture(entry["capture"])
+    if read is None: return None
+    times, values = read
+
+    for start, end in entry["segments"]:
+        if not 0 <= start < end <= len(times):
+            alert(f"Segment [{start}, {end}) is outside {entry['capture']} ({len(times)} samples)")
+            return None
+
+    readings = []
+    for label, column in entry["sources"].items():
+        if column >= values.shape[1]:
+            alert(f"Column {column} of '{label}' is outside {entry['capture']}")
+            return None
+
+        source = SensorValues(label)
+        for start, end in entry["segments"]:
+            source.AddValues(times[start:end], values[start:end, column])
+        readings.append(source)
+
+    return readings
+
+
+# Train every gesture of a manifest through analyse's job manager, reporting each as it finishes.
+# analyse's own progress prints go to stderr so stdout stays machine-readable.
+def train(args: argparse.Namespace) -> int:
+    with contextlib.redirect_stdout(sys.stderr): return _train(args)
+
+
+# Body of train(), run with stdout redirected.
+def _train(args: argparse.Namespace) -> int:
+    import analyse
+    from analyse import analyse_create, analyse_update, jobs
+
+    with open(args.manifest) as file: manifest = json.load(file)
+
+    workers = args.workers or manifest.get("workers")
+    if workers: analyse.analyse.TRAINING_WORKERS = workers # before the pool is first used
+
+    # receivers run on the job manager thread; results are handed to this one
+    finished: queue.Queue = queue.Queue()
+    jobs.signals.done.connect(lambda name, timings: finished.put((name, "done", timings, "")))
+    jobs.signals.failed.connect(lambda name, reason: finished.put((name, "failed", None, reason)))
+    jobs.signals.cancelled.connect(lambda name: finished.put((name, "cancelled", None, "")))
+
+    submitted: dict[str, float] = {}
+    failures = 0
+
+    # Wait for one job and report it.
+    def _collect() -> None:
+        nonlocal failures
+        name, status, timings, reason = finished.get()
+        failures += status != "done"
+
+        fields = {stage: round(seconds, 4) for stage, seconds in asdict(timings).items()} \
+            if timings else {}
+        if reason: fields["reason"] = reason
+        _report(
+            command="train", gesture=name, status=status,
+            wall=round(time.perf_counter() - submitted.pop(name), 3), **fields,
+        )
+
+    started = time.perf_counter()
+    for entry in manifest["gestures"]:
+        output = entry["output"]
+        try:
+            mp = _parameters(entry)
+            readings = _readings(entry)
+        except (KeyError, TypeError, ValueError) as e:
+            alert(f"Invalid manifest entry for {output}: {e}")
+            readings = None
+
+        if readings is None:
+            failures += 1
+            _report(command="train", gesture=output, status="failed", reason="invalid entry")
+            continue
+
+        method = analyse_update if entry.get("update") else analyse_create
+        mps = (mp,) * len(readings)
+
+        # an entry updating a file still being trained waits for it; a full queue frees up as jobs
+        # finish
+        while output in submitted: _collect()
+        while not method(output, readings, mps):
+            if not submitted:
+                failures += 1
+                _report(command="train", gesture=output, status="failed", reason="refused")
+                break
+            _collect()
+        else:
+            submitted[output] = time.perf_counter()
+
+    while submitted: _collect()
+    jobs.stop(cancel=False)
+
+    _report(
+        command="train", gestures=len(manifest["gestures"]), failed=failures,
+        workers=analyse.analyse.TRAINING_WORKERS, seconds=round(time.perf_counter() - started, 3),
+    )
+    return 1 if failures else 0
+
+
+#- Declarations ------------------------------------------------------------------------------------
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="GestureTracker capture and training, headless.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    capture_parser = commands.add_parser("capture", help="record a serial port to a file")
+    capture_parser.add_argument("output", help="recording to write (HDF5)")
+    capture_parser.add_argument("--port", required=True)
+    capture_parser.add_argument("--baud", default=DEFAULT_BAUDRATE)
+    capture_parser.add_argument("--mode", default="Text", help="Text or Binary framing")
+    capture_parser.add_argument(
+        "--speed", type=float, default=1.0,
+        help="replay ports: multiple of real time, 0 for as fast as possible"
+    )
+    capture_parser.add_argument(
+        "--duration", type=float, default=None, help="seconds to record, until interrupted if unset"
+    )
+    capture_parser.add_argument(
+        "--device-time", type=int, default=None,
+        help="column holding the device's timestamp, recorded as NaN; samples are timed when read"
+             " if unset"
+    )
+    capture_parser.add_argument(
+        "--device-time-scale", type=float, default=1e-3,
+        help="seconds per unit of the device timestamp, 0.001 for milliseconds"
+    )
+    capture_parser.set_defaults(run=capture)
+
+    train_parser = commands.add_parser("train", help="train gesture files from recordings")
+    train_parser.add_argument("manifest", help="JSON list of gestures to train")
+    train_parser.add_argument(
+        "--workers", type=int, default=None, help="training processes, every core if unset"
+    )
+    train_parser.set_defaults(run=train)
+
+    args = parser.parse_args()
+    sys.exit(args.run(args))
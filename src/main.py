@@ -5,15 +5,17 @@
 
 import sys
 
-from PySide6.QtWidgets import QApplication
-
-from window import GestureTracker
-from talk import Talk
-
 
 #- Declarations ------------------------------------------------------------------------------------
 
+# the training pool's workers import this script again (see analyse/analyse.py): Qt and the window
+# are only imported by the process that runs the app
 if __name__ == "__main__":
+    from PySide6.QtWidgets import QApplication
+
+    from window import GestureTracker
+    from talk import Talk
+
     app = QApplication( sys.argv )
 
     talk = Talk()
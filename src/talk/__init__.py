@@ -4,7 +4,16 @@
 #- Imports -----------------------------------------------------------------------------------------
 
 from .talk import Talk
-from .utils import all_ports, BAUDRATES
+from .utils import (
+    all_ports, add_replay,
+    BAUDRATES, FRAME_MODES, REPLAY_PREFIX, REPLAY_SPEEDS, SINK_CAPACITY, DISPLAY_SINK_CAPACITY,
+    TIME_SOURCES,
+)
+from .framing import encode_frame
+from .sink import Sink
+from .ingest import Ingest
+from .replay import ReplaySerial
+from .clock import ClockSync
 
 
 #- Export ------------------------------------------------------------------------------------------
@@ -12,6 +21,18 @@ from .utils import all_ports, BAUDRATES
 __all__ = [
     "Talk",
     "all_ports",
+    "add_replay",
     "BAUDRATES",
+    "FRAME_MODES",
+    "encode_frame",
+    "Sink",
+    "Ingest",
+    "SINK_CAPACITY",
+    "DISPLAY_SINK_CAPACITY",
+    "ReplaySerial",
+    "REPLAY_PREFIX",
+    "REPLAY_SPEEDS",
+    "ClockSync",
+    "TIME_SOURCES",
 ]
 
@@ -0,0 +1,100 @@
+
+# talk/clock.py
+
+#- Imports -----------------------------------------------------------------------------------------
+
+from collections import deque
+from typing import Optional
+
+import numpy as np
+from numpy.typing import NDArray
+
+from .utils import SYNC_INTERVAL, SYNC_HISTORY, SYNC_MIN_SPAN, SYNC_RECENT, SYNC_MAX_DRIFT
+
+
+#- ClockSync Class ---------------------------------------------------------------------------------
+
+# Maps device timestamps onto the host clock, host = offset + skew * device.
+#
+# Host read times are only ever late: transmission, driver buffering and a busy reader all delay a
+# read, never advance it. The truest pairs are therefore the ones with the least host - device, the
+# lower envelope: one such pair is kept per SYNC_INTERVAL of device time. The skew (the drift
+# between the two crystals) is fitted over the last SYNC_HISTORY of them, once they span long
+# enough for device timestamp rounding not to matter, and the offset is put on the latest
+# SYNC_RECENT, so an error in the skew only counts over seconds. Mapped times keep the device's
+# own spacing, free of read jitter, on the host's clock.
+class ClockSync:
+
+    # Initialise with no pairs seen: device time maps 1:1 once the first arrives.
+    def __init__(self) -> None:
+        self._points: deque[tuple[float, float]] = deque(maxlen=SYNC_HISTORY)
+        self._best: Optional[tuple[float, float]] = None # envelope pair of the open interval
+        self._interval_end: float = -np.inf
+        self._last_device: float = -np.inf
+        self._last_mapped: float = -np.inf
+        self._skew: float = 1.0
+        self._offset: float = 0.0
+
+
+    #- Class Properties ----------------------------------------------------------------------------
+
+    # Return host seconds per device second.
+    @property
+    def skew(self) -> float: return self._skew
+
+
+    # Return the host time of device time 0.
+    @property
+    def offset(self) -> float: return self._offset
+
+
+    #- Private Methods -----------------------------------------------------------------------------
+
+    # Refit the skew over the envelope; the clocks are taken to agree until it spans
+    # SYNC_MIN_SPAN intervals.
+    def _fit(self) -> None:
+        if len(self._points) < SYNC_MIN_SPAN: return
+
+        device, host = np.array(self._points).T
+        slope = np.polyfit(device - device.mean(), host, 1)[0]
+        self._skew = float(np.clip(slope, 1 - SYNC_MAX_DRIFT, 1 + SYNC_MAX_DRIFT))
+
+
+    #- Public Methods ------------------------------------------------------------------------------
+
+    # Forget every pair, for a device that restarted or a different time column. The last mapped
+    # time is kept: times mapped after the reset still never go back past it.
+    def reset(self) -> None:
+        self._points.clear()
+        self._best = None
+        self._interval_end = -np.inf
+        self._last_device = -np.inf
+        self._skew = 1.0
+        self._offset = 0.0
+
+
+    # Return host times for (samples,) device seconds, given the host seconds each was read at.
+    # Mapped times never go backwards.
+    def map(self, device: NDArray[np.float64], host: NDArray[np.float64]) -> NDArray[np.float64]:
+        if device[0] < self._last_device: self.reset() # device restarted, or its counter wrapped
+        self._last_device = float(device[-1])
+
+        lowest = int(np.argmin(host - device))
+        if self._best is None or host[lowest] - device[lowest] < self._best[1] - self._best[0]:
+            self._best = (float(device[lowest]), float(host[lowest]))
+
+        if device[-1] >= self._interval_end:
+            self._points.append(self._best)
+            self._best = None
+            self._interval_end = float(device[-1]) + SYNC_INTERVAL
+            self._fit()
+
+        recent = list(self._points)[-SYNC_RECENT:]
+        envelope = np.array(recent + ([self._best] if self._best else []))
+        self._offset = float(np.min(envelope[:, 1] - self._skew * envelope[:, 0]))
+
+        mapped = np.maximum.accumulate(
+            np.maximum(self._offset + self._skew * device, self._last_mapped)
+        )
+        self._last_mapped = float(mapped[-1])
+        return mapped
@@ -0,0 +1,166 @@
+
+# talk/framing.py
+
+#- Imports -----------------------------------------------------------------------------------------
+
+import struct
+from typing import Union
+
+import numpy as np
+from numpy.typing import ArrayLike, NDArray
+
+
+#- Binary Frame Layout -----------------------------------------------------------------------------
+
+# offset  size   field
+# 0       2      sync word, 0xA5 0x5A
+# 2       1      channel count N
+# 3       1      sample type: 0 = float32, 1 = int16
+# 4       N * k  samples, little-endian (k = 4 for float32, 2 for int16)
+# 4 + N*k 1      checksum: sum of bytes 2 .. 4 + N*k - 1, modulo 256
+
+FRAME_SYNC: bytes = b"\xa5\x5a"
+FRAME_HEADER_SIZE: int = 4
+SAMPLE_TYPES: dict[int, np.dtype] = {
+    0: np.dtype("<f4"),
+    1: np.dtype("<i2"),
+}
+
+
+# Return one binary frame carrying values encoded as the given sample type.
+def encode_frame(values: ArrayLike, sample_type: int = 0) -> bytes:
+    payload = np.asarray(values, dtype=SAMPLE_TYPES[sample_type]).tobytes()
+    body = struct.pack("<BB", len(payload) // SAMPLE_TYPES[sample_type].itemsize, sample_type)
+    body += payload
+
+    return FRAME_SYNC + body + bytes([sum(body) & 0xFF])
+
+
+#- LineFramer Class --------------------------------------------------------------------------------
+
+# Splits newline-delimited text into lines, keeping the partial line across reads.
+class LineFramer:
+
+    # Initialise with an empty carry-over buffer and batch.
+    def __init__(self) -> None:
+        self._buffer: bytearray = bytearray()
+        self._batch: list[str] = []
+        self._stamps: list[int] = []
+
+
+    # Number of complete lines waiting in the batch.
+    def __len__(self) -> int: return len(self._batch)
+
+
+    # Move every complete line in the buffer to the batch, keep only the trailing partial line;
+    # stamp is when data was read, in perf_counter_ns, and becomes the time of the lines it ends.
+    def feed(self, data: bytes, stamp: int = 0) -> None:
+        self._buffer += data
+        start = 0
+
+        while (end := self._buffer.find(b"\n", start)) >= 0:
+            self._batch.append(self._buffer[start:end].decode(errors="replace").rstrip("\r"))
+            start = end + 1
+
+        self._stamps.extend([stamp] * (len(self._batch) - len(self._stamps)))
+        del self._buffer[:start]
+
+
+    # Return the pending batch with the (lines,) read time of each line, and start a new one.
+    def take(self) -> tuple[list[str], NDArray[np.int64]]:
+        batch, self._batch = self._batch, []
+        stamps, self._stamps = np.array(self._stamps, dtype=np.int64), []
+        return batch, stamps
+
+
+#- BinaryFramer Class ------------------------------------------------------------------------------
+
+# Decodes binary frames (see layout above) straight into rows of channel values.
+#
+# Runs of frames sharing one layout are validated and decoded together with numpy. A frame with a
+# bad checksum is skipped by resyncing on the next sync word and counted in errors.
+class BinaryFramer:
+
+    # Initialise with an empty carry-over buffer and batch.
+    def __init__(self) -> None:
+        self._buffer: bytearray = bytearray()
+        self._batch: list[NDArray[np.float64]] = []
+        self._stamps: list[NDArray[np.int64]] = []
+        self._pending: int = 0
+        self._errors: int = 0
+
+
+    # Number of decoded frames waiting in the batch.
+    def __len__(self) -> int: return self._pending
+
+
+    # Number of corrupt frames skipped so far.
+    @property
+    def errors(self) -> int: return self._errors
+
+
+    # Decode every complete frame in the buffer, keep only the trailing partial frame; stamp is
+    # when data was read, in perf_counter_ns, and becomes the time of the frames it completes.
+    def feed(self, data: bytes, stamp: int = 0) -> None:
+        self._buffer += data
+        position = 0
+
+        while (position := self._buffer.find(FRAME_SYNC, position)) >= 0:
+            if len(self._buffer) - position < FRAME_HEADER_SIZE: break
+
+            channels, sample_type = self._buffer[position + 2], self._buffer[position + 3]
+            if sample_type not in SAMPLE_TYPES or channels == 0:
+                position, self._errors = position + 1, self._errors + 1
+                continue
+
+            dtype = SAMPLE_TYPES[sample_type]
+            size = FRAME_HEADER_SIZE + channels * dtype.itemsize + 1
+            count = (len(self._buffer) - position) // size
+            if count == 0: break
+
+            # validate the run of frames that would follow with this layout all at once
+            block = np.frombuffer(
+                bytes(self._buffer[position:position + count * size]), dtype=np.uint8
+            ).reshape(count, size)
+
+            valid = (
+                (block[:, 0] == FRAME_SYNC[0]) & (block[:, 1] == FRAME_SYNC[1])
+                & (block[:, 2] == channels) & (block[:, 3] == sample_type)
+                & (block[:, 2:-1].sum(axis=1, dtype=np.uint32) % 256 == block[:, -1])
+            )
+            decoded = count if valid.all() else int(np.argmin(valid))
+
+            if decoded:
+                payload = np.ascontiguousarray(block[:decoded, FRAME_HEADER_SIZE:-1])
+                self._batch.append(payload.view(dtype).reshape(decoded, channels).astype(float))
+                self._stamps.append(np.full(decoded, stamp, dtype=np.int64))
+                self._pending += decoded
+                position += decoded * size
+
+            # the frame at position itself is corrupt: resync from the next byte
+            else:
+                position, self._errors = position + 1, self._errors + 1
+
+        # keep at most a partial frame: from the last sync candidate, or a possible half sync byte
+        keep = position if position >= 0 else max(len(self._buffer) - 1, 0)
+        del self._buffer[:keep]
+
+
+    # Return the pending frames as one (frames, channels) array with the (frames,) read time of
+    # each, and start a new batch.
+    def take(self) -> tuple[NDArray[np.float64], NDArray[np.int64]]:
+        batch, self._batch, self._pending = self._batch, [], 0
+        stamps, self._stamps = self._stamps, []
+        if not batch: return np.empty((0, 0)), np.empty(0, dtype=np.int64)
+
+        # a layout change mid-batch: pad narrower frames with NaN
+        channels = max(frames.shape[1] for frames in batch)
+        return np.vstack([
+            np.pad(frames, ((0, 0), (0, channels - frames.shape[1])), constant_values=np.nan)
+            for frames in batch
+        ]), np.concatenate(stamps)
+
+
+#- Aliases -----------------------------------------------------------------------------------------
+
+framer_t = Union[LineFramer, BinaryFramer]
@@ -0,0 +1,165 @@
+
+# talk/ingest.py
+
+#- Imports -----------------------------------------------------------------------------------------
+
+import threading
+import time
+from typing import Optional
+
+import numpy as np
+from numpy.typing import NDArray
+
+from utils.extra import parse_frames
+from utils.typing import StreamBatch
+
+from .clock import ClockSync
+from .sink import Sink
+from .talk import Talk
+
+
+#- Ingest Class ------------------------------------------------------------------------------------
+
+# The stages after a reader and its framer: parse each batch once, stamp it, and fan it out.
+#
+# Batches come from Talk's signals (or anything else calling feed_lines() / feed_frames()) and are
+# handled on that thread, up to offering the shared StreamBatch to every sink. Sinks queue on their
+# own, so how long a consumer takes is never the reader's problem, see Sink.
+#
+# Samples are stamped with when the reader got them, not when anything downstream did. With a
+# device time column set, they are stamped with the device's own time instead, mapped onto the
+# same clock by a ClockSync, and the column is blanked (NaN) in the frames: it stays in place, so
+# every other column keeps its index and whatever refers to sources by column stays valid.
+class Ingest:
+
+    # Initialise a pipeline without sinks; its clock starts now.
+    def __init__(self) -> None:
+        self._sinks: list[Sink] = []
+        self._lock = threading.Lock()
+        self._origin: int = time.perf_counter_ns()
+        self._device_time: Optional[tuple[int, float]] = None
+        self._clock = ClockSync()
+
+
+    #- Class Properties ----------------------------------------------------------------------------
+
+    # Return the sinks batches are offered to, in the order they were added.
+    @property
+    def sinks(self) -> tuple[Sink, ...]: return tuple(self._sinks)
+
+
+    # Return the column holding device time and its seconds per unit, None to use read times.
+    @property
+    def device_time(self) -> Optional[tuple[int, float]]: return self._device_time
+
+
+    # Sets the device time column and its seconds per unit, or None; drift is estimated anew.
+    @device_time.setter
+    def device_time(self, device_time: Optional[tuple[int, float]]) -> None:
+        self._clock = ClockSync()
+        self._device_time = device_time
+
+
+    #- Private Methods -----------------------------------------------------------------------------
+
+    # Return (samples,) perf_counter_ns read times as seconds on the pipeline's clock.
+    def _seconds(self, stamps: NDArray[np.int64]) -> NDArray[np.float64]:
+        return (stamps - self._origin) / 1e9
+
+
+    # Blank the device time column of frames and return (frames, times) with the device times
+    # mapped onto the pipeline's clock; rows without one keep their read time.
+    def _device_times(
+            self, frames: NDArray[np.float64], times: NDArray[np.float64],
+            device_time: tuple[int, float], clock: ClockSync
+        ) -> tuple[NDArray[np.float64], NDArray[np.float64]]:
+        column, scale = device_time
+        if column >= frames.shape[1]: return frames, times
+
+        device = frames[:, column] * scale
+        valid = np.isfinite(device)
+        if valid.any():
+            times = times.copy()
+            times[valid] = clock.map(device[valid], times[valid])
+
+        frames = frames.copy()
+        frames[:, column] = np.nan
+        return frames, times
+
+
+    # Stamp a parsed batch from the read time of each row and offer it to every sink; rows without
+    # any number aren't samples.
+    def _publish(
+            self, frames: NDArray[np.float64], lines: tuple[str, ...], stamps: NDArray[np.int64]
+        ) -> None:
+        times = self._seconds(stamps)
+
+        # read once: the setter may swap both from another thread
+        device_time, clock = self._device_time, self._clock
+        if device_time and len(frames):
+            frames, times = self._device_times(frames, times, device_time, clock)
+
+        samples = ~np.isnan(frames).all(axis=1)
+        frames, times = frames[samples], times[samples]
+        if not len(frames) and not lines: return
+
+        frames.flags.writeable = False # shared by every sink
+        batch = StreamBatch(times, frames, lines)
+
+        with self._lock: sinks = tuple(self._sinks)
+        for sink in sinks: sink.offer(batch)
+
+
+    #- Public Methods ------------------------------------------------------------------------------
+
+    # Return seconds since the pipeline started, the clock batches are stamped with.
+    def now(self) -> float: return (time.perf_counter_ns() - self._origin) / 1e9
+
+
+    # Take every batch talk receives.
+    def attach(self, talk: Talk) -> None:
+        talk.signals.lines_received.connect(self.feed_lines)
+        talk.signals.frames_received.connect(self.feed_frames)
+
+
+    # Stop taking batches from talk.
+    def detach(self, talk: Talk) -> None:
+        talk.signals.lines_received.disconnect(self.feed_lines)
+        talk.signals.frames_received.disconnect(self.feed_frames)
+
+
+    # Start a sink and offer it every later batch.
+    def add(self, sink: Sink) -> None:
+        sink.start()
+        with self._lock: self._sinks.append(sink)
+
+
+    # Stop offering batches to a sink and stop it, see Sink.stop().
+    def remove(self, sink: Sink) -> None:
+        with self._lock:
+            if sink in self._sinks: self._sinks.remove(sink)
+        sink.stop()
+
+
+    # Parse a batch of received lines and publish it; stamps are the perf_counter_ns read time of
+    # each line, now if not given.
+    def feed_lines(self, lines: list[str], stamps: Optional[NDArray[np.int64]] = None) -> None:
+        if stamps is None: stamps = np.full(len(lines), time.perf_counter_ns(), dtype=np.int64)
+
+        # parse_frames() leaves blank lines out, so their stamps go too
+        blank = np.array([not line.strip() for line in lines], dtype=bool)
+        self._publish(parse_frames(lines), tuple(lines), stamps[~blank])
+
+
+    # Publish a batch of decoded binary frames, see feed_lines().
+    def feed_frames(
+            self, frames: NDArray[np.float64], stamps: Optional[NDArray[np.int64]] = None
+        ) -> None:
+        frames = np.asarray(frames, dtype=np.float64)
+        if stamps is None: stamps = np.full(len(frames), time.perf_counter_ns(), dtype=np.int64)
+        self._publish(frames, (), stamps)
+
+
+    # Remove and stop every sink.
+    def stop(self) -> None:
+        for sink in self.sinks: self.remove(sink)
@@ -0,0 +1,195 @@
+
+# talk/replay.py
+
+#- Imports -----------------------------------------------------------------------------------------
+
+import io
+import re
+import time
+from typing import Optional
+
+import h5py
+import numpy as np
+from numpy.typing import NDArray
+
+from utils.recorder import read_capture
+
+from .framing import FRAME_SYNC, FRAME_HEADER_SIZE
+from .utils import FRAME_MODES
+
+
+#- Lib ---------------------------------------------------------------------------------------------
+
+REPLAY_CHUNK: int = 64  # bytes per paced record of files without timestamps
+SERIAL_BITS_PER_BYTE: int = 10 # start, 8 data and stop bits: bytes/s of a port is baudrate / 10
+
+_LOG_ROW = re.compile(rb"^(\d\d):(\d\d):(\d\d\.\d+)  (.*?)\r?$") # a row of a saved raw log
+_ECHO_MARKER: bytes = b"> " # raw log rows written to the device, see window/raw_console.py
+
+# paced records of a capture: every byte, the end offset of each record, its time in seconds
+records_t = tuple[bytes, NDArray[np.int64], NDArray[np.float64]]
+
+
+# Records of a recording made by utils.recorder, one sample each, encoded as the device would send
+# them in mode.
+def _recording_records(path: str, mode: str) -> records_t:
+    read = read_capture(path)
+    if read is None: raise OSError(f"unreadable recording {path}")
+    times, values = read
+
+    if mode == FRAME_MODES[1]:
+        rows, channels = values.shape
+        frames = np.empty((rows, FRAME_HEADER_SIZE + 4 * channels + 1), dtype=np.uint8)
+        frames[:, :2] = np.frombuffer(FRAME_SYNC, dtype=np.uint8)
+        frames[:, 2] = channels
+        frames[:, 3] = 0 # float32 samples
+        frames[:, FRAME_HEADER_SIZE:-1] = np.ascontiguousarray(values, dtype="<f4").view(np.uint8)
+        frames[:, -1] = frames[:, 2:-1].sum(axis=1) & 0xFF
+
+        ends = np.arange(1, rows + 1, dtype=np.int64) * frames.shape[1]
+        return frames.tobytes(), ends, times
+
+    text = io.BytesIO()
+    np.savetxt(text, values, fmt="%g", delimiter=",", newline="\r\n")
+    data = text.getvalue()
+    ends = np.flatnonzero(np.frombuffer(data, dtype=np.uint8) == ord("\n")) + 1
+    return data, ends.astype(np.int64), times
+
+
+# Records of a raw log saved by the window, one line each, paced by their row timestamps; rows
+# the window echoed to the device are left out. Returns None if data isn't such a log.
+def _log_records(data: bytes) -> Optional[records_t]:
+    rows = [row for row in data.split(b"\n") if row.strip()]
+    if not rows or not _LOG_ROW.match(rows[0]): return None
+
+    lines, times = [], []
+    for row in rows:
+        match = _LOG_ROW.match(row)
+        if not match or match[4].startswith(_ECHO_MARKER): continue
+
+        lines.append(match[4] + b"\r\n")
+        times.append(int(match[1]) * 3600 + int(match[2]) * 60 + float(match[3]))
+
+    # rows only carry the time of day: a log running past midnight wraps around
+    times = np.array(times, dtype=np.float64)
+    times += 86400 * np.cumsum(np.diff(times, prepend=times[:1]) < 0)
+
+    ends = np.cumsum([len(line) for line in lines], dtype=np.int64)
+    return b"".join(lines), ends, times
+
+
+# Records of any other file: its bytes as they are, at the rate a port at baudrate delivers them.
+def _raw_records(data: bytes, baudrate: int) -> records_t:
+    ends = np.minimum(np.arange(1, len(data) // REPLAY_CHUNK + 2) * REPLAY_CHUNK, len(data))
+    ends = np.unique(ends).astype(np.int64)
+    return data, ends, ends * SERIAL_BITS_PER_BYTE / baudrate
+
+
+#- ReplaySerial Class ------------------------------------------------------------------------------
+
+# Stands in for serial.Serial, streaming a capture file as if a device were sending it.
+#
+# A capture is cut into records, each due at its recorded time (relative to the first) divided by
+# the speed; read() hands out whatever is due and sleeps until the next record otherwise, so Talk's
+# read loop, framing and everything downstream see the original timing. Due times are measured
+# from one start time rather than between reads, so sleeping late never accumulates. Recordings
+# (HDF5, see utils.recorder) are encoded for the frame mode, raw logs saved by the window are
+# paced by their row timestamps, and other files are streamed at the baudrate. The port closes
+# itself once everything was read.
+class ReplaySerial:
+
+    # Load a capture; speed is a multiple of real time, 0 for as fast as possible.
+    def __init__(
+            self, path: str, mode: str, baudrate: int, speed: float = 1.0, timeout: float = 1.0
+        ) -> None:
+        if h5py.is_hdf5(path):
+            data, ends, times = _recording_records(path, mode)
+        else:
+            with open(path, "rb") as file: data = file.read()
+            data, ends, times = _log_records(data) or _raw_records(data, baudrate)
+
+        if not len(ends): raise ValueError(f"nothing to replay in {path}")
+
+        self._data = memoryview(data)
+        self._ends = ends
+        self._times = np.maximum.accumulate(times - times[0]) # due times, never going back
+        self._position: int = 0
+        self._timeout = timeout
+
+        # capture time at the anchor, the anchor and the speed, swapped together by the setter
+        self._clock: tuple[float, float, float] = (0.0, time.perf_counter(), speed)
+        self.is_open = True
+
+
+    #- Class Properties ----------------------------------------------------------------------------
+
+    # Returns the replay speed, 0 for as fast as possible.
+    @property
+    def speed(self) -> float: return self._clock[2]
+
+
+    # Sets the replay speed, continuing from the current position.
+    @speed.setter
+    def speed(self, speed: float) -> None:
+        now = self._now()
+        if now == np.inf: # as fast as possible: carry on from the record being read
+            record = min(np.searchsorted(self._ends, self._position, "right"), len(self._ends) - 1)
+            now = self._times[record]
+
+        self._clock = (now, time.perf_counter(), speed)
+
+
+    # Bytes due and not yet read.
+    @property
+    def in_waiting(self) -> int: return max(self._due() - self._position, 0)
+
+
+    #- Private Methods -----------------------------------------------------------------------------
+
+    # Return the capture time reached, infinite as fast as possible.
+    def _now(self) -> float:
+        base, anchor, speed = self._clock
+        return base + (time.perf_counter() - anchor) * speed if speed else np.inf
+
+
+    # Return the end offset of the last record due.
+    def _due(self) -> int:
+        due = np.searchsorted(self._times, self._now(), "right")
+        return int(self._ends[due - 1]) if due else 0
+
+
+    #- Public Methods ------------------------------------------------------------------------------
+
+    # Return up to size due bytes, waiting up to the timeout for the next record if none are.
+    def read(self, size: int = 1) -> bytes:
+        deadline = time.perf_counter() + self._timeout
+
+        while self.is_open:
+            due = self._due()
+            if due > self._position:
+                chunk = bytes(self._data[self._position:min(due, self._position + size)])
+                self._position += len(chunk)
+
+                if self._position >= len(self._data): self.is_open = False
+                return chunk
+
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0: break
+
+            _, _, speed = self._clock
+            if not speed: continue # sped up to as fast as possible meanwhile
+
+            now = self._now()
+            upcoming = self._times[np.searchsorted(self._times, now, "right")]
+            time.sleep(max(min((upcoming - now) / speed, remaining), 0.0))
+
+        return b""
+
+
+    # Writes go nowhere: there is no device to receive them.
+    def write(self, data: bytes) -> int: return len(data)
+
+
+    # Stop replaying.
+    def close(self) -> None:
+        self.is_open = False
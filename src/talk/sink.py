@@ -0,0 +1,206 @@
+
+# talk/sink.py
+
+#- Imports -----------------------------------------------------------------------------------------
+
+import threading
+import time
+from collections import deque
+from typing import Callable, Optional
+
+import numpy as np
+from opennetics.utils.debug import alert
+
+from utils.typing import Backpressure, StreamBatch
+
+from .utils import SINK_CAPACITY
+
+
+#- Lib ---------------------------------------------------------------------------------------------
+
+# Concatenate batches into one, padding narrower frames with NaN columns.
+def _merge(batches: list[StreamBatch]) -> StreamBatch:
+    channels = max(batch.frames.shape[1] for batch in batches)
+    frames = np.concatenate([
+        np.pad(batch.frames, ((0, 0), (0, channels - batch.frames.shape[1])),
+            constant_values=np.nan)
+        for batch in batches
+    ])
+    return StreamBatch(
+        timestamps=np.concatenate([batch.timestamps for batch in batches]),
+        frames=frames,
+        lines=tuple(line for batch in batches for line in batch.lines),
+    )
+
+
+# Keep every other sample and line of a batch, always including the newest.
+def _decimate(batch: StreamBatch) -> StreamBatch:
+    keep = slice((len(batch.frames) - 1) % 2, None, 2)
+    return StreamBatch(
+        timestamps=batch.timestamps[keep],
+        frames=batch.frames[keep],
+        lines=batch.lines[(len(batch.lines) - 1) % 2::2],
+    )
+
+
+#- Sink Class --------------------------------------------------------------------------------------
+
+# One consumer of the incoming stream, behind its own bounded queue.
+#
+# Ingest offers every batch to every sink from the reader thread. offer() only queues: a sink with
+# a receiver calls it on its own thread, one without is drained by its consumer (the GUI, on its
+# render timer). Once capacity batches are waiting the sink's policy decides what gives, so a slow
+# consumer falls behind on its own without stalling the reader, unless its policy is BLOCK.
+class Sink:
+
+    # Initialise a stopped sink; receiver is called with each batch, or None to drain() instead.
+    def __init__(
+            self, name: str, receiver: Optional[Callable[[StreamBatch], None]] = None,
+            capacity: int = SINK_CAPACITY, policy: Backpressure = Backpressure.DROP_OLDEST
+        ) -> None:
+        self._name = name
+        self._receiver = receiver
+        self._capacity: int = max(capacity, 1)
+        self._policy = policy
+
+        self._queue: deque[StreamBatch] = deque()
+        self._condition = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._running: bool = False
+
+        self._delivered: int = 0    # samples handed to the consumer
+        self._dropped: int = 0      # samples dropped or sampled away
+        self._blocked: float = 0.0  # seconds the reader waited on this sink
+
+
+    #- Class Properties ----------------------------------------------------------------------------
+
+    # Return the name the sink reports under.
+    @property
+    def name(self) -> str: return self._name
+
+
+    # Return what the sink does once its queue is full.
+    @property
+    def policy(self) -> Backpressure: return self._policy
+
+
+    # Return the number of batches waiting.
+    @property
+    def pending(self) -> int: return len(self._queue)
+
+
+    # Return the number of samples handed to the consumer.
+    @property
+    def delivered(self) -> int: return self._delivered
+
+
+    # Return the number of samples lost to the policy.
+    @property
+    def dropped(self) -> int: return self._dropped
+
+
+    # Return the seconds the reader spent waiting for room, BLOCK only.
+    @property
+    def blocked(self) -> float: return self._blocked
+
+
+    # Return whether the sink accepts batches.
+    @property
+    def running(self) -> bool: return self._running
+
+
+    #- Private Methods -----------------------------------------------------------------------------
+
+    # Bring an overfull queue back to capacity; called holding the condition.
+    def _shed(self) -> None:
+        if self._policy == Backpressure.SAMPLE:
+            merged = _merge(list(self._queue))
+            kept = _decimate(merged)
+            self._dropped += len(merged.frames) - len(kept.frames)
+
+            self._queue.clear()
+            self._queue.append(kept)
+            return
+
+        while len(self._queue) > self._capacity:
+            self._dropped += len(self._queue.popleft().frames)
+
+
+    # Receiver thread: deliver queued batches in order until stopped and empty.
+    def _run_loop(self) -> None:
+        while True:
+            with self._condition:
+                while self._running and not self._queue: self._condition.wait()
+                if not self._queue: return
+
+                batch = self._queue.popleft()
+                self._condition.notify_all() # room for a blocked reader
+
+            try:
+                self._receiver(batch)
+            except Exception as e:
+                alert(f"Sink '{self._name}' failed: {e}")
+
+            self._delivered += len(batch.frames)
+
+
+    #- Public Methods ------------------------------------------------------------------------------
+
+    # Start accepting batches, and delivering them when there is a receiver.
+    def start(self) -> None:
+        if self._running: return
+
+        self._running = True
+        if self._receiver is None: return
+
+        self._thread = threading.Thread(target=self._run_loop, daemon=True)
+        self._thread.start()
+
+
+    # Queue a batch, applying the policy if the queue is full; BLOCK waits here for room.
+    def offer(self, batch: StreamBatch) -> None:
+        with self._condition:
+            if self._policy == Backpressure.BLOCK and len(self._queue) >= self._capacity:
+                started = time.perf_counter()
+                while self._running and len(self._queue) >= self._capacity:
+                    self._condition.wait()
+                self._blocked += time.perf_counter() - started
+
+            if not self._running: return
+
+            self._queue.append(batch)
+            if len(self._queue) > self._capacity: self._shed()
+            self._condition.notify_all()
+
+
+    # Return and clear every queued batch, oldest first; for sinks without a receiver.
+    def drain(self) -> list[StreamBatch]:
+        with self._condition:
+            batches = list(self._queue)
+            self._queue.clear()
+            self._condition.notify_all()
+
+        self._delivered += sum(len(batch.frames) for batch in batches)
+        return batches
+
+
+    # Drop every queued batch undelivered, e.g. data its consumer has since cleared; returns the
+    # number of samples dropped. Unlike the policy's losses these aren't counted as dropped.
+    def discard(self) -> int:
+        with self._condition:
+            samples = sum(len(batch.frames) for batch in self._queue)
+            self._queue.clear()
+            self._condition.notify_all()
+
+        return samples
+
+
+    # Stop accepting batches; a receiver still gets everything already queued.
+    def stop(self) -> None:
+        with self._condition:
+            self._running = False
+            self._condition.notify_all()
+
+        if self._thread: self._thread.join()
+        self._thread = None
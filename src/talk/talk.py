@@ -3,13 +3,19 @@
 
 #- Imports -----------------------------------------------------------------------------------------
 
+import time
 import threading
-from typing import Optional
+from typing import Optional, Union
 
 import serial
 from opennetics.utils.debug import alert
 
-from .utils import all_ports, BAUDRATES
+from .utils import (
+    all_ports, BAUDRATES, FRAME_MODES, REPLAY_PREFIX,
+    READ_CHUNK_SIZE, BATCH_INTERVAL, BATCH_SIZE,
+)
+from .framing import LineFramer, BinaryFramer, framer_t
+from .replay import ReplaySerial
 from .talk_signal import TalkSignals
 
 
@@ -23,8 +29,11 @@ class Talk:
 
         self._port: str = ""
         self._baudrate: int = 115200  # default rate
+        self._chunk_size: int = READ_CHUNK_SIZE
+        self._mode: str = FRAME_MODES[0] # newline-delimited text
+        self._replay_speed: float = 1.0  # for replay ports, see talk/replay.py
 
-        self._serial_connection: Optional[serial.Serial] = None
+        self._serial_connection: Optional[Union[serial.Serial, ReplaySerial]] = None
         self._thread: Optional[threading.Thread] = None
         self._running = False
 
@@ -36,12 +45,12 @@ class Talk:
     def port(self) -> str: return self._port
 
 
-    # Sets the serial port and restarts the connection if valid.
+    # Sets the serial port, or a replay port, and restarts the connection if valid.
     @port.setter
     def port(self, port: str) -> None:
         self._cleanup() # safely close the existing connection
 
-        if port in all_ports():
+        if port in all_ports() or port.startswith(REPLAY_PREFIX):
             self._port = port
             self._restart_connection()  # restart the connection
             return
@@ -67,29 +76,97 @@ class Talk:
         alert(f"Invalid baudrate selected: {rate}")
 
 
+    # Returns the framing of the incoming stream, one of FRAME_MODES.
+    @property
+    def mode(self) -> str: return self._mode
+
+
+    # Sets the framing of the incoming stream and restarts the connection if valid.
+    @mode.setter
+    def mode(self, mode: str) -> None:
+        self._cleanup()
+
+        if mode in FRAME_MODES:
+            self._mode = mode
+            self._restart_connection() # restart the connection
+            return
+
+        alert(f"Invalid frame mode selected: {mode}")
+
+
+    # Returns the upper bound of bytes pulled per read, 0 reads everything waiting.
+    @property
+    def chunk_size(self) -> int: return self._chunk_size
+
+
+    # Sets the upper bound of bytes pulled per read; takes effect on the next read.
+    @chunk_size.setter
+    def chunk_size(self, size: int) -> None:
+        if size < 0:
+            alert(f"Invalid chunk size selected: {size}")
+            return
+
+        self._chunk_size = size
+
+
+    # Returns the speed replay ports stream at, a multiple of real time; 0 is as fast as possible.
+    @property
+    def replay_speed(self) -> float: return self._replay_speed
+
+
+    # Sets the replay speed; a replay in progress carries on at the new speed.
+    @replay_speed.setter
+    def replay_speed(self, speed: float) -> None:
+        if speed < 0:
+            alert(f"Invalid replay speed selected: {speed}")
+            return
+
+        self._replay_speed = speed
+        connection = self._serial_connection
+        if isinstance(connection, ReplaySerial): connection.speed = speed
+
+
+    # Returns whether the reading thread is running; it stops by itself once a replay finishes.
+    @property
+    def running(self) -> bool:
+        return self._running and self._thread is not None and self._thread.is_alive()
+
+
     #- Private Methods -----------------------------------------------------------------------------
 
-    # Continuously reads data from the serial connection and emits signals for received data.
+    # Continuously reads data from the serial connection and emits batches of received data.
     def _read_loop(self):
-        data_buffer = bytearray()
+        framer = self._new_framer()  # splits the byte stream into lines or binary frames
+        batch_deadline = 0.0         # time by which the pending batch has to be delivered
 
         while self._running and self._serial_connection and self._serial_connection.is_open:
             try:
-                data = self._serial_connection.read()  # read byte-by-byte to handle partial lines
+                waiting = self._serial_connection.in_waiting
 
-                if data:
-                    b = data[0]
-                    if b == 10:  # newline '\n'
-                        line = data_buffer.decode(errors="replace").rstrip("\r")
-                        data_buffer.clear()
-                        self.signals.line_received.emit(line)
+                # nothing left to read: deliver the pending batch once its window closes, rather
+                # than holding it while blocked on the next read
+                if not waiting and len(framer):
+                    remaining = batch_deadline - time.perf_counter()
+                    if remaining > 0:
+                        time.sleep(remaining)
+                        continue
 
-                    else:
-                        data_buffer.append(b)
-                        self.signals.single_received.emit(bytes([b]).decode('ascii'))
+                    self._emit_batch(framer)
+                    continue
 
-                else:
-                    continue  # read timed out; allow loop to check _running
+                # pull everything already waiting in one call, blocking for at least one byte
+                size = max(1, waiting)
+                if self._chunk_size: size = min(size, self._chunk_size)
+
+                data = self._serial_connection.read(size)
+                stamp = time.perf_counter_ns() # the read time of everything data completes
+                if not data: continue  # read timed out; allow loop to check _running
+
+                if not len(framer): batch_deadline = time.perf_counter() + BATCH_INTERVAL
+                framer.feed(data, stamp)
+
+                if len(framer) >= BATCH_SIZE or time.perf_counter() >= batch_deadline:
+                    self._emit_batch(framer)
 
             except Exception as e:
                 # alert(e) # uncomment to debug
@@ -98,9 +175,25 @@ class Talk:
                 # other errors
                 pass
 
+        self._emit_batch(framer)
         self._cleanup()
 
 
+    # Return a framer for the current mode.
+    def _new_framer(self) -> framer_t:
+        return BinaryFramer() if self._mode == FRAME_MODES[1] else LineFramer()
+
+
+    # Hand the framer's pending batch, and its read times, over to the receivers in a single signal.
+    def _emit_batch(self, framer: framer_t) -> None:
+        if not len(framer): return
+
+        if isinstance(framer, BinaryFramer):
+            self.signals.frames_received.emit(*framer.take())
+        else:
+            self.signals.lines_received.emit(*framer.take())
+
+
     # Safely closes the serial connection and cleans up resources.
     def _cleanup(self):
         if self._serial_connection:
@@ -129,11 +222,17 @@ class Talk:
         if not self._port: return
 
         try:
-            self._serial_connection = serial.Serial(
-                port=self._port,
-                baudrate=self._baudrate,
-                timeout=1.0
-            )
+            if self._port.startswith(REPLAY_PREFIX):
+                self._serial_connection = ReplaySerial(
+                    self._port[len(REPLAY_PREFIX):], self._mode, self._baudrate,
+                    speed=self._replay_speed, timeout=1.0
+                )
+            else:
+                self._serial_connection = serial.Serial(
+                    port=self._port,
+                    baudrate=self._baudrate,
+                    timeout=1.0
+                )
 
         except Exception as e:
             alert(f"Failed to open serial port {self._port} @ {self._baudrate}: {e}")
@@ -3,12 +3,15 @@
 
 #- Imports -----------------------------------------------------------------------------------------
 
-from PySide6.QtCore import QObject, Signal
+from utils.signal import Signal
 
 
 #- TalkSignals Class -------------------------------------------------------------------------------
 
-class TalkSignals(QObject):
-    line_received = Signal(str)
-    single_received = Signal(str)
+# Signals emitted on the serial reader thread; receivers run there unless bridged (see GuiBridge).
+class TalkSignals:
+    # each batch comes with the (batch,) int64 perf_counter_ns time the read completing each item
+    # returned, taken on the reader thread
+    lines_received = Signal(list, object)     # batch of complete lines, '\r\n' stripped
+    frames_received = Signal(object, object)  # batch of binary frames, (frames, channels) floats
 
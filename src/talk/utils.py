@@ -3,6 +3,9 @@
 
 #- Imports -----------------------------------------------------------------------------------------
 
+import os
+from typing import Optional
+
 import serial.tools.list_ports
 
 
@@ -12,7 +15,52 @@ BAUDRATES = [ "1200", "2400", "4800", "9600",
     "14400", "19200", "38400", "57600",
     "115200", "230400", "250000", "500000"]
 
+# "Text": newline-delimited comma separated values, "Binary": frames described in talk/framing.py
+FRAME_MODES = ["Text", "Binary"]
+
+# upper bound of bytes pulled per serial read, 0 reads everything waiting in the driver
+READ_CHUNK_SIZE: int = 0
+
+# lines are delivered in batches: at most BATCH_SIZE lines, held for at most BATCH_INTERVAL seconds
+BATCH_SIZE: int = 256
+BATCH_INTERVAL: float = 0.008
+
+# batches a sink queues before its backpressure policy applies, see talk/sink.py
+SINK_CAPACITY: int = 64
+# batches the window's plot and raw sinks hold: they're lossless (BLOCK) since recordings are taken
+# from the plot, so this many, seconds of stream, is how far the GUI may fall behind before the
+# reader waits on it
+DISPLAY_SINK_CAPACITY: int = 2048
+
+# ports naming a capture file to replay rather than a device, see talk/replay.py
+REPLAY_PREFIX: str = "replay:"
+# replay speeds offered by the window: multiples of real time, 0 replays as fast as possible
+REPLAY_SPEEDS: dict[str, float] = {"1x": 1.0, "2x": 2.0, "4x": 4.0, "10x": 10.0, "Max": 0.0}
 
+# device timestamps, see talk/clock.py: the window's time sources, None for the read time or the
+# column holding device time and its seconds per unit
+TIME_SOURCES: dict[str, Optional[tuple[int, float]]] = {
+    "Read Time": None,
+    "Device ms (col 1)": (0, 1e-3),
+    "Device us (col 1)": (0, 1e-6),
+}
+SYNC_INTERVAL: float = 0.5      # device seconds per lower envelope point
+SYNC_HISTORY: int = 240         # envelope points the drift is fitted over, 2 minutes
+SYNC_MIN_SPAN: int = 20         # envelope points before the drift is fitted, 10 seconds
+SYNC_RECENT: int = 8            # latest envelope points the offset is taken from, 4 seconds
+SYNC_MAX_DRIFT: float = 0.01    # largest rate difference between the clocks believed, 1%
+
+_replays: list[str] = [] # capture files listed as ports, see add_replay()
+
+
+# Return every serial port, followed by the replay ports added so far.
 def all_ports() -> list[str]:
-    return [p.device for p in serial.tools.list_ports.comports()]
+    return [p.device for p in serial.tools.list_ports.comports()] + _replays
+
+
+# List a capture file as a port that replays it, and return the port's name.
+def add_replay(path: str) -> str:
+    port = REPLAY_PREFIX + os.path.abspath(path)
+    if port not in _replays: _replays.append(port)
+    return port
 
@@ -0,0 +1,139 @@
+
+# utils/decimate.py
+
+#- Imports -----------------------------------------------------------------------------------------
+
+from typing import Optional
+
+import numpy as np
+from numpy.typing import NDArray
+
+from .ring_buffer import RingBuffer
+
+
+#- Lib ---------------------------------------------------------------------------------------------
+
+LOD_FACTOR: int = 4             # samples folded into one bucket per pyramid level
+LOD_POINTS_PER_PIXEL: int = 2   # plotted points allowed per horizontal pixel
+
+
+# Coarsest detail needed: the lowest pyramid level drawing count samples in at most max_points.
+# Level 0 is the raw data; level k folds LOD_FACTOR**k samples into one min/max pair.
+def lod_level(count: int, max_points: int) -> int:
+    max_points = max(max_points, 2)
+    level, points = 0, count
+
+    while points > max_points:
+        level += 1
+        points = 2 * -(-count // LOD_FACTOR ** level)
+
+    return level
+
+
+# Buckets of a level covering [start_idx, end_idx) of buffer: (first, last) whole buckets held,
+# followed by the [tail_start, tail_end) samples of the trailing partial bucket.
+def _bucket_range(
+        buffer: RingBuffer, start_idx: int, end_idx: Optional[int], level: int
+    ) -> tuple[int, int, int, int]:
+    size = LOD_FACTOR ** level
+    start, end, _ = slice(start_idx, end_idx).indices(len(buffer))
+    start = max(start, buffer.dropped)
+
+    first = -(-start // size)   # first bucket with every sample still held
+    last = end // size          # one past the last complete bucket in range
+
+    if last < first: return first, first, start, max(start, end)
+    return first, last, last * size, end
+
+
+# Time axis matching MinMaxPyramid.view for the same range and level.
+def axis_view(
+        axis: RingBuffer, start_idx: int = 0, end_idx: Optional[int] = None, level: int = 0
+    ) -> NDArray[np.float64]:
+    if level == 0: return axis.view(start_idx, end_idx)
+
+    size = LOD_FACTOR ** level
+    first, last, tail_start, tail_end = _bucket_range(axis, start_idx, end_idx, level)
+
+    # one x value per bucket (its first sample), drawn twice: once for the min, once for the max
+    x_values = np.repeat(axis.view(first * size, last * size)[::size], 2)
+    if tail_end > tail_start:
+        x_values = np.append(x_values, np.repeat(axis.view(tail_start, tail_start + 1), 2))
+
+    return x_values
+
+
+#- MinMaxPyramid Class -----------------------------------------------------------------------------
+
+# Min/max level-of-detail pyramid over a RingBuffer, extended incrementally as samples arrive.
+#
+# Level k stores, for every LOD_FACTOR**k consecutive samples, their minimum and maximum; each level
+# is built from the one below it. Drawing a level as interleaved (min, max) pairs keeps every peak
+# visible while the point count stays proportional to the plot width instead of the history.
+class MinMaxPyramid:
+
+    # Initialise an empty pyramid over source.
+    def __init__(self, source: RingBuffer) -> None:
+        self._source = source
+        self._levels: list[tuple[RingBuffer, RingBuffer]] = []
+        self.reset()
+
+
+    #- Public Methods ------------------------------------------------------------------------------
+
+    # Fold every newly completed bucket of the source into the levels.
+    def update(self) -> None:
+        for level, (mins, maxs) in enumerate(self._levels):
+            lower_min, lower_max = (
+                (self._source, self._source) if level == 0 else self._levels[level - 1]
+            )
+
+            done = len(mins)
+            ready = len(lower_min) // LOD_FACTOR
+            start = max(done, -(-lower_min.dropped // LOD_FACTOR))
+
+            # source dropped samples that were never folded in: leave a gap
+            if start > done:
+                mins.extend(np.full(start - done, np.nan))
+                maxs.extend(np.full(start - done, np.nan))
+
+            if ready <= start: break # nothing new here means nothing new further up
+
+            lows = lower_min.view(start * LOD_FACTOR, ready * LOD_FACTOR)
+            highs = lower_max.view(start * LOD_FACTOR, ready * LOD_FACTOR)
+            # fmin/fmax skip NaN gaps unless a whole bucket is missing
+            mins.extend(np.fmin.reduce(lows.reshape(-1, LOD_FACTOR), axis=1))
+            maxs.extend(np.fmax.reduce(highs.reshape(-1, LOD_FACTOR), axis=1))
+
+
+    # Samples [start_idx, end_idx) at the given level: raw view at 0, else (min, max) pairs.
+    def view(
+            self, start_idx: int = 0, end_idx: Optional[int] = None, level: int = 0
+        ) -> NDArray[np.float64]:
+        level = min(level, len(self._levels))
+        if level == 0: return self._source.view(start_idx, end_idx)
+
+        self.update()
+        first, last, tail_start, tail_end = _bucket_range(self._source, start_idx, end_idx, level)
+
+        mins, maxs = self._levels[level - 1]
+        buckets = last - first
+        tail = self._source.view(tail_start, tail_end)
+
+        values = np.empty(2 * buckets + (2 if tail.size else 0))
+        values[0:2 * buckets:2] = mins.view(first, last)
+        values[1:2 * buckets:2] = maxs.view(first, last)
+        if tail.size: values[-2:] = np.fmin.reduce(tail), np.fmax.reduce(tail)
+
+        return values
+
+
+    # Drop all levels; called whenever the source history is reset.
+    def reset(self) -> None:
+        self._levels = []
+        size = LOD_FACTOR
+
+        while size <= self._source.max_history:
+            history = self._source.max_history // size + 2
+            self._levels.append((RingBuffer(history), RingBuffer(history)))
+            size *= LOD_FACTOR
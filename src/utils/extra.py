@@ -5,6 +5,9 @@
 
 from typing import Any
 
+import numpy as np
+from numpy.typing import NDArray
+
 
 #- Lib ---------------------------------------------------------------------------------------------
 
@@ -76,3 +79,40 @@ def parse_string_list(string: str) -> list[Any]:
 
     return result
 
+
+# Return a 2D float array (one row per non-blank line) for a batch of "12,324,34,foo,11" strings.
+# Non-numeric tokens and fields missing from shorter lines become NaN; trailing delimiters, as
+# print loops leave them ("1,2,3,"), don't make a field.
+def parse_frames(lines: list[str]) -> NDArray[np.float64]:
+    # a line of nothing but delimiters still makes a (NaN) row: loadtxt would skip it as blank
+    lines = [line.strip().rstrip(',') or "nan" for line in lines if line.strip()]
+    if not lines: return np.empty((0, 0))
+
+    # fast path: every line is numeric with the same field count, so numpy's C parser converts the
+    # whole batch in one call
+    try:
+        return np.loadtxt(lines, delimiter=',', comments=None, ndmin=2)
+
+    except ValueError:
+        pass # non-numeric token or ragged lines: parse line by line below
+
+    rows = [
+        [value if isinstance(value, float) else np.nan for value in parse_string_list(line)]
+        for line in lines
+    ]
+
+    frames = np.full((len(rows), max(len(row) for row in rows)), np.nan)
+    for i, row in enumerate(rows): frames[i, :len(row)] = row
+
+    return frames
+
+
+# Return a copy of a (samples, [time, value]) trace with time rescaled to run from 0 to 1, so
+# repetitions of different length and recording time line up.
+def normalize_time(trace: NDArray[np.float64]) -> NDArray[np.float64]:
+    trace = np.array(trace, dtype=np.float64)
+    time = trace[:, 0]
+    span = time[-1] - time[0]
+
+    trace[:, 0] = (time - time[0]) / span if span > 0 else 0.0
+    return trace
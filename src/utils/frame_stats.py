@@ -0,0 +1,80 @@
+
+# utils/frame_stats.py
+
+#- Imports -----------------------------------------------------------------------------------------
+
+import time
+from collections import deque
+
+
+#- FrameStats Class --------------------------------------------------------------------------------
+
+# Rolling frame rate and render time over the last few seconds of frames.
+class FrameStats:
+
+    # Initialise with the length, in seconds, of the rolling window.
+    def __init__(self, window: float = 1.0) -> None:
+        self._window: float = window
+        self._frames: deque[tuple[float, float]] = deque() # (finish time, render duration)
+        self._dropped: int = 0
+
+
+    #- Class Properties ----------------------------------------------------------------------------
+
+    # Frames finished per second over the rolling window.
+    @property
+    def fps(self) -> float:
+        self._expire(time.perf_counter())
+        return len(self._frames) / self._window
+
+
+    # Mean render time of the frames in the window, in milliseconds.
+    @property
+    def latency(self) -> float:
+        self._expire(time.perf_counter())
+        if not self._frames: return 0.0
+        return sum(duration for _, duration in self._frames) / len(self._frames) * 1e3
+
+
+    # Slowest render time of the frames in the window, in milliseconds.
+    @property
+    def max_latency(self) -> float:
+        self._expire(time.perf_counter())
+        return max((duration for _, duration in self._frames), default=0.0) * 1e3
+
+
+    # Total number of frames skipped since creation.
+    @property
+    def dropped(self) -> int: return self._dropped
+
+
+    #- Private Methods -----------------------------------------------------------------------------
+
+    # Forget frames that finished before the window ending at now; also called on reads, so idle
+    # rendering reads as 0 fps instead of the last busy rate.
+    def _expire(self, now: float) -> None:
+        while self._frames and self._frames[0][0] < now - self._window:
+            self._frames.popleft()
+
+
+    #- Public Methods ------------------------------------------------------------------------------
+
+    # Mark the start of a frame; pass the returned value to end().
+    def begin(self) -> float: return time.perf_counter()
+
+
+    # Mark the end of a frame started at started.
+    def end(self, started: float) -> None:
+        now = time.perf_counter()
+        self._frames.append((now, now - started))
+        self._expire(now)
+
+
+    # Record frames that were due but not rendered.
+    def drop(self, count: int = 1) -> None:
+        self._dropped += count
+
+
+    # Short human readable summary for status labels.
+    def summary(self) -> str:
+        return f"{self.fps:3.0f} fps  {self.latency:5.1f} ms  {self._dropped} dropped"
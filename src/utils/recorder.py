@@ -0,0 +1,157 @@
+
+# utils/recorder.py
+
+#- Imports -----------------------------------------------------------------------------------------
+
+import queue
+import threading
+import time
+from typing import Optional
+
+import h5py
+import numpy as np
+from numpy.typing import NDArray
+from opennetics.utils.debug import alert
+
+
+#- Lib ---------------------------------------------------------------------------------------------
+
+RECORD_FLUSH_INTERVAL: float = 1.0  # seconds between flushes to disk
+RECORD_CHUNK: int = 4096            # samples per HDF5 chunk
+RECORD_QUEUE: int = 64              # blocks waiting for the writer before write() waits too
+
+
+#- Recorder Class ----------------------------------------------------------------------------------
+
+# Streams samples to an append-only HDF5 file from a background thread.
+#
+# The file holds a "time" dataset (samples,) and a "values" dataset (samples, channels), both
+# growing as data arrives; channels that appear later are NaN for earlier samples. The file is
+# opened in SWMR mode and flushed every RECORD_FLUSH_INTERVAL seconds, so it can be read while
+# recording and stays readable up to the last flush if the application dies. At most RECORD_QUEUE
+# blocks wait to be written: a disk that falls behind holds up write() rather than fill memory.
+class Recorder:
+
+    # Initialise a recorder for path; nothing is opened until start().
+    def __init__(self, path: str) -> None:
+        self._path: str = path
+        self._queue: queue.Queue = queue.Queue(maxsize=RECORD_QUEUE)
+        self._thread: Optional[threading.Thread] = None
+        self._samples: int = 0
+
+
+    #- Class Properties ----------------------------------------------------------------------------
+
+    # Return the file being written.
+    @property
+    def path(self) -> str: return self._path
+
+
+    # Return whether the writer thread is running.
+    @property
+    def running(self) -> bool: return self._thread is not None and self._thread.is_alive()
+
+
+    # Return the number of samples written to the file so far.
+    @property
+    def samples(self) -> int: return self._samples
+
+
+    #- Private Methods -----------------------------------------------------------------------------
+
+    # Writer thread: append queued blocks, flushing periodically, until stop() queues None.
+    def _write_loop(self, file: h5py.File) -> None:
+        last_flush = time.perf_counter()
+
+        try:
+            while True:
+                try:
+                    block = self._queue.get(timeout=RECORD_FLUSH_INTERVAL)
+                except queue.Empty:
+                    block = ()
+
+                if block is None: break
+                if block: self._append(file, *block)
+
+                if time.perf_counter() - last_flush >= RECORD_FLUSH_INTERVAL:
+                    file.flush()
+                    last_flush = time.perf_counter()
+
+        except Exception as e:
+            alert(f"Recording to {self._path} stopped: {e}")
+
+        finally:
+            file.close()
+
+
+    # Grow both datasets and write one block at the end.
+    def _append(
+            self, file: h5py.File, timestamps: NDArray[np.float64], frames: NDArray[np.float64]
+        ) -> None:
+        times, values = file["time"], file["values"]
+        start, end = self._samples, self._samples + len(frames)
+
+        times.resize((end,))
+        values.resize((end, max(values.shape[1], frames.shape[1])))
+
+        times[start:end] = timestamps
+        values[start:end, :frames.shape[1]] = frames
+        self._samples = end
+
+
+    #- Public Methods ------------------------------------------------------------------------------
+
+    # Create the file and start the writer thread. Returns False if the file couldn't be created.
+    def start(self) -> bool:
+        try:
+            file = h5py.File(self._path, "w", libver="latest")
+            file.create_dataset(
+                "time", shape=(0,), maxshape=(None,), chunks=(RECORD_CHUNK,), dtype="f8"
+            )
+            file.create_dataset(
+                "values", shape=(0, 0), maxshape=(None, None), chunks=(RECORD_CHUNK, 1),
+                dtype="f8", fillvalue=np.nan
+            )
+            file.swmr_mode = True
+
+        except Exception as e:
+            alert(f"Unable to create recording {self._path}: {e}")
+            return False
+
+        self._thread = threading.Thread(target=self._write_loop, args=(file,), daemon=True)
+        self._thread.start()
+        return True
+
+
+    # Queue a (samples,) time block and matching (samples, channels) values, waiting for room while
+    # RECORD_QUEUE blocks are; dropped once the writer has stopped.
+    def write(self, timestamps: NDArray[np.float64], frames: NDArray[np.float64]) -> None:
+        while self.running:
+            try:
+                self._queue.put((timestamps, frames), timeout=RECORD_FLUSH_INTERVAL)
+                return
+            except queue.Full:
+                pass # still running? a writer that failed never makes room
+
+
+    # Write out everything queued, close the file and stop the writer thread.
+    def stop(self) -> None:
+        if self._thread is None: return
+
+        if self.running: self._queue.put(None)
+        self._thread.join()
+        self._thread = None
+
+
+#- Public Methods ----------------------------------------------------------------------------------
+
+# Read a recording back as its (samples,) times and (samples, channels) values. Returns None if
+# it couldn't be read; a recording still being written reads up to its last flush.
+def read_capture(path: str) -> Optional[tuple[NDArray[np.float64], NDArray[np.float64]]]:
+    try:
+        with h5py.File(path, "r", libver="latest", swmr=True) as file:
+            return file["time"][()], file["values"][()]
+
+    except Exception as e:
+        alert(f"Unable to read recording {path}: {e}")
+        return None
@@ -0,0 +1,172 @@
+
+# utils/ring_buffer.py
+
+#- Imports -----------------------------------------------------------------------------------------
+
+from typing import Optional
+
+import numpy as np
+from numpy.typing import ArrayLike, NDArray
+
+
+#- Lib ---------------------------------------------------------------------------------------------
+
+HISTORY_LENGTH: int = 2 ** 20   # samples kept per buffer, ~17 minutes at 1 kHz
+INITIAL_CAPACITY: int = 1024    # first allocation, doubled on demand up to 2 * max_history
+
+
+#- RingBuffer Class --------------------------------------------------------------------------------
+
+# Bounded, append-only float history returning zero-copy views.
+#
+# Samples are written linearly into a backing array twice the size of the history. Once it fills
+# up, the newest max_history samples are copied into a freshly allocated array, so memory already
+# written is never modified again: views handed out earlier keep their contents.
+#
+# Indices are absolute (counted from the first sample ever appended), so positions recorded
+# earlier stay valid after old samples are dropped. Dropped samples are appended as raw float64 to
+# spill_path when one is given.
+class RingBuffer:
+
+    # Initialise an empty buffer keeping at most max_history samples.
+    def __init__(self, max_history: int = HISTORY_LENGTH, spill_path: Optional[str] = None) -> None:
+        if max_history < 1: raise ValueError("max_history should be above 0")
+
+        self._max_history: int = max_history
+        self._spill_path: Optional[str] = spill_path
+
+        self._data: NDArray[np.float64] = np.empty(min(INITIAL_CAPACITY, 2 * max_history))
+        self._start: int = 0    # position of the oldest held sample in _data
+        self._end: int = 0      # position one past the newest sample in _data
+        self._spilled: int = 0  # position in _data up to which dropped samples reached disk
+        self._dropped: int = 0  # samples discarded from the front so far
+
+
+    # Return a buffer aligned with other (same length and drop offset), filled with value.
+    @classmethod
+    def full_like(cls, other: "RingBuffer", value: float) -> "RingBuffer":
+        buffer = cls(other._max_history)
+        buffer.extend(np.full(other._end - other._start, value))
+        buffer._dropped = other._dropped
+
+        return buffer
+
+
+    #- Class Properties ----------------------------------------------------------------------------
+
+    # Total number of samples ever appended (the absolute index of the next sample).
+    def __len__(self) -> int: return self._dropped + self._end - self._start
+
+
+    # Most samples held at once.
+    @property
+    def max_history(self) -> int: return self._max_history
+
+
+    # Absolute index of the oldest sample still held.
+    @property
+    def dropped(self) -> int: return self._dropped
+
+
+    # Bytes currently allocated for the backing array.
+    @property
+    def nbytes(self) -> int: return self._data.nbytes
+
+
+    #- Private Methods -----------------------------------------------------------------------------
+
+    # Make space for count more samples at the end of the backing array.
+    def _reserve(self, count: int) -> None:
+        if self._end + count <= len(self._data): return
+
+        self._flush_spill()
+
+        held = self._end - self._start
+        capacity = min(2 * self._max_history, max(2 * len(self._data), held + count))
+
+        # always move into a new array: views into the old one must not change under the caller
+        data = np.empty(capacity)
+        data[:held] = self._data[self._start:self._end]
+
+        self._data = data
+        self._start, self._end, self._spilled = 0, held, 0
+
+
+    # Drop the oldest samples so at most max_history are held.
+    def _trim(self) -> None:
+        excess = self._end - self._start - self._max_history
+        if excess <= 0: return
+
+        self._start += excess
+        self._dropped += excess
+
+
+    # Write dropped samples that haven't reached disk yet to the spill file.
+    def _flush_spill(self) -> None:
+        if self._spill_path is not None and self._start > self._spilled:
+            with open(self._spill_path, "ab") as file:
+                file.write(self._data[self._spilled:self._start].tobytes())
+
+        self._spilled = self._start
+
+
+    #- Public Methods ------------------------------------------------------------------------------
+
+    # Append a single sample.
+    def append(self, value: float) -> None:
+        self._reserve(1)
+        self._data[self._end] = value
+        self._end += 1
+        self._trim()
+
+
+    # Append many samples at once.
+    def extend(self, values: ArrayLike) -> None:
+        values = np.asarray(values, dtype=np.float64).ravel()
+
+        # only the newest max_history values can ever be held
+        overflow = len(values) - self._max_history
+        if overflow > 0:
+            # everything held falls out of the history, followed by the leading overflow values
+            self._dropped += self._end - self._start + overflow
+            self._start = self._end
+            self._flush_spill()
+
+            if self._spill_path is not None:
+                with open(self._spill_path, "ab") as file: file.write(values[:overflow].tobytes())
+
+            values = values[overflow:]
+
+        self._reserve(len(values))
+        self._data[self._end:self._end + len(values)] = values
+        self._end += len(values)
+        self._trim()
+
+
+    # Return a zero-copy view of samples [start_idx, end_idx), slice semantics on absolute indices.
+    def view(self, start_idx: int = 0, end_idx: Optional[int] = None) -> NDArray[np.float64]:
+        start, end, _ = slice(start_idx, end_idx).indices(len(self))
+
+        start = self._start + max(start - self._dropped, 0)
+        end = self._start + max(end - self._dropped, 0)
+
+        return self._data[start:max(start, end)]
+
+
+    # Support buffer[start:end] as a shorthand for view(start, end).
+    def __getitem__(self, index: slice) -> NDArray[np.float64]:
+        if not isinstance(index, slice) or index.step not in (None, 1):
+            raise TypeError("RingBuffer only supports contiguous slices")
+
+        return self.view(index.start or 0, index.stop)
+
+
+    # Discard the history, keeping only the newest sample (or nothing when keep_last is False).
+    def reset(self, keep_last: bool = True) -> None:
+        self._flush_spill()
+        last = self._data[self._end - 1:self._end] if keep_last else self._data[:0]
+
+        self._data = np.empty(min(INITIAL_CAPACITY, 2 * self._max_history))
+        self._start, self._spilled, self._dropped = 0, 0, 0
+        self._end = len(last)
+        self._data[:self._end] = last
@@ -0,0 +1,70 @@
+
+# utils/signal.py
+
+#- Imports -----------------------------------------------------------------------------------------
+
+import threading
+from typing import Any, Callable, Optional
+
+from opennetics.utils.debug import alert
+
+
+#- BoundSignal Class -------------------------------------------------------------------------------
+
+# The receivers of one signal on one object.
+#
+# emit() calls every receiver on the emitting thread, in connection order; a failing receiver is
+# reported and doesn't stop the others. GUI code connects through utils.ui.GuiBridge to be called
+# on the GUI thread instead.
+class BoundSignal:
+
+    # Initialise a signal with no receivers.
+    def __init__(self) -> None:
+        self._receivers: list[Callable[..., Any]] = []
+        self._lock: threading.Lock = threading.Lock()
+
+
+    # Call receiver with the arguments of every later emit().
+    def connect(self, receiver: Callable[..., Any]) -> None:
+        with self._lock: self._receivers.append(receiver)
+
+
+    # Stop calling receiver, or every receiver when none is given.
+    def disconnect(self, receiver: Optional[Callable[..., Any]] = None) -> None:
+        with self._lock:
+            if receiver is None: self._receivers.clear()
+            elif receiver in self._receivers: self._receivers.remove(receiver)
+
+
+    # Call every receiver with args.
+    def emit(self, *args: Any) -> None:
+        with self._lock: receivers = tuple(self._receivers)
+
+        for receiver in receivers:
+            try:
+                receiver(*args)
+            except Exception as e:
+                alert(f"Signal receiver {getattr(receiver, '__qualname__', receiver)} failed: {e}")
+
+
+#- Signal Class ------------------------------------------------------------------------------------
+
+# Declares a signal as a class attribute, the way Qt's Signal does, without depending on Qt: each
+# instance of the owning class gets its own BoundSignal. The argument types document the signal.
+class Signal:
+
+    # Declare a signal carrying arguments of the given types.
+    def __init__(self, *types: type) -> None:
+        self._types: tuple[type, ...] = types
+        self._name: str = ""
+
+
+    # Remember the attribute name the signal is stored under.
+    def __set_name__(self, owner: type, name: str) -> None:
+        self._name = name
+
+
+    # Return the instance's BoundSignal, created on first access.
+    def __get__(self, instance: Any, owner: Optional[type] = None) -> Any:
+        if instance is None: return self
+        return instance.__dict__.setdefault(self._name, BoundSignal())
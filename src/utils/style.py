@@ -18,6 +18,12 @@ SCROLL_HEIGHT: int = 450
 ZOOM_SLIDER_WIDTH: int = 200
 
 
+#- Timings -----------------------------------------------------------------------------------------
+
+FRAME_LABEL_INTERVAL: int = 500 # ms between refreshes of the fps/render time label
+FRAME_RATE: int = 60            # live plot repaints per second
+
+
 #- Color Scheme ------------------------------------------------------------------------------------
 
 BACKGROUND_COLOR: str = "#050505"
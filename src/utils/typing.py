@@ -6,10 +6,10 @@
 from enum import Enum
 from dataclasses import dataclass, field
 
+import numpy as np
+from numpy.typing import ArrayLike, NDArray
+from sklearn.mixture import GaussianMixture
 from opennetics.utils import defaults
-from opennetics.typing import (
-    float2d_t, float3d_t
-)
 
 
 #- Constants ---------------------------------------------------------------------------------------
@@ -21,28 +21,46 @@ class RecordAction(Enum):
     RESTART = 3
     TERMINATE = 4
 
+class ModelMode(Enum):
+    PER_REPEAT = 0  # one model per recorded repetition
+    COMBINED = 1    # one model per source over every repetition, time normalised
+
 class Tab(Enum):
     NONE = 0
     CREATE = 1
     UPDATE = 2
     TEST = 3
 
+class Backpressure(Enum):
+    DROP_OLDEST = 0 # a full sink queue drops its oldest batch
+    BLOCK = 1       # a full sink queue holds the reader until the sink catches up
+    SAMPLE = 2      # a full sink queue merges its batches, keeping every other sample
+
 LABEL_RANDOM_STATE: str = "Random State"
 LABEL_N_COMPONENTS: str = "n Components"
+N_COMPONENTS_AUTO: int = 0 # n_components to pick by sweeping candidates when training
 LABEL_THRESHOLD: str = "Threshold"
+LABEL_MODEL_MODE: str = "Models"
+MODEL_MODE_NAMES: tuple[str, ...] = ("Per Repeat", "Combined") # indexed by ModelMode value
 
 
 #- Data Classes ------------------------------------------------------------------------------------
 
-# Dataclass holding sensor name and appended time/reading pairs for analysis.
+# Dataclass holding sensor name and one (samples, 2) array of [time, reading] rows per recording.
 @dataclass
 class SensorValues:
     label: str
-    values: float3d_t = field(default_factory=list)
+    values: list[NDArray[np.float64]] = field(default_factory=list)
 
-    def AddValues(self, counter: list[float], readings: list[float]) -> None:
-        read_values: float2d_t = [[x, y] for x, y in zip(counter, readings)]
-        self.values.append(read_values)
+    # Append a recording from its time and reading sequences, views into the capture buffers
+    # included; they are packed into one compact, read-only array, the only copy made on the way
+    # to training.
+    def AddValues(self, counter: ArrayLike, readings: ArrayLike) -> None:
+        values = np.column_stack((
+            np.asarray(counter, dtype=np.float64), np.asarray(readings, dtype=np.float64)
+        ))
+        values.flags.writeable = False
+        self.values.append(values)
 
 
 # Default parameters for Gaussian Mixture models.
@@ -51,6 +69,55 @@ class ModelParameters:
     threshold:  float = defaults.MODEL_THRESHOLD
     random_state: int = defaults.MODEL_RANDOM_STATE
     n_components: int = defaults.MODEL_N_COMPONENTS
+    mode: ModelMode = ModelMode.PER_REPEAT
+
+
+# One recorded repetition, frozen when it stopped: read-only views of the time axis and of each
+# recorded source's readings. Capture buffers never modify memory they have handed out, so the
+# views stay intact, and alive, however the live buffers move on or get cleared.
+@dataclass(frozen=True)
+class RecordSegment:
+    counter: NDArray[np.float64]
+    readings: tuple[NDArray[np.float64], ...] # in the order of the recorded sources
+
+    def __post_init__(self) -> None:
+        for view in (self.counter, *self.readings): view.flags.writeable = False
+
+
+# Models stored for one source of a gesture file, with the parameters they were trained with.
+@dataclass
+class SourceModels:
+    models: list[GaussianMixture] = field(default_factory=list)
+    parameters: ModelParameters = field(default_factory=ModelParameters)
+    window: int = 0 # typical recorded repetition length in samples, 0 when unknown
+    samples: int = 0 # ModelMode.COMBINED: samples its one model was fitted on, 0 when unknown
+
+
+# What a gesture file stores for one source, short of its models.
+@dataclass(frozen=True)
+class SourceInfo:
+    parameters: ModelParameters = field(default_factory=ModelParameters)
+    window: int = 0 # see SourceModels
+    models: int = 0 # number of stored models
+
+
+# Seconds an analysis job spent in each stage.
+@dataclass
+class JobTimings:
+    slice: float = 0.0  # recorded traces into training arrays
+    fit: float = 0.0    # model fitting, including waiting on the pool
+    write: float = 0.0  # gesture file output
+
+    def __str__(self) -> str:
+        return f"slice {self.slice:.2f} s, fit {self.fit:.2f} s, write {self.write:.2f} s"
+
+
+# One batch of the incoming stream as every sink receives it: parsed once, shared, never modified.
+@dataclass(frozen=True)
+class StreamBatch:
+    timestamps: NDArray[np.float64] # (samples,) seconds since the stream's Ingest started
+    frames: NDArray[np.float64]     # (samples, channels), rows without any number left out
+    lines: tuple[str, ...] = ()     # every received line in Text mode, empty for binary frames
 
 
 # Immutable input bundle used when recording a new gesture (name, repeats, sensors, params).
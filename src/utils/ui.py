@@ -3,9 +3,10 @@
 
 #- Imports -----------------------------------------------------------------------------------------
 
-from typing import Any, Callable
+from typing import Any, Callable, Optional
 
 from opennetics.utils.debug import alert
+from PySide6.QtCore import QObject, Signal, Slot
 from PySide6.QtWidgets import (
     QLabel, QMessageBox, QPushButton, QSpacerItem,
     QHBoxLayout, QVBoxLayout, QLayout,
@@ -78,3 +79,26 @@ def clear_layout(layout: QLayout) -> None:
             layout.removeItem(item)
             child_layout.deleteLater()
 
+
+
+#- GuiBridge Class ---------------------------------------------------------------------------------
+
+# Delivers utils.signal signals, emitted on any thread, to receivers on the thread the bridge lives
+# on: emits from other threads are queued into its event loop, emits on its own thread are direct.
+class GuiBridge(QObject):
+    _invoke = Signal(object, object) # receiver, argument tuple
+
+    # Initialise a bridge living on the calling (GUI) thread.
+    def __init__(self, parent: Optional[QObject] = None) -> None:
+        super().__init__(parent)
+        self._invoke.connect(self._call)
+
+
+    @Slot(object, object)
+    def _call(self, receiver: Callable[..., Any], args: tuple) -> None:
+        receiver(*args)
+
+
+    # Return a receiver to connect in place of receiver, calling it on the bridge's thread.
+    def wrap(self, receiver: Callable[..., Any]) -> Callable[..., None]:
+        return lambda *args: self._invoke.emit(receiver, args)
@@ -5,6 +5,7 @@
 
 from typing import Optional, TypeVar, Type
 
+from utils.typing import N_COMPONENTS_AUTO
 from utils.ui import alert_box
 
 
@@ -42,6 +43,12 @@ def check_string_numeric(
     return None
 
 
+# Validate an n_components field: a positive integer, or "auto" for N_COMPONENTS_AUTO.
+def check_n_components(text: str, error: str) -> Optional[int]:
+    if text.strip().lower() == "auto": return N_COMPONENTS_AUTO
+    return check_string_numeric(text, error, int, 1)
+
+
 # Ensure that the provided list of source names are unique; pop up an alert on failure.
 def check_sources_name(sources: tuple[str, ...]) -> bool:
     result: bool = len(sources) == len(set(sources))
@@ -65,6 +65,10 @@ class GestureDialog(QDialog):
             result = self.tab2.get_inputs()
             if result is not None: return (Tab.UPDATE, result)
 
+        elif self.final_tab == Tab.TEST:
+            result = self.tab3.get_inputs()
+            if result is not None: return (Tab.TEST, result)
+
         return None
 
 
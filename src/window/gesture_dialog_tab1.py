@@ -11,7 +11,7 @@ from PySide6.QtCore import Qt
 from PySide6.QtGui import QKeyEvent
 from PySide6.QtWidgets import (
     QDialog, QWidget, QFrame,
-    QCheckBox, QFileDialog, QLabel, QLineEdit,
+    QCheckBox, QComboBox, QFileDialog, QLabel, QLineEdit,
     QVBoxLayout, QHBoxLayout, QScrollArea,
     QSizePolicy,
 )
@@ -19,11 +19,11 @@ from PySide6.QtWidgets import (
 from utils.extra import file_name_path, datestring
 from utils.style import (
     SCROLL_HEIGHT,
-    LABEL_HEAD_STYLE, SCROLL_BAR_STYLE, TEXT_BOX_STYLE
+    LABEL_HEAD_STYLE, LABEL_BODY_STYLE, SCROLL_BAR_STYLE, TEXT_BOX_STYLE, COMBOBOX_STYLE
 )
 from utils.typing import (
-    LABEL_RANDOM_STATE, LABEL_N_COMPONENTS, LABEL_THRESHOLD,
-    GestureInput, ModelParameters, Tab
+    LABEL_RANDOM_STATE, LABEL_N_COMPONENTS, LABEL_THRESHOLD, LABEL_MODEL_MODE, MODEL_MODE_NAMES,
+    GestureInput, ModelMode, ModelParameters, Tab
 )
 from utils.ui import (
     spacedv, blank_line, create_button
@@ -32,6 +32,7 @@ from utils.ui import (
 from .labelled_text import LabelledText
 from .checks import (
     check_empty_string,
+    check_n_components,
     check_string_numeric,
 )
 
@@ -44,6 +45,8 @@ class ModelParametersLabels:
     threshold: LabelledText
     n_components: LabelledText
     random_state: LabelledText
+    mode_label: QLabel
+    mode: QComboBox
     whitespace: QLabel
 
 
@@ -180,6 +183,18 @@ class Tab1:
             # checkbox's parameters
             # hidden by default, are visible when the checkbox is selected
             params_holder = QHBoxLayout() # hold all parameter LabelledTexts in horizontal group
+
+            # one model per repetition, or one per source over every repetition
+            mode_label = QLabel(LABEL_MODEL_MODE)
+            mode_label.setStyleSheet(LABEL_BODY_STYLE)
+            mode_label.setVisible(False)
+
+            mode_list = QComboBox()
+            mode_list.addItems(MODEL_MODE_NAMES)
+            mode_list.setToolTip("A model per repetition, or one per source over all of them")
+            mode_list.setStyleSheet(COMBOBOX_STYLE)
+            mode_list.setVisible(False)
+
             self._params_labels[name] = ModelParametersLabels(
                 checkbox=checkbox,
 
@@ -195,11 +210,15 @@ class Tab1:
 
                 n_components=LabelledText(
                     LABEL_N_COMPONENTS, str(defaults.MODEL_N_COMPONENTS),
-                    "positive integer", params_holder, visible=False
+                    "positive integer, or auto to pick by sweeping", params_holder, visible=False
                 ),
 
+                mode_label = mode_label,
+                mode = mode_list,
                 whitespace = space_label
             )
+            params_holder.addWidget(mode_label)
+            params_holder.addWidget(mode_list)
             label_layout.addLayout(params_holder)
             label_layout.addWidget(space_label)
 
@@ -230,6 +249,8 @@ class Tab1:
         self._params_labels[label].threshold.visibility(visible)
         self._params_labels[label].n_components.visibility(visible)
         self._params_labels[label].random_state.visibility(visible)
+        self._params_labels[label].mode_label.setVisible(visible)
+        self._params_labels[label].mode.setVisible(visible)
         self._params_labels[label].whitespace.setVisible(visible)
 
 
@@ -276,15 +297,16 @@ class Tab1:
             )
             if threshold is None: return None
 
-            n_components = check_string_numeric(
+            n_components = check_n_components(
                 self._params_labels[label].n_components.text(),
-                f"[{label}] n Component: Enter valid integer value.", int, 1
+                f"[{label}] n Component: Enter valid integer value or auto."
             )
             if n_components is None: return None
 
             # add to the dictionary with the index of the sensor/source as key
             source_ids.append(i)
-            params.append(ModelParameters(threshold, random_state, n_components))
+            mode = ModelMode(self._params_labels[label].mode.currentIndex())
+            params.append(ModelParameters(threshold, random_state, n_components, mode))
 
         #========================================
         # return type, self._values, generated when all values are valid
@@ -6,7 +6,6 @@
 from dataclasses import dataclass
 from typing import Callable, Optional
 
-from opennetics.file import GestureFile
 from opennetics.utils.debug import alert
 from PySide6.QtCore import Qt
 from PySide6.QtGui import QKeyEvent
@@ -17,6 +16,7 @@ from PySide6.QtWidgets import (
     QSizePolicy,
 )
 
+from analyse import read_gesture
 from utils.ui import alert_box, clear_layout
 from utils.style import (
     SCROLL_HEIGHT, LABEL_HEAD_STYLE, LABEL_BODY_STYLE,
@@ -31,7 +31,7 @@ from utils.ui import (
 )
 
 from .labelled_text import LabelledText
-from .checks import check_string_numeric
+from .checks import check_n_components, check_string_numeric
 
 
 #- Local Defines -----------------------------------------------------------------------------------
@@ -164,11 +164,11 @@ class Tab2:
     # Read file data and add dynamic widgets to body layout, with data from gesture file.
     def _dynamic_source_list(self) -> None:
         #========================================
-        # read the file
+        # read the file: source parameters only, models are read once a source is trained
         #========================================
-        self._gesture_data = GestureFile(self._gesture_file.text())
+        self._gesture_data = read_gesture(self._gesture_file.text())
 
-        if not self._gesture_data.read():
+        if self._gesture_data is None:
             alert_box("Error", f"Invalid filename: {self._gesture_file.text()}")
             # do not continue further if the file selected was not valid
             return
@@ -194,7 +194,7 @@ class Tab2:
         self._body_layout.addWidget(label)
 
         self._drop_boxes: dict[str, ReadModelData] = {}
-        read_data = self._gesture_data.gesture_data
+        read_data = {label: info.parameters for label, info in self._gesture_data.sources.items()}
 
         for model_name in read_data.keys():
             label_holder: QHBoxLayout = QHBoxLayout()
@@ -236,7 +236,7 @@ class Tab2:
 
                 n_components = LabelledText(
                     LABEL_N_COMPONENTS, str(read_data[model_name].n_components),
-                    "positive integer", params_holder, visible=False
+                    "positive integer, or auto to pick by sweeping", params_holder, visible=False
                 ),
 
                 whitespace = space_label
@@ -301,9 +301,9 @@ class Tab2:
             )
             if threshold is None: return None
 
-            n_components = check_string_numeric(
+            n_components = check_n_components(
                 self._drop_boxes[label].n_components.text(),
-                f"[{label}] n Component: Enter valid integer value.", int, 1
+                f"[{label}] n Component: Enter valid integer value or auto."
             )
             if n_components is None: return None
 
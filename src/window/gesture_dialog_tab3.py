@@ -29,11 +29,12 @@ from utils.ui import (
 )
 
 from .labelled_text import LabelledText
+from .checks import check_string_numeric
 from .gesture_dialog_tab2 import Tab2
 
 #- Tab Class ---------------------------------------------------------------------------------------
 
-# Tab responsible for collecting inputs needed to update existing gesture.
+# Tab responsible for choosing a gesture file and the inputs to recognise it on, live.
 class Tab3(Tab2):
 
     # Initialise fields, sensor list, model parameter inputs and action buttons.
@@ -56,7 +57,7 @@ class Tab3(Tab2):
         button_layout = QHBoxLayout()
 
         self._cancel_button = create_button("Cancel", "[esc]", self._cancel)
-        self._continue_button = create_button("Save", "[return]", self._finish)
+        self._continue_button = create_button("Start", "[return]", self._finish)
 
         button_layout.addWidget(self._cancel_button)
         button_layout.addWidget(self._continue_button)
@@ -64,12 +65,63 @@ class Tab3(Tab2):
         self._layout.addLayout(button_layout)
 
 
+    # Read file data and list its sources; only the threshold matters when testing.
     def _dynamic_source_list(self) -> None:
-        print("hello world")
-        pass
+        super()._dynamic_source_list()
+        if hasattr(self, '_repeats'): self._repeats.visibility(False)
 
 
-    def _finish(self) -> None:
-        pass
+    # Show the threshold of a source once it is mapped to an input.
+    def _source_selected(self, text: str, label: str) -> None:
+        super()._source_selected(text, label)
+
+        self._drop_boxes[label].n_components.visibility(False)
+        self._drop_boxes[label].random_state.visibility(False)
 
-    def get_inputs(self) -> None: return None
+
+    # Validate inputs, assemble GestureInput dataclass and submit tab result.
+    def _finish(self) -> None:
+        #========================================
+        # ensure a gesture file was loaded
+        #========================================
+        if not hasattr(self, '_selected_file'): return None
+
+        #========================================
+        # mapped sources and their thresholds
+        #========================================
+        file_sources: list[str] = []
+        source_ids: list[int] = []
+        params: list[ModelParameters] = []
+
+        for label in self._drop_boxes.keys():
+            index: int = self._drop_boxes[label].dropbox.currentIndex()
+
+            # sources left unmapped aren't tested
+            if index == 0: continue # index 0 is DROPBOX_UNCHANGED
+
+            threshold = check_string_numeric(
+                self._drop_boxes[label].threshold.text(),
+                f"[{label}] Threshold: Enter valid integer value.", float
+            )
+            if threshold is None: return None
+
+            file_sources.append(label)
+            source_ids.append(index-1) # -1 because extra DROPBOX_UNCHANGED was added at start
+            params.append(ModelParameters(threshold=threshold))
+
+        if not source_ids:
+            alert_box("Error", "Map at least one source to an input.")
+            return None
+
+        #========================================
+        # return type, self._values, generated when all values are valid
+        #========================================
+        self._values = GestureInput(
+            filename = self._selected_file,
+            repeats  = 0,
+            source_ids = tuple(source_ids),
+            parameters = tuple(params),
+            file_sources = tuple(file_sources),
+        )
+
+        self._submit(Tab.TEST)
@@ -5,10 +5,15 @@
 
 from typing import Optional
 
+import numpy as np
+import pyqtgraph as pg
+from numpy.typing import ArrayLike, NDArray
 from PySide6.QtCore import QSize
 from PySide6.QtWidgets import QLabel, QLineEdit
 
 from utils.extra import new_color
+from utils.decimate import MinMaxPyramid
+from utils.ring_buffer import RingBuffer
 from utils.style import BACKGROUND_HIGHLIGHT_COLOR
 from .edit_label import EditLabel
 
@@ -19,12 +24,19 @@ from .edit_label import EditLabel
 class GraphLine:
 
     # Initialise a GraphLine with initial readings, color tuple and an editable title widget.
-    def __init__(self, reading: list[float], title: str) -> None:
+    def __init__(self, reading: RingBuffer, title: str) -> None:
         self.__color: str = new_color()
-        self.__reading: list[float] = reading
+        self.__reading: RingBuffer = reading
+        self.__lod: MinMaxPyramid = MinMaxPyramid(reading)
         self.__title: EditLabel = EditLabel(title, self.__color)
         self.__hidden: bool = False
 
+        # persistent plot item, updated in place by the owner's plot refresh
+        self.__curve: pg.PlotDataItem = pg.PlotDataItem(
+            pen = pg.mkPen(color=self.__color, width=2),
+            connect = "finite", # NaN readings (non-numeric values) leave a gap
+        )
+
 
     #- Class Properties ----------------------------------------------------------------------------
 
@@ -55,6 +67,11 @@ class GraphLine:
     def hidden(self) -> bool: return self.__hidden
 
 
+    # Return the plot item drawing this line; add it to a plot once.
+    @property
+    def curve(self) -> pg.PlotDataItem: return self.__curve
+
+
     #- Private Methods -----------------------------------------------------------------------------
 
     # Tooltip depending on current hidden status
@@ -67,6 +84,7 @@ class GraphLine:
     def _toggle_status(self, _) -> None:
         self.__hidden = not self.__hidden
         self._square.setToolTip(self._tooltip_status())
+        self.__curve.setVisible(not self.__hidden)
 
         if self.__hidden:
             self._square.setStyleSheet(f"background-color: {BACKGROUND_HIGHLIGHT_COLOR};")
@@ -78,9 +96,12 @@ class GraphLine:
 
     #- Public Methods ------------------------------------------------------------------------------
 
-    # Return a slice of the stored readings between start_idx and end_idx.
-    def reading(self, start_idx: int = 0, end_idx: Optional[int] = None) -> list[float]:
-        return self.__reading[start_idx:end_idx]
+    # Return the stored readings between start_idx and end_idx: a zero-copy view at level 0, or
+    # min/max pairs from the level-of-detail pyramid for higher levels (see utils.decimate).
+    def reading(
+            self, start_idx: int = 0, end_idx: Optional[int] = None, level: int = 0
+        ) -> NDArray[np.float64]:
+        return self.__lod.view(start_idx, end_idx, level)
 
 
     # Return the color tuple used to render this graph line.
@@ -88,12 +109,13 @@ class GraphLine:
         return self.__color
 
 
-    # Append a new numeric reading to this graph line.
-    def add_reading(self, value: float) -> None:
-        self.__reading.append(value)
+    # Append a block of numeric readings to this graph line.
+    def add_readings(self, values: ArrayLike) -> None:
+        self.__reading.extend(values)
 
 
     # Reset readings to keep only the most recent value (used when clearing older data).
     def reset_reading(self) -> None:
-        self.__reading = [self.__reading[-1]]
+        self.__reading.reset(keep_last=True)
+        self.__lod.reset()
 
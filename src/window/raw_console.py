@@ -0,0 +1,116 @@
+
+# window/raw_console.py
+
+#- Imports -----------------------------------------------------------------------------------------
+
+from collections import deque
+from datetime import datetime
+
+from PySide6.QtGui import QColor, QFont, QSyntaxHighlighter, QTextCharFormat, QTextDocument
+from PySide6.QtWidgets import QPlainTextEdit
+
+from utils.style import ACCENT_COLOR, RAW_VALUE_BOX_STYLE
+
+
+#- Lib ---------------------------------------------------------------------------------------------
+
+RAW_HISTORY_LINES: int = 100_000    # rows kept for saving
+RAW_VIEW_LINES: int = 2_000         # rows kept in the widget itself
+TIMESTAMP_WIDTH: int = 12           # "HH:MM:SS.mmm"
+ECHO_MARKER: str = "> "             # rows starting with this (after the timestamp) are highlighted
+
+
+# Return the timestamp prefix used for rows, with milliseconds.
+def timestamp() -> str:
+    return datetime.now().strftime("%H:%M:%S.%f")[:-3]
+
+
+#- Highlighter Class -------------------------------------------------------------------------------
+
+# Color the timestamp of every row, and the whole row for echoed serial writes.
+class _RowHighlighter(QSyntaxHighlighter):
+
+    def __init__(self, document: QTextDocument) -> None:
+        super().__init__(document)
+        self._accent = QTextCharFormat()
+        self._accent.setForeground(QColor(ACCENT_COLOR))
+
+
+    def highlightBlock(self, text: str) -> None:
+        echo = text.startswith(ECHO_MARKER, TIMESTAMP_WIDTH + 2)
+        self.setFormat(0, len(text) if echo else TIMESTAMP_WIDTH, self._accent)
+
+
+#- RawConsole Class --------------------------------------------------------------------------------
+
+# Read-only text view of received rows with bounded memory.
+#
+# Every row is kept in a fixed-size ring (for saving) while the widget only holds the latest
+# RAW_VIEW_LINES. Rows are queued and inserted in one go by flush(), called once per frame; while
+# paused, rows are still logged but nothing is drawn.
+class RawConsole(QPlainTextEdit):
+
+    # Initialise the widget and its backing buffers.
+    def __init__(self) -> None:
+        super().__init__()
+
+        self.setStyleSheet(RAW_VALUE_BOX_STYLE)
+        self.setReadOnly(True)
+        self.setFont(QFont("Courier New", 15))
+        self.setMaximumBlockCount(RAW_VIEW_LINES)
+        self.setUndoRedoEnabled(False)
+
+        self._highlighter = _RowHighlighter(self.document())
+        self._history: deque[str] = deque(maxlen=RAW_HISTORY_LINES)
+        self._pending: list[str] = []
+        self._paused: bool = False
+
+
+    #- Class Properties ----------------------------------------------------------------------------
+
+    # Return whether drawing is paused.
+    @property
+    def paused(self) -> bool: return self._paused
+
+
+    # Pause or resume drawing; resuming redraws the latest logged rows.
+    @paused.setter
+    def paused(self, paused: bool) -> None:
+        self._paused = paused
+        self._pending = []
+
+        if not paused:
+            latest = list(self._history)[-RAW_VIEW_LINES:]
+            self.setPlainText("\n".join(latest))
+            self.moveCursor(self.textCursor().MoveOperation.End)
+
+
+    #- Public Methods ------------------------------------------------------------------------------
+
+    # Log rows with a shared timestamp and queue them for the next flush.
+    def append_rows(self, rows: list[str]) -> None:
+        stamp = timestamp()
+        rows = [f"{stamp}  {row}" for row in rows]
+
+        self._history.extend(rows)
+        if not self._paused: self._pending.extend(rows)
+
+
+    # Insert every queued row into the widget in a single edit.
+    def flush(self) -> None:
+        if not self._pending: return
+
+        # rows beyond what the widget holds would be evicted straight away
+        rows, self._pending = self._pending[-RAW_VIEW_LINES:], []
+        self.appendPlainText("\n".join(rows))
+
+
+    # Return every logged row, including those no longer shown.
+    def text(self) -> str: return "\n".join(self._history)
+
+
+    # Drop logged, queued and shown rows.
+    def clear(self) -> None:
+        self._history.clear()
+        self._pending = []
+        super().clear()
@@ -3,36 +3,51 @@
 
 #- Imports -----------------------------------------------------------------------------------------
 
+import os
 import time
-from typing import Any
-from datetime import datetime
+from dataclasses import replace
+from typing import Optional
 
+import numpy as np
 import pyqtgraph as pg
-from PySide6.QtCore import Qt, Slot
-from PySide6.QtGui import QKeyEvent, QFont
+from numpy.typing import NDArray
+from PySide6.QtCore import Qt, QTimer, Slot
+from PySide6.QtGui import QCloseEvent, QKeyEvent
 from PySide6.QtWidgets import (
     QDialog, QWidget, QFrame,
-    QComboBox, QFileDialog, QLabel, QMessageBox, QTextEdit, QSlider, QLineEdit,
+    QComboBox, QFileDialog, QLabel, QMessageBox, QSlider, QLineEdit,
     QHBoxLayout, QVBoxLayout, QScrollArea,
 )
-from opennetics.typing import int2d_t
 from opennetics.utils.debug import alert
 
-from analyse import analyse_create, analyse_update
-from talk import Talk, all_ports, BAUDRATES
-from utils.extra import datestring, parse_string_list
-from utils.ui import spacedh, create_button
+from analyse import (
+    analyse_create, analyse_update, jobs, read_gesture, GestureLibrary, Recognizer
+)
+from talk import (
+    Talk, Ingest, Sink, all_ports, add_replay,
+    BAUDRATES, FRAME_MODES, REPLAY_PREFIX, REPLAY_SPEEDS, TIME_SOURCES, DISPLAY_SINK_CAPACITY,
+)
+from utils.extra import datestring
+from utils.decimate import lod_level, axis_view, LOD_POINTS_PER_PIXEL
+from utils.frame_stats import FrameStats
+from utils.ring_buffer import RingBuffer
+from utils.recorder import Recorder
+from utils.ui import spacedh, create_button, alert_box, GuiBridge
 from utils.style import (
     APPLICATION_NAME,
-    BACKGROUND_COLOR, BACKGROUND_HIGHLIGHT_COLOR, ACCENT_COLOR,
-    WINDOW_SIZE, GRAPH_HEIGHT, ZOOM_SLIDER_WIDTH,
-    RAW_VALUE_BOX_STYLE, COMBOBOX_STYLE, SCROLL_BAR_STYLE, LABEL_BODY_STYLE, TEXT_BOX_STYLE,
+    BACKGROUND_COLOR, BACKGROUND_HIGHLIGHT_COLOR,
+    WINDOW_SIZE, GRAPH_HEIGHT, ZOOM_SLIDER_WIDTH, FRAME_LABEL_INTERVAL, FRAME_RATE,
+    COMBOBOX_STYLE, SCROLL_BAR_STYLE, LABEL_BODY_STYLE, TEXT_BOX_STYLE,
+)
+from utils.typing import (
+    Backpressure, GestureInput, JobTimings, SensorValues, RecordAction, RecordSegment, StreamBatch,
+    Tab, sensor_values_t
 )
-from utils.typing import SensorValues, RecordAction, Tab, sensor_values_t
 
 from .gesture_dialog import GestureDialog
 from .record_inputs import RecordInputs
 from .graphline import GraphLine
+from .raw_console import RawConsole, ECHO_MARKER
 from .checks import check_sources_name
 
 
@@ -62,18 +77,51 @@ class GestureTracker(QWidget):
         # class vars with their init values
         #========================================
         self._graphlines: list[GraphLine] = []
-        self._counter: list[float] = [0]
+        self._counter: RingBuffer = RingBuffer()
+        self._counter.append(0)
         self._toggle_recent: int = 0
         self._freeze: bool = False
-        self._print_time = True
-        self._start_time = time.time()
+        self._time_origin: float = 0.0  # ingest clock at the last clear, the plot's time zero
+        self._frame_stats = FrameStats()
+        self._recorder: Optional[Recorder] = None
+        self._recorder_sink: Optional[Sink] = None
+        self._recognizer: Optional[Recognizer] = None
+        self._recognizer_sink: Optional[Sink] = None
+        self._record_sources: tuple[int, ...] = ()      # graphlines being recorded for a gesture
+        self._record_start: Optional[int] = None        # counter index the open repetition began
+        self._segments: list[RecordSegment] = []        # repetitions recorded so far, frozen
+        self._plot_pending: bool = False    # samples arrived since the last repaint
+        self._frames_to_skip: int = 0       # ticks left to skip after an expensive repaint
+        self._last_tick: float = time.perf_counter()
 
         #========================================
         # class vars with their init values
         #========================================
+        # jobs and recognizers emit on their own threads; the bridge calls back on this one
+        self._bridge = GuiBridge(self)
+
+        # the stream reaches the plot and the raw box through sinks drained by the render timer.
+        # Recorded gestures are taken from the plot's buffers and the raw box is what gets saved,
+        # so neither may lose samples: a GUI that falls far enough behind holds up the reader
+        # instead, which the frame label shows
         self._talk = talk
-        self._talk.signals.line_received.connect(self._add_data)
-        self._talk.signals.single_received.connect(self._add_to_raw)
+        self._ingest = Ingest()
+        self._ingest.attach(self._talk)
+        self._plot_sink = Sink(
+            "plot", capacity=DISPLAY_SINK_CAPACITY, policy=Backpressure.BLOCK
+        )
+        self._raw_sink = Sink(
+            "raw", capacity=DISPLAY_SINK_CAPACITY, policy=Backpressure.BLOCK
+        )
+        self._ingest.add(self._plot_sink)
+        self._ingest.add(self._raw_sink)
+
+        jobs.signals.queued.connect(self._bridge.wrap(self._job_queued))
+        jobs.signals.running.connect(self._bridge.wrap(self._job_running))
+        jobs.signals.progress.connect(self._bridge.wrap(self._job_progress))
+        jobs.signals.done.connect(self._bridge.wrap(self._job_done))
+        jobs.signals.failed.connect(self._bridge.wrap(self._job_failed))
+        jobs.signals.cancelled.connect(self._bridge.wrap(self._job_cancelled))
 
         #========================================
         # initialise the system
@@ -83,6 +131,25 @@ class GestureTracker(QWidget):
         self._init_graph_footer()
         self._init_raw_data()
         self._init_serial_writer()
+        self._init_render_timer()
+
+
+    #- Getter/Setter -------------------------------------------------------------------------------
+
+    # Returns the live plot repaint rate in frames per second.
+    @property
+    def frame_rate(self) -> int: return self._frame_rate
+
+
+    # Sets the live plot repaint rate; takes effect on the next tick.
+    @frame_rate.setter
+    def frame_rate(self, fps: int) -> None:
+        if fps <= 0:
+            alert(f"Invalid frame rate selected: {fps}")
+            return
+
+        self._frame_rate = fps
+        self._render_timer.setInterval(round(1000 / fps))
 
 
     #- Private: Initialise Components --------------------------------------------------------------
@@ -102,6 +169,41 @@ class GestureTracker(QWidget):
             "Save", "Save read data in text file [s]", self._button_save)
         header_layout.addWidget(self._save_button)
 
+        self._capture_button = create_button(
+            "Capture", "Stream every sample to an HDF5 file until stopped [r]",
+            self._button_capture)
+        header_layout.addWidget(self._capture_button)
+
+        self._data_view_button = create_button(
+            "Pause Log", "Toggle drawing raw data; it is still logged for saving [t]",
+            self._button_data_view)
+        header_layout.addWidget(self._data_view_button)
+
+        #========================================
+        # background training status
+        #========================================
+        self._job_label = QLabel("")
+        self._job_label.setStyleSheet(LABEL_BODY_STYLE)
+        header_layout.addWidget(self._job_label)
+
+        self._cancel_jobs_button = create_button(
+            "Cancel Training", "Stop every queued and running training job",
+            self._button_cancel_jobs)
+        self._cancel_jobs_button.setVisible(False)
+        header_layout.addWidget(self._cancel_jobs_button)
+
+        #========================================
+        # live gesture test status
+        #========================================
+        self._match_label = QLabel("")
+        self._match_label.setStyleSheet(LABEL_BODY_STYLE)
+        header_layout.addWidget(self._match_label)
+
+        self._stop_test_button = create_button(
+            "Stop Test", "Stop recognising the tested gesture", self._button_stop_test)
+        self._stop_test_button.setVisible(False)
+        header_layout.addWidget(self._stop_test_button)
+
         #========================================
         # whitespace dividing left-right regions
         #========================================
@@ -126,6 +228,23 @@ class GestureTracker(QWidget):
         # update label only for allowed values
         self._zoom_slider.valueChanged.connect(self._zoom_value)
 
+        #========================================
+        # plot refresh rate and render time
+        #========================================
+        self._frame_label = QLabel(self._frame_summary())
+        self._frame_label.setStyleSheet(LABEL_BODY_STYLE)
+        self._frame_label.setToolTip(
+            "Plot refreshes per second and mean render time; time the serial reader was held up"
+            " by the plot falling behind, if any"
+        )
+        header_layout.addWidget(self._frame_label)
+
+        self._frame_label_timer = QTimer(self)
+        self._frame_label_timer.timeout.connect(
+            lambda: self._frame_label.setText(self._frame_summary())
+        )
+        self._frame_label_timer.start(FRAME_LABEL_INTERVAL)
+
         #========================================
         # top-right buttons
         #========================================
@@ -167,18 +286,23 @@ class GestureTracker(QWidget):
         self._connection_list.setStyleSheet(COMBOBOX_STYLE)
         self._legend_layout.addWidget(self._connection_list)
 
-        # refresh port list everytime the list is clicked
+        # refresh port list everytime the list is clicked; the last entry picks a capture to replay
         def _dynamic_port_list(event):
             self._connection_list.clear() # remove old values
-            self._connection_list.addItems(["<SELECT>"] + all_ports())
+            self._connection_list.addItems(["<SELECT>"] + all_ports() + ["Replay File..."])
             QComboBox.mousePressEvent(self._connection_list, event)
 
         self._connection_list.mousePressEvent = lambda event: _dynamic_port_list(event)
 
         # resize component to fit text size
         def _dynamic_port_select(option: str):
+            if option == "Replay File...":
+                self._select_replay()
+                return
+
             width = 150 + len(option) * 1.5
             self._connection_list.setStyleSheet(COMBOBOX_STYLE + f"QComboBox {{width: {width}px;}}")
+            self._replay_speed_list.setVisible(option.startswith(REPLAY_PREFIX))
             if option not in  ["", "<SELECT>", self._talk.port]:
                 self._clear_button.click() # clear existing data when switching source
                 self._talk.port = option
@@ -200,9 +324,69 @@ class GestureTracker(QWidget):
 
         self._baud_rate_list.currentTextChanged.connect(_set_baudrate)
 
+        #========================================
+        # frame mode list
+        #========================================
+        self._frame_mode_list = QComboBox()
+        self._frame_mode_list.addItems(FRAME_MODES)
+        self._frame_mode_list.setToolTip("Select Stream Format")
+        self._frame_mode_list.setCurrentText(self._talk.mode)
+        self._frame_mode_list.setStyleSheet(COMBOBOX_STYLE)
+        self._legend_layout.addWidget(self._frame_mode_list)
+
+        def _set_mode(value: str):
+            self._talk.mode = value
+
+        self._frame_mode_list.currentTextChanged.connect(_set_mode)
+
+        #========================================
+        # time source list
+        #========================================
+        self._time_source_list = QComboBox()
+        self._time_source_list.addItems(list(TIME_SOURCES))
+        self._time_source_list.setToolTip("Select Sample Time: when read, or sent by the device")
+        self._time_source_list.setStyleSheet(COMBOBOX_STYLE)
+        self._legend_layout.addWidget(self._time_source_list)
+
+        # the device time column reads NaN from now on, every source keeps its column; the plot
+        # starts over rather than mix device time values into that line's history
+        def _set_time_source(value: str):
+            self._ingest.device_time = TIME_SOURCES[value]
+            self._clear_button.click()
+
+        self._time_source_list.currentTextChanged.connect(_set_time_source)
+
+        #========================================
+        # replay speed list, shown for replay ports
+        #========================================
+        self._replay_speed_list = QComboBox()
+        self._replay_speed_list.addItems(list(REPLAY_SPEEDS))
+        self._replay_speed_list.setToolTip("Select Replay Speed")
+        self._replay_speed_list.setStyleSheet(COMBOBOX_STYLE)
+        self._replay_speed_list.setVisible(False)
+        self._legend_layout.addWidget(self._replay_speed_list)
+
+        def _set_replay_speed(value: str):
+            self._talk.replay_speed = REPLAY_SPEEDS[value]
+
+        self._replay_speed_list.currentTextChanged.connect(_set_replay_speed)
+
         spacedh(self._legend_layout)
 
 
+    # Ask for a capture file and select the port replaying it; keeps the current port if cancelled.
+    def _select_replay(self) -> None:
+        file_path, _ = QFileDialog.getOpenFileName(
+            self, "Replay Capture", "",
+            "Captures (*.h5 *.hdf5 *.txt *.log *.bin);;All Files (*)",
+            options=QFileDialog.Options()
+        )
+
+        port = add_replay(file_path) if file_path else (self._talk.port or "<SELECT>")
+        if self._connection_list.findText(port) < 0: self._connection_list.addItem(port)
+        self._connection_list.setCurrentText(port)
+
+
     # Scrollable raw data text area for incoming sensor values.
     def _init_raw_data(self) -> None:
         self._scroll_area = QScrollArea()
@@ -213,12 +397,7 @@ class GestureTracker(QWidget):
         self._scroll_area_content = QWidget()
         self._scroll_area_layout = QVBoxLayout(self._scroll_area_content)
 
-        self._data_display = QTextEdit()
-        self._data_display.setStyleSheet(RAW_VALUE_BOX_STYLE)
-        self._data_display.setReadOnly(True)
-
-        monospaced_font = QFont("Courier New", 15)
-        self._data_display.setFont(monospaced_font)
+        self._data_display = RawConsole()
 
         self._scroll_area_layout.addWidget(self._data_display)
         self._scroll_area.setWidget(self._scroll_area_content)
@@ -235,70 +414,136 @@ class GestureTracker(QWidget):
         self._layout.addWidget(serial_write)
 
         def handle_return_pressed():
-            self._append_timed_data(
-                f'<span style="color: {ACCENT_COLOR};">{serial_write.text()}</span>'
-            )
+            self._data_display.append_rows([ECHO_MARKER + serial_write.text()])
             serial_write.clear() # clear the QLineEdit
 
         serial_write.returnPressed.connect(handle_return_pressed)
 
 
+    # Repaint timer: the plot is redrawn at a fixed frame rate, independent of sample arrival.
+    def _init_render_timer(self) -> None:
+        self._frame_rate: int = FRAME_RATE
+
+        self._render_timer = QTimer(self)
+        self._render_timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self._render_timer.timeout.connect(self._render_frame)
+        self._render_timer.start(round(1000 / self._frame_rate))
+
+
     #- Private Methods -----------------------------------------------------------------------------
 
+    # Return the frame label's text: render stats, and how long the reader waited on the plot or
+    # the raw box, while they were DISPLAY_SINK_CAPACITY batches behind.
+    def _frame_summary(self) -> str:
+        held = self._plot_sink.blocked + self._raw_sink.blocked
+        summary = self._frame_stats.summary()
+        return f"{summary}  reader held {held:.1f} s" if held else summary
+
+
+    # Timer tick: flush raw rows, repaint if new samples arrived, skipping frames while the UI is behind.
+    def _render_frame(self) -> None:
+        interval = 1 / self._frame_rate
+        now = time.perf_counter()
+
+        # ticks that never fired because the event loop was busy count as dropped frames
+        missed = int((now - self._last_tick) / interval) - 1
+        if missed > 0: self._frame_stats.drop(missed)
+        self._last_tick = now
+
+        for batch in self._plot_sink.drain(): self._add_frames(batch.timestamps, batch.frames)
+        for batch in self._raw_sink.drain(): self._add_to_raw(batch)
+        self._data_display.flush() # raw rows queued since the last tick, in one edit
+
+        if not self._plot_pending or self._freeze: return
+
+        # the previous repaint overran its budget: give ingestion the following ticks
+        if self._frames_to_skip > 0:
+            self._frames_to_skip -= 1
+            self._frame_stats.drop()
+            return
+
+        started = time.perf_counter()
+        self._update_plot()
+        self._frames_to_skip = int((time.perf_counter() - started) / interval)
+
+
     # Update the plot from graphlines unless the UI is frozen.
     def _update_plot(self) -> None:
         if self._freeze: return     # don't update graph if freeze is active
 
-        self._plot_widget.clear()   # clear old plots
+        started = self._frame_stats.begin()
+
+        # draw long histories from the min/max pyramid, at most a couple of points per pixel
+        level = lod_level(
+            len(self._counter[self._toggle_recent:]),
+            self._plot_widget.width() * LOD_POINTS_PER_PIXEL
+        )
+        x_axis = axis_view(self._counter, self._toggle_recent, None, level)
 
+        # curves persist between refreshes; only their data is swapped in place
         for line in self._graphlines:
             if line.hidden: continue
 
-            sliced_line = pg.PlotDataItem(
-                x = self._counter[self._toggle_recent:],
-                y = line.reading(self._toggle_recent),
-                pen = pg.mkPen(color=line.color(), width=2),
+            line.curve.setData(
+                x = x_axis,
+                y = line.reading(self._toggle_recent, level=level),
             )
 
-            self._plot_widget.addItem(sliced_line)
-
+        self._plot_pending = False
+        self._frame_stats.end(started)
 
-    # Add data to the raw data box with current time
-    def _append_timed_data(self, data: Any = "") -> None:
-        timestamp = datetime.now().strftime("%H:%M:%S.%f")[:-3]  # slice to get milliseconds
 
-        self._data_display.append(
-            f'<span style="color: {ACCENT_COLOR};">{timestamp}</span>  {data}'
+    # Freeze samples [start, end) of the time axis and of every recorded source.
+    def _freeze_segment(self, start: int, end: int) -> RecordSegment:
+        return RecordSegment(
+            counter = self._counter[start:end],
+            readings = tuple(self._graphlines[i].reading(start, end) for i in self._record_sources),
         )
 
 
     # Record control callback implementing start/stop/discard/restart semantics.
     def _record_data(self, action: RecordAction) -> None:
-        # create a new timestamp- add start point
+        # open a repetition at the current counter value
         if action == RecordAction.START:
-            self._records_stamps.append([len(self._counter)])
+            self._record_start = len(self._counter)
             self._plot_widget.setBackground(BACKGROUND_HIGHLIGHT_COLOR)
 
-        # add end point for last created timestamp
+        # close the open repetition: it is frozen right away, later captures or clears can't
+        # change it
         elif action == RecordAction.STOP:
-            self._records_stamps[-1].append(len(self._counter))
+            self._segments.append(self._freeze_segment(self._record_start, len(self._counter)))
+            self._record_start = None
             self._plot_widget.setBackground(BACKGROUND_COLOR)
 
-        # delete the last timestamp
+        # delete the last repetition
         elif action == RecordAction.DISCARD:
-            self._records_stamps.pop()
+            self._segments.pop()
             self._plot_widget.setBackground(BACKGROUND_HIGHLIGHT_COLOR)
 
-        # reset the start point for the current timestamp to current counter value
+        # reset the start point of the open repetition to the current counter value
         elif action == RecordAction.RESTART:
-            self._records_stamps[-1][0] = len(self._counter)
+            self._record_start = len(self._counter)
 
-        # empty the record, clear all timestamps
+        # empty the record, drop every repetition
         else: # == RecordAction.TERMINATE
-            self._records_stamps = []
+            self._record_start = None
+            self._segments = []
             self._plot_widget.setBackground(BACKGROUND_COLOR)
 
 
+    # Return the frozen repetitions as one SensorValues per recorded source, named by labels.
+    def _recorded_values(self, labels: tuple[str, ...]) -> sensor_values_t:
+        analyse_data: sensor_values_t = []
+        for i, label in enumerate(labels):
+            source_info: SensorValues = SensorValues(label)
+            for segment in self._segments:
+                source_info.AddValues(segment.counter, segment.readings[i])
+
+            analyse_data.append(source_info)
+
+        return analyse_data
+
+
     #- Button Actions ------------------------------------------------------------------------------
 
     def _zoom_value(self, value: int):
@@ -310,12 +555,20 @@ class GestureTracker(QWidget):
 
     # Clear all recorded data and reset view state.
     def _button_clear_data(self) -> None:
-        self._counter = [0]
-        self._start_time = time.time()
+        # batches still queued were read before the clear
+        self._plot_sink.discard()
+        self._raw_sink.discard()
+
+        self._counter = RingBuffer()
+        self._counter.append(0)
+        self._time_origin = self._ingest.now()
         self._toggle_recent = 0
 
         for line in self._graphlines: line.reset_reading()
 
+        # an open repetition starts over on the cleared buffers; frozen ones are unaffected
+        if self._record_start is not None: self._record_start = len(self._counter)
+
         self._data_display.clear()
         self._update_plot()
 
@@ -327,6 +580,62 @@ class GestureTracker(QWidget):
         self._update_plot()
 
 
+    # Start streaming samples to a file chosen by the user, or stop the running recording.
+    def _button_capture(self) -> None:
+        if self._recorder:
+            self._ingest.remove(self._recorder_sink) # hands over everything still queued
+            self._recorder_sink = None
+            self._recorder.stop()
+            alert(f"Captured {self._recorder.samples} samples to {self._recorder.path}")
+            self._recorder = None
+            self._capture_button.setText("Capture")
+            return
+
+        file_path, _ = QFileDialog.getSaveFileName(
+            self, "Capture To", datestring() + ".h5", "HDF5 Files (*.h5);;All Files (*)",
+            options=QFileDialog.Options()
+        )
+        if not file_path: return
+
+        recorder = Recorder(file_path)
+        if not recorder.start():
+            alert_box("Error", f"Unable to capture to {file_path}")
+            return
+
+        # lossless: a disk falling behind fills the recorder's queue, then the sink's, and then
+        # holds the reader rather than leave gaps in the file
+        self._recorder = recorder
+        self._recorder_sink = Sink(
+            "recorder", lambda batch: recorder.write(batch.timestamps, batch.frames),
+            policy=Backpressure.BLOCK
+        )
+        self._ingest.add(self._recorder_sink)
+        self._capture_button.setText("Stop Capture")
+
+
+    # Toggle drawing of the raw data box; rows keep being logged while paused.
+    def _button_data_view(self) -> None:
+        self._data_display.paused = not self._data_display.paused
+        self._data_view_button.setText("Resume Log" if self._data_display.paused else "Pause Log")
+
+
+    # Cancel every queued and running training job; nothing is written for them.
+    def _button_cancel_jobs(self) -> None:
+        for name in jobs.active: jobs.cancel(name)
+        self._job_label.setText("Cancelling")
+
+
+    # Stop recognising the tested gesture.
+    def _button_stop_test(self) -> None:
+        if self._recognizer_sink: self._ingest.remove(self._recognizer_sink)
+        if self._recognizer: self._recognizer.stop()
+        self._recognizer = None
+        self._recognizer_sink = None
+
+        self._match_label.setText("")
+        self._stop_test_button.setVisible(False)
+
+
     # Open a file dialog and save the raw text of incoming data to disk.
     def _button_save(self) -> None:
         # Open file dialog to select save location
@@ -337,7 +646,7 @@ class GestureTracker(QWidget):
 
         if file_path:
             with open(file_path, 'w') as file:
-                file.write(self._data_display.toPlainText())
+                file.write(self._data_display.text())
 
             msg_box = QMessageBox(self)
             msg_box.setIcon(QMessageBox.NoIcon)
@@ -375,6 +684,16 @@ class GestureTracker(QWidget):
         #========================================
         tab, dialog_inputs = dialog_return
 
+        # testing doesn't record anything: recognise the gesture on the live stream instead
+        if tab == Tab.TEST:
+            self._start_test(dialog_inputs)
+            return
+
+        # a second job on the same file would only be refused after recording
+        if dialog_inputs.filename in jobs.active:
+            alert_box("Busy", f"{dialog_inputs.filename} is still being trained.")
+            return
+
         analyse_method = analyse_create if tab == Tab.CREATE else analyse_update
         # .get_inputs() returns None when tab isnt Tab.CREATE or Tab.UPDATE anyways
 
@@ -382,7 +701,9 @@ class GestureTracker(QWidget):
         # pop the gesture record window
         #========================================
         # start blank recording session
-        self._records_stamps: int2d_t = []
+        self._record_sources = dialog_inputs.source_ids
+        self._record_start = None
+        self._segments = []
 
         # repeats = how many readings to read
         # self._record_data = method to handle data record. it accepts RecordAction.x enums args
@@ -399,42 +720,138 @@ class GestureTracker(QWidget):
         # Basically, the RecordInputs window stores timestamps for when to start and stop recordings
         # start/stop/cancel/discard/restart all that is handled by self._record_data() method.
         #
-        # At this stage of the code, we have self._records_stamps which is 2d-int array with start
-        # and stop timestamps. the following code-block uses that to slice highlighted data from the
-        # time (self._counter) and reading (self._graphlines) lists.
-        #
-        # self._graphlines is a list of all sources/sensors, here, each individual that's selected
-        # is processed and selected data is stored in a sensor_values_t list.
+        # At this stage of the code, every repetition was frozen by self._record_data() when it
+        # stopped: RecordSegment views of the time (self._counter) and reading (self._graphlines)
+        # buffers, which clearing or further capture can't touch. The following code-block packs
+        # them into one [time, reading] array per repetition for each selected source; nothing
+        # handed to the training job refers to the live buffers.
+        analyse_data = self._recorded_values(dialog_inputs.file_sources)
+        self._segments = []
+
+        if not analyse_method(dialog_inputs.filename, analyse_data, dialog_inputs.parameters):
+            alert_box("Busy", "Too many training jobs queued, try again once one has finished.")
+
+
+    # Load the tested gesture file and start recognising it on the mapped sources.
+    def _start_test(self, inputs: GestureInput) -> None:
+        # only the mapped sources' models are read
+        gesture = read_gesture(inputs.filename)
+        sources = gesture.models(inputs.file_sources) if gesture else None
+        if sources is None:
+            alert_box("Error", f"Invalid gesture file: {inputs.filename}")
+            return
+
+        # thresholds entered in the test tab replace the stored ones
+        for label, mp in zip(inputs.file_sources, inputs.parameters):
+            if label not in sources: continue
+            sources[label] = replace(
+                sources[label],
+                parameters = replace(sources[label].parameters, threshold=mp.threshold)
+            )
 
-        analyse_data: sensor_values_t = []
-        for i, source in enumerate(dialog_inputs.source_ids):
-            source_info: SensorValues = SensorValues(dialog_inputs.file_sources[i])
+        library = GestureLibrary()
+        if not library.add(
+            inputs.filename, sources, dict(zip(inputs.file_sources, inputs.source_ids))
+        ):
+            alert_box("Error", f"Sources missing from gesture file: {inputs.filename}")
+            return
+
+        self._button_stop_test()
+        self._recognizer = Recognizer(library)
+        self._recognizer.signals.matched.connect(self._bridge.wrap(self._gesture_matched))
+        self._recognizer.signals.failed.connect(self._bridge.wrap(self._recognizer_failed))
+        self._recognizer.start()
+
+        # stale samples are worthless to recognition: a lagging recognizer skips to the newest
+        recognizer = self._recognizer
+        self._recognizer_sink = Sink(
+            "recognizer", lambda batch: recognizer.feed(batch.timestamps, batch.frames)
+        )
+        self._ingest.add(self._recognizer_sink)
 
-            for start, end in self._records_stamps:
-                source_info.AddValues(
-                    self._counter[start:end],
-                    self._graphlines[source].reading(start, end)
-                )
+        self._match_label.setText(f"{os.path.basename(inputs.filename)}: listening")
+        self._stop_test_button.setVisible(True)
 
-            analyse_data.append(source_info)
 
-        analyse_method(dialog_inputs.filename, analyse_data, dialog_inputs.parameters)
+    # Show a recognised gesture with the scores of the matching window.
+    @Slot(str, object)
+    def _gesture_matched(self, name: str, scores: dict[str, float]) -> None:
+        count = self._recognizer.matches if self._recognizer else 0
+        self._match_label.setText(f"{os.path.basename(name)}: matched ({count})")
+        self._match_label.setToolTip(
+            ", ".join(f"{label}: {score:.2f}" for label, score in scores.items())
+        )
 
 
-    #- Add data ------------------------------------------------------------------------------------
+    # Take down a test whose recognizer stopped on an error, rather than keep showing it listening.
+    @Slot(str)
+    def _recognizer_failed(self, reason: str) -> None:
+        if self._recognizer is None or self._recognizer.running: return # a later test's
+
+        self._button_stop_test()
+        self._match_label.setText("Recognition stopped")
+        self._match_label.setToolTip(reason)
+
+
+    #- Analysis Jobs -------------------------------------------------------------------------------
+
+    # Show a job state in the header; the cancel button stays up while any job is left.
+    def _show_job(self, name: str, state: str, tooltip: str = "") -> None:
+        self._job_label.setText(f"{os.path.basename(name)}: {state}")
+        self._job_label.setToolTip(tooltip)
+        self._cancel_jobs_button.setVisible(bool(jobs.active))
+
+
+    @Slot(str)
+    def _job_queued(self, name: str) -> None:
+        self._show_job(name, "queued", f"{len(jobs.active)} training jobs pending")
+
+
+    @Slot(str)
+    def _job_running(self, name: str) -> None:
+        self._show_job(name, "training")
+
+
+    @Slot(str, str, int, int)
+    def _job_progress(self, name: str, label: str, done: int, total: int) -> None:
+        self._show_job(name, f"training {done}/{total}", f"Finished '{label}'")
+
+
+    @Slot(str, object)
+    def _job_done(self, name: str, timings: JobTimings) -> None:
+        self._show_job(name, "trained", str(timings))
+
+
+    @Slot(str, str)
+    def _job_failed(self, name: str, reason: str) -> None:
+        self._show_job(name, "failed", reason)
+        alert_box("Error", f"Training {name} failed: {reason}")
+
 
-    # Append new sensor values to internal buffers and create graph lines as needed.
     @Slot(str)
-    def _add_data(self, values_str: str) -> None:
-        self._counter.append(time.time() - self._start_time)
+    def _job_cancelled(self, name: str) -> None:
+        self._show_job(name, "cancelled")
+
+
+    #- Add data ------------------------------------------------------------------------------------
+
+    # Append (samples,) ingest timestamps and their (samples, channels) frames to internal buffers;
+    # the render timer repaints them.
+    def _add_frames(self, timestamps: NDArray[np.float64], frames: NDArray[np.float64]) -> None:
+        # a batch published while the plot was cleared can still hold samples from before it
+        if len(timestamps) and timestamps[0] < self._time_origin:
+            kept = timestamps >= self._time_origin
+            timestamps, frames = timestamps[kept], frames[kept]
 
-        values = parse_string_list(values_str)
+        if not len(frames): return
 
-        # clear old data and add new lines
-        for i, value in enumerate(values):
-            # only plot data if values are numeric
-            if not (isinstance(value, float) or isinstance(value, int)): continue
+        # columns missing from this batch still get a (NaN) sample, keeping lines aligned
+        columns = max(frames.shape[1], len(self._graphlines))
+        if columns > frames.shape[1]:
+            frames = np.pad(frames, ((0, 0), (0, columns - frames.shape[1])),
+                constant_values=np.nan)
 
+        for i in range(columns):
             #========================================
             # create new graphline
             #========================================
@@ -443,11 +860,12 @@ class GestureTracker(QWidget):
                 # draw the line
                 #========================================
                 new_line: GraphLine = GraphLine(
-                    reading = [value] * len(self._counter),
+                    reading = RingBuffer.full_like(self._counter, frames[0, i]),
                     title   = f"source{i+1}"
                 )
 
                 self._graphlines.append(new_line)
+                self._plot_widget.addItem(new_line.curve)
 
                 #========================================
                 # draw legend
@@ -459,24 +877,32 @@ class GestureTracker(QWidget):
                 self._legend_layout.addLayout(h_layout)
 
             #========================================
-            # update existing line
+            # append the column to its line
             #========================================
-            else:
-                graphline: GraphLine = self._graphlines[i]
-                graphline.add_reading(value)
+            self._graphlines[i].add_readings(frames[:, i])
 
-        self._update_plot()
+        self._counter.extend(timestamps - self._time_origin)
+        self._plot_pending = True # repainted by the next render timer tick
 
 
-    @Slot(str)
-    def _add_to_raw(self, data: str):
-        if self._print_time: self._append_timed_data()
+    # Queue a batch for the text box, one timestamped row per line; binary frames are shown as
+    # comma separated rows.
+    def _add_to_raw(self, batch: StreamBatch) -> None:
+        rows = batch.lines or [",".join(f"{value:g}" for value in row) for row in batch.frames]
+        self._data_display.append_rows(list(rows))
 
-        if data == "\r":
-            self._print_time = True
-        else:
-            self._print_time = False
-            self._data_display.insertPlainText(data)
+
+    #- Window Events -------------------------------------------------------------------------------
+
+    # Finish any running recording, test and training before the window goes away.
+    def closeEvent(self, event: QCloseEvent) -> None:
+        self._ingest.detach(self._talk)
+        self._ingest.stop() # the recorder's sink hands over what it still holds
+        if self._recorder: self._recorder.stop()
+        if self._recognizer: self._recognizer.stop()
+        self.hide()
+        jobs.stop(cancel=False) # training still in progress is finished and written
+        super().closeEvent(event)
 
 
     #- Keyboard Shortcut Override ------------------------------------------------------------------
@@ -492,6 +918,9 @@ class GestureTracker(QWidget):
         elif event.key() == Qt.Key_S:
             self._save_button.click()
 
+        elif event.key() == Qt.Key_R:
+            self._capture_button.click()
+
         elif event.key() == Qt.Key_T:
             self._data_view_button.click()
 